@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import FileResponse
+from app.schemas.profile import ProfileListResponse
+from app.services.security import verify_profiling_token
+from app.services.profiler import list_profiles, find_profile
+
+router = APIRouter()
+
+
+def require_profiling_token(x_profile_token: str = Header(None)):
+    if not x_profile_token or not verify_profiling_token(x_profile_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"field": "token", "message": "Invalid or missing profiling token"},
+        )
+
+
+@router.get(
+    "/profiles",
+    response_model=ProfileListResponse,
+    dependencies=[Depends(require_profiling_token)],
+)
+def get_profiles():
+    """Recent request profiles, newest first"""
+    return ProfileListResponse(profiles=list_profiles())
+
+
+@router.get("/profiles/{name}", dependencies=[Depends(require_profiling_token)])
+def download_profile(name: str):
+    """Folded stacks - feed to flamegraph.pl or open in speedscope"""
+    path = find_profile(name)
+
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return FileResponse(path, media_type="text/plain", filename=name)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, BackgroundTasks, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import RedirectResponse
 from app.services.user import create_user, verify_user_email, reset_user_password
@@ -72,7 +72,7 @@ async def verify_email(token: str):
     user = authenticate_email(token)
     user = verify_user_email(user.id, user.email)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_200_OK,
         content={"message": "Email verified successfully"},
     )
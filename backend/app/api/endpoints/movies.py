@@ -1,37 +1,67 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Path, Query, Response
 from app.schemas.movie import (
     MovieResponse,
+    MovieSearchResponse,
+    MovieSuggestionResponse,
     Movie,
     MovieCastResponse,
+    MovieFullResponse,
+    MovieReview,
     MovieReviewsResponse,
     MovieTrailerResponse,
 )
 from app.schemas.genre import GenreResponse
 from app.services.tmdb import (
     fetch_multiple_movies_details,
-    search_movies,
+    search_movies_page,
     fetch_movies_by_genre,
     fetch_popular_movies,
     fetch_movies_genres,
     fetch_movie_cast,
     fetch_movie_reviews,
+    fetch_review,
+    fetch_movie_full,
+    add_genre_names,
+    load_genre_map,
+    FULL_MOVIE_PARTS,
     fetch_movie_trailer,
+    fetch_popular_movies_json,
+    fetch_movies_by_genre_json,
+    movie_list_json,
+    search_filtered_results,
+    search_movies_filtered,
+    search_local_index,
+    suggest_movies,
+    SearchFilters,
 )
+from app.core.config import settings
 from typing import List
 
 router = APIRouter()
 
+INCLUDE_GENRE_NAMES = Query(False, description="Add genre names to each movie")
+
 
 @router.get("/popular", response_model=MovieResponse)
 async def get_popular_movies(
-    page: int = Query(1, ge=1, description="Page number for pagination")
+    page: int = Query(1, ge=1, description="Page number for pagination"),
+    include_genre_names: bool = INCLUDE_GENRE_NAMES,
 ):
+    if include_genre_names:
+        await load_genre_map()
+
+    if settings.TMDB_RAW_PASSTHROUGH:
+        return Response(
+            await fetch_popular_movies_json(page, include_genre_names),
+            media_type="application/json",
+        )
+
     movies = await fetch_popular_movies(page)
 
-    return MovieResponse(movies=movies)
+    return MovieResponse(movies=add_genre_names(movies) if include_genre_names else movies)
 
 
-@router.get("/search", response_model=MovieResponse)
+@router.get("/search", response_model=MovieSearchResponse)
 async def search_movie(
     query: str,
     page: int = Query(1, ge=1, description="Page number for pagination"),
@@ -40,17 +70,75 @@ async def search_movie(
     max_rating: float = Query(None, ge=0, le=10, description="Maximum rating"),
     min_year: int = Query(None, ge=1900, description="Minimum release year"),
     max_year: int = Query(None, description="Maximum release year"),
+    include_genre_names: bool = INCLUDE_GENRE_NAMES,
 ):
     """
-    Search movies with optional filters
+    Search movies with optional filters. Without query text the filters
+    browse the whole catalog.
     """
 
-    movies = await search_movies(
-        query=query,
-        page=page,
-    )
+    filters = SearchFilters(genre, min_rating, max_rating, min_year, max_year)
+
+    if include_genre_names:
+        await load_genre_map()
+
+    if filters.is_empty() and query.strip():
+        indexed = search_local_index(query, page)
+
+        if indexed is not None:
+            indexed_movies, total_pages = indexed
+
+            if settings.TMDB_RAW_PASSTHROUGH:
+                return Response(
+                    movie_list_json(indexed_movies, include_genre_names, total_pages),
+                    media_type="application/json",
+                )
+
+            movies = [Movie(**movie) for movie in indexed_movies]
+
+            return MovieSearchResponse(
+                movies=add_genre_names(movies) if include_genre_names else movies,
+                total_pages=total_pages,
+            )
 
-    return MovieResponse(movies=movies)
+        results, total_pages = await search_movies_page(query, page)
+
+        if settings.TMDB_RAW_PASSTHROUGH:
+            return Response(
+                movie_list_json(results, include_genre_names, total_pages),
+                media_type="application/json",
+            )
+
+        movies = [Movie(**movie) for movie in results]
+
+        return MovieSearchResponse(
+            movies=add_genre_names(movies) if include_genre_names else movies,
+            total_pages=total_pages,
+        )
+
+    if settings.TMDB_RAW_PASSTHROUGH:
+        return Response(
+            movie_list_json(
+                await search_filtered_results(query, page, filters), include_genre_names
+            ),
+            media_type="application/json",
+        )
+
+    movies = await search_movies_filtered(query, page, filters)
+
+    return MovieResponse(movies=add_genre_names(movies) if include_genre_names else movies)
+
+
+@router.get("/suggest", response_model=MovieSuggestionResponse)
+async def suggest_movie(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix"),
+    limit: int = Query(8, ge=1, le=20, description="Maximum suggestions"),
+):
+    """
+    Typeahead suggestions: ids, titles and years of known movies only
+    """
+
+    return MovieSuggestionResponse(suggestions=suggest_movies(q, limit))
 
 
 @router.get("/genres", response_model=GenreResponse)
@@ -62,11 +150,22 @@ async def get_movies_genres():
 
 @router.get("/genre/{genre_id}", response_model=MovieResponse)
 async def get_movies_by_genre(
-    genre_id: int, page: int = Query(1, ge=1, description="Page number for pagination")
+    genre_id: int,
+    page: int = Query(1, ge=1, description="Page number for pagination"),
+    include_genre_names: bool = INCLUDE_GENRE_NAMES,
 ):
+    if include_genre_names:
+        await load_genre_map()
+
+    if settings.TMDB_RAW_PASSTHROUGH:
+        return Response(
+            await fetch_movies_by_genre_json(genre_id, page, include_genre_names),
+            media_type="application/json",
+        )
+
     movies = await fetch_movies_by_genre(genre_id, page)
 
-    return MovieResponse(movies=movies)
+    return MovieResponse(movies=add_genre_names(movies) if include_genre_names else movies)
 
 
 @router.get("/{movie_id}/cast", response_model=MovieCastResponse)
@@ -78,13 +177,31 @@ async def get_movie_cast(movie_id: int):
 
 @router.get("/{movie_id}/reviews", response_model=MovieReviewsResponse)
 async def get_movie_reviews(
-    movie_id: int, page: int = Query(1, ge=1, description="Page number for pagination")
+    movie_id: int,
+    page: int = Query(1, ge=1, description="Page number for pagination"),
+    excerpt_length: int = Query(
+        None,
+        ge=50,
+        le=5000,
+        description="Truncate each review to about this many characters",
+    ),
 ):
-    reviews = await fetch_movie_reviews(movie_id, page)
+    reviews = await fetch_movie_reviews(movie_id, page, excerpt_length)
 
     return reviews
 
 
+@router.get("/reviews/{review_id}", response_model=MovieReview)
+async def get_review(
+    review_id: str = Path(..., pattern=r"^[A-Za-z0-9-]{1,64}$"),
+):
+    """
+    One full review, for excerpts marked as truncated
+    """
+
+    return await fetch_review(review_id)
+
+
 @router.get("/{movie_id}/trailer", response_model=MovieTrailerResponse)
 async def get_movie_trailer(movie_id: int):
     trailer = await fetch_movie_trailer(movie_id)
@@ -92,6 +209,44 @@ async def get_movie_trailer(movie_id: int):
     return trailer
 
 
+@router.get(
+    "/{movie_id}/full",
+    response_model=MovieFullResponse,
+    response_model_exclude_unset=True,
+)
+async def get_movie_full(
+    movie_id: int,
+    fields: str = Query(
+        None,
+        description="Comma-separated parts to include: details, cast, trailer, reviews (default: all)",
+    ),
+    excerpt_length: int = Query(
+        None,
+        ge=50,
+        le=5000,
+        description="Truncate each review to about this many characters",
+    ),
+):
+    """
+    Everything a movie page shows, from a single TMDB request
+    """
+
+    parts = (
+        {part.strip() for part in fields.split(",") if part.strip()}
+        if fields
+        else set(FULL_MOVIE_PARTS)
+    )
+    unknown = parts - set(FULL_MOVIE_PARTS)
+
+    if unknown or not parts:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown)) or '(none given)'}",
+        )
+
+    return await fetch_movie_full(movie_id, parts, excerpt_length)
+
+
 # @router.get("/{movie_id}", response_model=Movie)
 # async def get_movie(movie_id: int):
 #     movie = await fetch_movie_details(movie_id)
@@ -101,8 +256,10 @@ async def get_movie_trailer(movie_id: int):
 
 @router.get("/", response_model=List[Movie])
 async def get_movies_by_ids(
-    ids: List[int] = Query(..., description="List of TMDB movie IDs")
+    ids: List[int] = Query(..., description="List of TMDB movie IDs"),
+    include_genre_names: bool = INCLUDE_GENRE_NAMES,
 ):
     movies = await fetch_multiple_movies_details(ids)
 
-    return movies
+    # Details carry their genres with names, no map needed
+    return add_genre_names(movies) if include_genre_names else movies
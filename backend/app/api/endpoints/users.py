@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends, BackgroundTasks, Query, Response
+from typing import List
 import asyncio
+import logging
 from app.schemas.user import User, UpdateUserProfile, UserResponse
 from app.schemas.movie import MovieResponse
+from app.schemas.recommendation import RecommendedMovie
 from app.api.dependencies import get_current_user
-from app.services.tmdb import fetch_movie_details, search_movies
+from app.services.tmdb import fetch_movie_details, find_movie_by_title
 from app.services.ollama_recommender import (
     generate_enhanced_movie_recommendations,
     generate_movie_recommendations,
 )
+from app.services.content_recommender import recommend_similar_movies
+from app.services.collaborative_filtering import recommend_from_neighbors
+from app.services.cold_start import is_new_user, get_cold_start_recommendations
+from app.services.recommendation_batch import find_precomputed_recommendations
+from app.services.tracing import start_trace, span
+from app.services.metrics import record_cache_lookup
+from app.core.config import settings
 from app.services.user import (
     add_movie_to_favorites,
     remove_movie_from_favorites,
@@ -18,6 +28,8 @@ from app.services.user import (
     delete_movie_rating,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -38,21 +50,60 @@ def patch_me(
 
 
 @router.post("/me/recommendations", response_model=MovieResponse)
-async def recommend_movies(current_user: User = Depends(get_current_user)):
+async def recommend_movies(
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    genres: List[int] = Query(
+        None, description="Genre IDs picked during onboarding (new users only)"
+    ),
+):
     """
     Generate enhanced movie recommendations based on user's complete profile:
     - Favorite movies
     - Watchlist
     - Rating history (with emphasis on highly-rated films)
+
+    New users get the precomputed cold-start set, without an LLM call.
     """
 
+    with start_trace("recommendations") as trace:
+        try:
+            return await _recommend_movies(current_user, genres)
+        finally:
+            if settings.RECOMMENDATION_TIMING_HEADER:
+                response.headers["Server-Timing"] = trace.server_timing()
+
+
+async def _recommend_movies(current_user: User, genres: List[int]) -> MovieResponse:
+    if is_new_user(current_user):
+        with span("cold_start"):
+            return MovieResponse(movies=await get_cold_start_recommendations(genres))
+
     # Use the enhanced recommendation function
 
     try:
-        # Generate recommendations using all user data
-        recommendations = await generate_enhanced_movie_recommendations(current_user)
+        # Serve the nightly batch result while it matches the user's profile,
+        # otherwise generate recommendations using all user data
+        with span("precomputed_lookup") as attributes:
+            recommendations = find_precomputed_recommendations(current_user)
+            attributes["hit"] = bool(recommendations)
+            record_cache_lookup("precomputed_recommendations", attributes["hit"])
 
         if not recommendations:
+            recommendations = await generate_enhanced_movie_recommendations(
+                current_user
+            )
+
+        if not recommendations:
+            # Cheap fallbacks first - no LLM involved
+            with span("similar_fallback"):
+                similar_movies = await recommend_from_neighbors(
+                    current_user
+                ) or await recommend_similar_movies(current_user)
+
+            if similar_movies:
+                return MovieResponse(movies=similar_movies)
+
             # Fallback to basic recommendations if enhanced fails
             if current_user.favorite_movies:
                 favorite_movies_names = await asyncio.gather(
@@ -63,35 +114,52 @@ async def recommend_movies(current_user: User = Depends(get_current_user)):
                 )
                 favorite_movies_names = [movie.title for movie in favorite_movies_names]
 
-                recommendations = await generate_movie_recommendations(
-                    favorite_movies_names
-                )
+                with span("legacy_llm"):
+                    recommendations = [
+                        RecommendedMovie(title=title)
+                        for title in await generate_movie_recommendations(
+                            favorite_movies_names
+                        )
+                    ]
             else:
                 # Return empty response if no data available
                 return MovieResponse(movies=[])
 
-        # Search for movies and return results
+        # Search for movies and return results, dropping movies the user
+        # already knows - the prompt only carries a sample of them
+        known_movie_ids = (
+            set(current_user.favorite_movies)
+            | set(current_user.watchlist)
+            | {rating.movie_id for rating in current_user.ratings}
+        )
         match_movies = []
 
-        for movie_title in recommendations:
-            try:
-                search_results = await search_movies(movie_title)
+        with span("resolution") as attributes:
+            for recommendation in recommendations:
+                try:
+                    movie = await find_movie_by_title(
+                        recommendation.title, recommendation.year
+                    )
+
+                    if movie and movie.id not in known_movie_ids:
+                        match_movies.append(movie)
+                        known_movie_ids.add(movie.id)
 
-                if search_results:
-                    # Take the first (most relevant) result
-                    match_movies.append(search_results[0])
+                        # Limit to prevent too many API calls
+                        if len(match_movies) >= 20:
+                            break
+                except Exception as e:
+                    logger.warning(
+                        f"Error searching for movie '{recommendation.title}': {e}"
+                    )
+                    continue
 
-                    # Limit to prevent too many API calls
-                    if len(match_movies) >= 20:
-                        break
-            except Exception as e:
-                print(f"Error searching for movie '{movie_title}': {e}")
-                continue
+            attributes["matched"] = len(match_movies)
 
         return MovieResponse(movies=match_movies)
 
     except Exception as e:
-        print(f"Error generating recommendations: {e}")
+        logger.warning(f"Error generating recommendations: {e}")
         # Return empty response on error
         return MovieResponse(movies=[])
 
@@ -25,6 +25,58 @@ class Settings(BaseSettings):
     MODEL_ID: str
     OLLAMA_SERVER_ENDPOINT: str
     FRONTEND_URL: str
+    CONTENT_RECOMMENDER_CATALOG_PAGES: int = 10
+    CONTENT_RECOMMENDER_REFRESH_HOURS: int = 6
+    ITEM_NEIGHBORS_COLLECTION_NAME: str = "ItemNeighbors"
+    ITEM_NEIGHBORS_TOP_N: int = 50
+    PROMPT_TOKEN_BUDGET: int = 1024
+    RECOMMENDATION_CACHE_MAX_ENTRIES: int = 1000
+    RECOMMENDATION_CACHE_TTL_MINUTES: int = 360
+    RECOMMENDATION_CACHE_MIN_SIMILARITY: float = 0.6
+    COLD_START_POOL_SIZE: int = 200
+    COLD_START_REFRESH_HOURS: int = 6
+    RECOMMENDATIONS_COLLECTION_NAME: str = "Recommendations"
+    PRECOMPUTED_RECOMMENDATIONS_MAX_AGE_HOURS: int = 36
+    RECOMMENDATION_BATCH_ENABLED: bool = False
+    RECOMMENDATION_BATCH_RESERVED_SLOTS: int = 1
+    OLLAMA_NUM_PARALLEL: int = 4
+    RECOMMENDATION_TIMING_HEADER: bool = False
+    TMDB_RAW_PASSTHROUGH: bool = True
+    SEARCH_MAX_UPSTREAM_PAGES: int = 5
+    SEARCH_INDEX_ENABLED: bool = True
+    SEARCH_INDEX_MAX_MOVIES: int = 50000
+    SUGGEST_MIN_UPSTREAM_CHARS: int = 3
+    SUGGEST_DEBOUNCE_MS: int = 300
+    SUGGEST_REFILL_INTERVAL_SECONDS: int = 600
+    CATALOG_MIRROR_ENABLED: bool = False
+    CATALOG_COLLECTION_NAME: str = "Movies"
+    CATALOG_EXPORT_BASE_URL: str = "http://files.tmdb.org/p/exports"
+    CATALOG_IMPORT_LIMIT: int = 20000
+    CATALOG_SYNC_CONCURRENCY: int = 8
+    CATALOG_SYNC_INTERVAL_HOURS: int = 6
+    PAGE_CACHE_SIZE: int = 512
+    PAGE_CACHE_TTL_SECONDS: int = 300
+    PREFETCH_ENABLED: bool = True
+    PREFETCH_MAX_PENDING: int = 8
+    PREFETCH_MAX_UPSTREAM_IN_FLIGHT: int = 32
+    PREFETCH_BACKOFF_SECONDS: int = 30
+    HTTP_CACHE_ENABLED: bool = True
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: str = "application/json,text/plain,text/html,text/csv"
+    COMPRESSION_GZIP_LEVEL: int = 4
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    REVIEW_CACHE_SIZE: int = 1024
+    REVIEW_CACHE_TTL_SECONDS: int = 3600
+    GENRE_MAP_REFRESH_HOURS: int = 24
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.01
+    PROFILING_INTERVAL_MS: int = 5
+    PROFILING_OUTPUT_DIR: str = "/tmp/moviecompass_profiles"
+    PROFILING_MAX_FILES: int = 200
+    OLLAMA_WARMUP_ON_STARTUP: bool = True
+    OLLAMA_KEEP_ALIVE: str = "30m"
+    OLLAMA_KEEP_ALIVE_INTERVAL_MINUTES: int = 10
 
     class Config:
         env_file = ".env"
@@ -1,6 +1,6 @@
 from fastapi import Request, HTTPException
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 import logging
 
@@ -23,7 +23,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
         errors.append({"field": field, "message": message})
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=HTTP_422_UNPROCESSABLE_ENTITY,
         content={"errors": errors}
     )
@@ -33,9 +33,9 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
     detail = exc.detail
     if isinstance(detail, dict) and "field" in detail and "message" in detail:
-        return JSONResponse(status_code=exc.status_code, content={"errors": [detail]})
+        return ORJSONResponse(status_code=exc.status_code, content={"errors": [detail]})
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"errors": [{"message": str(detail)}]}
     )
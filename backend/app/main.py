@@ -1,16 +1,27 @@
 from app.utils.app_instance import application
-from app.api.endpoints import movies, auth, users
+from app.api.endpoints import movies, auth, users, admin
 from app.exceptions import validation_exception_handler, http_exception_handler
 from fastapi.exceptions import RequestValidationError
 from fastapi import HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.core.config import settings
+from app.services.ollama_lifecycle import is_model_resident
+from app.services.metrics import MetricsMiddleware
+from app.services.http_cache import HTTPCacheMiddleware
+from app.services.compression import CompressionMiddleware
+from app.services.profiler import ProfilingMiddleware
 import app.services.scheduler
 
 application.include_router(movies.router, prefix="/movies")
 application.include_router(auth.router, prefix="/auth")
 application.include_router(users.router, prefix="/users")
+application.include_router(admin.router, prefix="/admin")
 application.add_exception_handler(RequestValidationError, validation_exception_handler)
 application.add_exception_handler(HTTPException, http_exception_handler)
+application.add_middleware(CompressionMiddleware)
+application.add_middleware(HTTPCacheMiddleware)
 application.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -21,8 +32,31 @@ application.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+application.add_middleware(MetricsMiddleware)
+application.add_middleware(ProfilingMiddleware)
 
 
 @application.get("/")
 async def read_root():
     return {"message": "Welcome to the MovieCompass App API!"}
+
+
+@application.get("/health/ready")
+async def readiness():
+    """Ready once the recommendation model is resident in Ollama's memory"""
+    model_loaded = await is_model_resident()
+
+    return ORJSONResponse(
+        status_code=200 if model_loaded else 503,
+        content={
+            "status": "ready" if model_loaded else "warming_up",
+            "model": settings.MODEL_ID,
+            "model_loaded": model_loaded,
+        },
+    )
+
+
+@application.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -12,6 +12,7 @@ class Movie(BaseModel):
     vote_count: Optional[int] = None
     genre_ids: Optional[List] = None
     genres: Optional[List] = None
+    genre_names: Optional[List[str]] = None
     release_date: Optional[str] = None
 
 
@@ -19,6 +20,21 @@ class MovieResponse(BaseModel):
     movies: List[Movie]
 
 
+class MovieSearchResponse(MovieResponse):
+    # Set when the local index answers the query, from its own hits
+    total_pages: Optional[int] = None
+
+
+class MovieSuggestion(BaseModel):
+    id: int
+    title: str
+    year: Optional[int] = None
+
+
+class MovieSuggestionResponse(BaseModel):
+    suggestions: List[MovieSuggestion]
+
+
 class MovieCast(BaseModel):
     id: int
     name: str
@@ -36,6 +52,7 @@ class MovieReview(BaseModel):
     author: str
     content: str
     created_at: str
+    truncated: bool = False
 
 
 class MovieReviewsResponse(BaseModel):
@@ -48,3 +65,11 @@ class MovieTrailerResponse(BaseModel):
     movie_id: int
     title: Optional[str] = None
     embed_url: Optional[str] = None
+
+
+class MovieFullResponse(BaseModel):
+    movie_id: int
+    details: Optional[Movie] = None
+    cast: Optional[List[MovieCast]] = None
+    trailer: Optional[MovieTrailerResponse] = None
+    reviews: Optional[MovieReviewsResponse] = None
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List
+
+class ProfileInfo(BaseModel):
+    name: str
+    size_bytes: int
+    created_at: datetime
+
+class ProfileListResponse(BaseModel):
+    profiles: List[ProfileInfo]
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class RecommendedMovie(BaseModel):
+    title: str
+    year: Optional[int] = None
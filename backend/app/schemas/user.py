@@ -1,10 +1,12 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, TypeAdapter
 from typing import Optional, List
 from app.schemas.rating import RatingEntry
 from app.schemas.validator import SharedValidators
 from datetime import datetime, timezone
 from uuid import uuid4
 
+rating_list_adapter = TypeAdapter(List[RatingEntry])
+
 
 class UserCreate(SharedValidators):
     username: str
@@ -59,6 +61,23 @@ class User(SharedValidators):
 
     model_config = ConfigDict(from_attributes=True, validate_by_name=True)
 
+    @classmethod
+    def from_document(cls, document: dict) -> "User":
+        """
+        Build a User from a stored Mongo document without re-running the
+        field validators - documents are validated on the way in. Ratings
+        still go through the Rust validator: constructing thousands of
+        entries one by one in Python is slower than validating them.
+        """
+        return cls.model_construct(
+            **{
+                **document,
+                "ratings": rating_list_adapter.validate_python(
+                    document.get("ratings", [])
+                ),
+            }
+        )
+
 
 class UserTokenResponse(BaseModel):
     access_token: str
@@ -1,12 +1,17 @@
 import re
 from pydantic import BaseModel, field_validator
 
+# Compiled once - validators run on every signup and profile update
+USERNAME_PATTERN = re.compile(r"[a-zA-Z0-9_]+")
+UPPERCASE_PATTERN = re.compile(r"[A-Z]")
+PHONE_NUMBER_PATTERN = re.compile(r"\+?\d{9,15}")
+
 
 class SharedValidators(BaseModel):
     @field_validator("username", mode="before", check_fields=False)
     @classmethod
     def validate_username(cls, value: str):
-        if not re.fullmatch(r"^[a-zA-Z0-9_]+$", value):
+        if not USERNAME_PATTERN.fullmatch(value):
             raise ValueError(
                 "Username must be alphanumeric and can include underscores"
             )
@@ -21,7 +26,7 @@ class SharedValidators(BaseModel):
             raise ValueError("Password must be at least 8 characters long")
         if len(value) > 100:
             raise ValueError("Password must not exceed 100 characters")
-        if not re.search(r"[A-Z]", value):
+        if not UPPERCASE_PATTERN.search(value):
             raise ValueError("Password must contain at least one uppercase letter")
         return value
 
@@ -39,7 +44,7 @@ class SharedValidators(BaseModel):
     def validate_phone_number(cls, value: str):
         if value is None:
             return value
-        if not re.fullmatch(r"^\+?\d{9,15}$", value):
+        if not PHONE_NUMBER_PATTERN.fullmatch(value):
             raise ValueError(
                 "Phone number must be in international format (e.g. +1234567890)"
             )
@@ -0,0 +1,22 @@
+"""
+Mints a signed X-Profile-Token value, which profiles the request carrying it
+and authorizes /admin/profiles. Uses the SECRET_KEY of the environment.
+
+    cd backend
+    python -m app.scripts.profiling_token --expires-minutes 30
+"""
+
+from app.services.profiler import create_profiling_token
+import argparse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--expires-minutes", type=int, default=60)
+    args = parser.parse_args(argv)
+
+    print(create_profiling_token(args.expires_minutes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+from typing import Dict, Iterable, List, Optional
+from datetime import datetime, timezone
+from pymongo import ASCENDING, DESCENDING, MongoClient, ReplaceOne, UpdateOne
+from app.core.config import settings
+from app.schemas.movie import Movie
+from app.services.metrics import track_mongo_latency
+
+client = MongoClient(settings.MONGO_CONNECTION_STRING)
+db = client.get_database(settings.MONGO_DATABASE_NAME)
+movies_collection = db.get_collection(settings.CATALOG_COLLECTION_NAME)
+sync_state_collection = db.get_collection(f"{settings.CATALOG_COLLECTION_NAME}SyncState")
+
+CATALOG_PAGE_SIZE = 20
+CATALOG_INDEXES = [
+    [("popularity", DESCENDING)],
+    [("genre_ids", ASCENDING), ("popularity", DESCENDING)],
+    [("release_date", DESCENDING)],
+    [("vote_average", DESCENDING)],
+]
+# Stored documents are keyed by TMDB id; reads return Movie fields only
+MOVIE_PROJECTION = {"_id": 0, "synced_at": 0}
+
+
+def ensure_catalog_indexes():
+    for keys in CATALOG_INDEXES:
+        movies_collection.create_index(keys)
+
+
+def catalog_document(movie: dict) -> dict:
+    """TMDB movie details in Movie shape, with genre_ids like in list results"""
+    document = {field: movie.get(field) for field in Movie.model_fields}
+
+    if document["genre_ids"] is None and movie.get("genres"):
+        document["genre_ids"] = [genre["id"] for genre in movie["genres"]]
+
+    document["_id"] = movie["id"]
+    document["synced_at"] = datetime.now(timezone.utc)
+
+    return document
+
+
+@track_mongo_latency
+def store_catalog_movies(movies: Iterable[dict]) -> int:
+    operations = [
+        ReplaceOne({"_id": movie["id"]}, catalog_document(movie), upsert=True)
+        for movie in movies
+    ]
+
+    if not operations:
+        return 0
+
+    movies_collection.bulk_write(operations, ordered=False)
+
+    return len(operations)
+
+
+@track_mongo_latency
+def update_catalog_popularity(popularity: Dict[int, float]) -> int:
+    """Set the popularity of the mirrored movies found in `popularity`"""
+    operations = [
+        UpdateOne(
+            {"_id": document["_id"]},
+            {"$set": {"popularity": popularity[document["_id"]]}},
+        )
+        for document in movies_collection.find({}, {"_id": 1})
+        if document["_id"] in popularity
+    ]
+
+    if not operations:
+        return 0
+
+    return movies_collection.bulk_write(operations, ordered=False).modified_count
+
+
+@track_mongo_latency
+def remove_catalog_movies(movie_ids: List[int]) -> int:
+    if not movie_ids:
+        return 0
+
+    return movies_collection.delete_many({"_id": {"$in": movie_ids}}).deleted_count
+
+
+@track_mongo_latency
+def known_catalog_ids(movie_ids: List[int]) -> List[int]:
+    return [
+        document["_id"]
+        for document in movies_collection.find({"_id": {"$in": movie_ids}}, {"_id": 1})
+    ]
+
+
+def load_sync_state() -> Optional[dict]:
+    return sync_state_collection.find_one({"_id": "changes"})
+
+
+def save_sync_state(synced_through: datetime, **details):
+    save_sync_state_details(synced_through=synced_through, **details)
+
+
+def save_sync_state_details(**details):
+    sync_state_collection.update_one({"_id": "changes"}, {"$set": details}, upsert=True)
+
+
+@track_mongo_latency
+def find_catalog_movie(movie_id: int) -> Optional[dict]:
+    if not settings.CATALOG_MIRROR_ENABLED:
+        return None
+
+    return movies_collection.find_one({"_id": movie_id}, MOVIE_PROJECTION)
+
+
+def _catalog_page(query: dict, page: int) -> Optional[List[dict]]:
+    if not settings.CATALOG_MIRROR_ENABLED:
+        return None
+
+    movies = list(
+        movies_collection.find(query, MOVIE_PROJECTION)
+        .sort("popularity", DESCENDING)
+        .skip((page - 1) * CATALOG_PAGE_SIZE)
+        .limit(CATALOG_PAGE_SIZE)
+    )
+
+    # A short page means the mirror doesn't reach this deep; TMDB does
+    return movies if len(movies) == CATALOG_PAGE_SIZE else None
+
+
+@track_mongo_latency
+def find_catalog_popular(page: int = 1) -> Optional[List[dict]]:
+    return _catalog_page({}, page)
+
+
+@track_mongo_latency
+def find_catalog_by_genre(genre_id: int, page: int = 1) -> Optional[List[dict]]:
+    return _catalog_page({"genre_ids": genre_id}, page)
@@ -0,0 +1,200 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.services.catalog import (
+    ensure_catalog_indexes,
+    known_catalog_ids,
+    load_sync_state,
+    remove_catalog_movies,
+    save_sync_state,
+    save_sync_state_details,
+    store_catalog_movies,
+    update_catalog_popularity,
+)
+from app.services.tmdb import make_request, movie_details_url
+import aiohttp
+import asyncio
+import gzip
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# The changes API serves at most 14 days per request
+CHANGES_WINDOW_DAYS = 14
+DETAILS_BATCH_SIZE = 500
+
+
+def export_url(day: date) -> str:
+    return f"{settings.CATALOG_EXPORT_BASE_URL}/movie_ids_{day:%m_%d_%Y}.json.gz"
+
+
+def changes_url(start: date, end: date, page: int = 1) -> str:
+    return (
+        f"{settings.BASE_URL}/movie/changes?api_key={settings.TMDB_API_KEY}"
+        f"&start_date={start.isoformat()}&end_date={end.isoformat()}&page={page}"
+    )
+
+
+def parse_export(payload: bytes) -> List[dict]:
+    """The export is gzipped JSON lines: id, original_title, popularity, adult, video"""
+    entries = []
+
+    for line in gzip.decompress(payload).splitlines():
+        if not line.strip():
+            continue
+
+        entry = orjson.loads(line)
+        if not entry.get("adult"):
+            entries.append(entry)
+
+    return entries
+
+
+async def download_export(day: date) -> bytes:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(export_url(day)) as response:
+            response.raise_for_status()
+
+            return await response.read()
+
+
+async def fetch_details(movie_ids: Iterable[int]) -> Tuple[List[dict], List[int]]:
+    """Details of the movies TMDB still has, and the ids it no longer knows"""
+    semaphore = asyncio.Semaphore(settings.CATALOG_SYNC_CONCURRENCY)
+    found: List[dict] = []
+    missing: List[int] = []
+
+    async def fetch(movie_id: int):
+        async with semaphore:
+            try:
+                found.append(await make_request(movie_details_url(movie_id)))
+            except HTTPException as e:
+                if e.status_code == 404:
+                    missing.append(movie_id)
+                else:
+                    logger.warning(f"Catalog sync skipped movie {movie_id}: {e.detail}")
+
+    await asyncio.gather(*(fetch(movie_id) for movie_id in movie_ids))
+
+    return found, missing
+
+
+async def sync_movies(movie_ids: List[int]) -> Dict[str, int]:
+    """Store fresh details in batches, so a long sync makes steady progress"""
+    stored = removed = 0
+
+    for start in range(0, len(movie_ids), DETAILS_BATCH_SIZE):
+        found, missing = await fetch_details(movie_ids[start : start + DETAILS_BATCH_SIZE])
+        # The sync shares the app's event loop with requests
+        stored += await run_in_threadpool(store_catalog_movies, found)
+        removed += await run_in_threadpool(remove_catalog_movies, missing)
+
+    return {"stored": stored, "removed": removed}
+
+
+async def import_catalog(day: Optional[date] = None) -> Dict[str, int]:
+    """
+    Bulk import of the CATALOG_IMPORT_LIMIT most popular movies from TMDB's
+    daily id export. Yesterday's file is used by default, as today's is only
+    published during the day.
+    """
+    day = day or datetime.now(timezone.utc).date() - timedelta(days=1)
+    ensure_catalog_indexes()
+
+    entries = parse_export(await download_export(day))
+    entries.sort(key=lambda entry: entry.get("popularity") or 0, reverse=True)
+    movie_ids = [entry["id"] for entry in entries[: settings.CATALOG_IMPORT_LIMIT]]
+
+    stats = await sync_movies(movie_ids)
+    # Changes made since the export was generated are picked up next
+    save_sync_state(
+        datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc),
+        imported_at=datetime.now(timezone.utc),
+        popularity_day=day.isoformat(),
+    )
+
+    return stats
+
+
+async def refresh_popularity(day: date) -> int:
+    """
+    Popularity of every mirrored movie from the day's id export. The changes
+    API doesn't report popularity moves, so without this the mirror's popular
+    ordering goes stale.
+    """
+    entries = parse_export(await download_export(day))
+    updated = await run_in_threadpool(
+        update_catalog_popularity,
+        {entry["id"]: entry.get("popularity") or 0 for entry in entries},
+    )
+    save_sync_state_details(popularity_day=day.isoformat())
+
+    return updated
+
+
+async def changed_movie_ids(start: date, end: date) -> List[int]:
+    movie_ids = []
+
+    while start <= end:
+        window_end = min(start + timedelta(days=CHANGES_WINDOW_DAYS - 1), end)
+        page, total_pages = 1, 1
+
+        while page <= total_pages:
+            changes = await make_request(changes_url(start, window_end, page))
+            movie_ids.extend(change["id"] for change in changes.get("results", []))
+            total_pages = changes.get("total_pages", 1)
+            page += 1
+
+        start = window_end + timedelta(days=1)
+
+    return list(dict.fromkeys(movie_ids))
+
+
+async def apply_changes(synced_through: datetime) -> Dict[str, int]:
+    """
+    Refresh the mirrored movies TMDB changed since the last sync. Movies
+    outside the mirror are left out; they join on the next import or when
+    requested.
+    """
+    now = datetime.now(timezone.utc)
+    changed = await changed_movie_ids(synced_through.date(), now.date())
+
+    movie_ids = []
+    for start in range(0, len(changed), DETAILS_BATCH_SIZE):
+        movie_ids.extend(known_catalog_ids(changed[start : start + DETAILS_BATCH_SIZE]))
+
+    stats = await sync_movies(movie_ids)
+    save_sync_state(now)
+
+    return {"changed": len(changed), **stats}
+
+
+async def sync_catalog() -> Dict[str, int]:
+    """
+    Initial import on the first run, incremental changes afterwards, and
+    popularity from each new daily export
+    """
+    state = load_sync_state()
+
+    if state is None:
+        return await import_catalog()
+
+    synced_through = state["synced_through"]
+    if synced_through.tzinfo is None:
+        synced_through = synced_through.replace(tzinfo=timezone.utc)
+
+    stats = await apply_changes(synced_through)
+
+    # A day's export is published during the next one
+    export_day = datetime.now(timezone.utc).date() - timedelta(days=1)
+    if state.get("popularity_day") != export_day.isoformat():
+        try:
+            stats["popularity_updated"] = await refresh_popularity(export_day)
+        except aiohttp.ClientError as e:
+            # Retried on the next sync
+            logger.warning(f"Catalog popularity refresh skipped: {e}")
+
+    return stats
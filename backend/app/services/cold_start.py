@@ -0,0 +1,85 @@
+from typing import List, Optional
+from itertools import zip_longest
+from app.core.config import settings
+from app.schemas.movie import Movie
+from app.schemas.user import User
+from app.services.tmdb import (
+    fetch_popular_movies,
+    fetch_top_rated_movies,
+    fetch_movies_by_genre,
+    fetch_movies_genres,
+)
+import asyncio
+
+# Pages of the popular and top rated lists that feed the pool
+LIST_PAGES = 2
+
+# Precomputed recommendations for users without favorites, ratings or watchlist
+cold_start_movies: List[Movie] = []
+# Concurrent first requests share one lazy refresh instead of each starting one
+_refresh_lock = asyncio.Lock()
+
+
+def is_new_user(user: User) -> bool:
+    return not (user.favorite_movies or user.watchlist or user.ratings)
+
+
+def merge_movie_lists(movie_lists: List[List[Movie]], limit: int) -> List[Movie]:
+    """Interleave the lists so every source (and genre) is represented early"""
+    seen = set()
+    merged = []
+
+    for movies_round in zip_longest(*movie_lists):
+        for movie in movies_round:
+            if movie is not None and movie.id not in seen:
+                seen.add(movie.id)
+                merged.append(movie)
+
+    return merged[:limit]
+
+
+async def refresh_cold_start_movies() -> int:
+    """Rebuild the pool from popular, top rated and per-genre TMDB lists"""
+    global cold_start_movies
+
+    genres = await fetch_movies_genres()
+    results = await asyncio.gather(
+        *(fetch_popular_movies(page) for page in range(1, LIST_PAGES + 1)),
+        *(fetch_top_rated_movies(page) for page in range(1, LIST_PAGES + 1)),
+        *(fetch_movies_by_genre(genre.id) for genre in genres),
+        return_exceptions=True,
+    )
+
+    movies = merge_movie_lists(
+        [result for result in results if isinstance(result, list)],
+        settings.COLD_START_POOL_SIZE,
+    )
+    if movies:
+        cold_start_movies = movies
+
+    return len(movies)
+
+
+def rank_for_genres(movies: List[Movie], genre_ids: List[int]) -> List[Movie]:
+    """Onboarding personalization: most overlapping genres first, pool order kept"""
+    selected = set(genre_ids)
+
+    return sorted(
+        movies, key=lambda movie: -len(selected.intersection(movie.genre_ids or []))
+    )
+
+
+async def get_cold_start_recommendations(
+    genre_ids: Optional[List[int]] = None, limit: int = 20
+) -> List[Movie]:
+    if not cold_start_movies:
+        async with _refresh_lock:
+            # Another request may have filled the pool while this one waited
+            if not cold_start_movies:
+                await refresh_cold_start_movies()
+
+    movies = cold_start_movies
+    if genre_ids:
+        movies = rank_for_genres(movies, genre_ids)
+
+    return movies[:limit]
@@ -0,0 +1,195 @@
+from typing import Dict, Iterable, List, Tuple
+from collections import defaultdict
+from datetime import datetime, timezone
+from pymongo import MongoClient, ReplaceOne
+from app.core.config import settings
+from app.schemas.movie import Movie
+from app.schemas.user import User
+from app.services.tmdb import fetch_multiple_movies_details
+import heapq
+import numpy as np
+
+client = MongoClient(settings.MONGO_CONNECTION_STRING)
+db = client.get_database(settings.MONGO_DATABASE_NAME)
+users_collection = db.get_collection(settings.MONGO_COLLECTION_NAME)
+neighbors_collection = db.get_collection(settings.ITEM_NEIGHBORS_COLLECTION_NAME)
+
+FAVORITE_WEIGHT = 1.0
+WATCHLIST_WEIGHT = 0.5
+MIN_POSITIVE_RATING = 6
+
+# Caps the quadratic pair expansion for very heavy users (strongest signals win)
+MAX_ITEMS_PER_USER = 200
+# Pairs seen together by fewer users than this are treated as noise
+MIN_CO_OCCURRENCE = 2
+
+USER_PROJECTION = {"_id": 0, "favorite_movies": 1, "watchlist": 1, "ratings": 1}
+
+
+def user_item_weights(user_doc: dict) -> Dict[int, float]:
+    """
+    One row of the sparse user-item matrix: only positive signals count,
+    each movie keeps the strongest signal the user gave it.
+    """
+    weights: Dict[int, float] = {}
+
+    for movie_id in user_doc.get("watchlist") or []:
+        weights[movie_id] = max(weights.get(movie_id, 0.0), WATCHLIST_WEIGHT)
+
+    for rating in user_doc.get("ratings") or []:
+        if rating.get("rating", 0) >= MIN_POSITIVE_RATING:
+            movie_id = rating.get("movie_id")
+            weights[movie_id] = max(weights.get(movie_id, 0.0), rating["rating"] / 10)
+
+    for movie_id in user_doc.get("favorite_movies") or []:
+        weights[movie_id] = max(weights.get(movie_id, 0.0), FAVORITE_WEIGHT)
+
+    if len(weights) > MAX_ITEMS_PER_USER:
+        weights = dict(
+            heapq.nlargest(MAX_ITEMS_PER_USER, weights.items(), key=lambda item: item[1])
+        )
+
+    return weights
+
+
+def compute_item_neighbors(
+    user_rows: Iterable[Dict[int, float]], top_n: int
+) -> Dict[int, List[Tuple[int, float]]]:
+    """
+    Cosine item-item similarity over the streamed user rows, top-N per item.
+    Works one item at a time over the sparse user-item matrix, so memory
+    stays linear in the matrix instead of holding every co-occurring pair.
+    """
+    positions: Dict[int, int] = {}
+    entry_items: List[int] = []
+    entry_weights: List[float] = []
+    row_starts = [0]
+
+    for row in user_rows:
+        for item, weight in row.items():
+            entry_items.append(positions.setdefault(item, len(positions)))
+            entry_weights.append(weight)
+        row_starts.append(len(entry_items))
+
+    if not positions:
+        return {}
+
+    item_ids = np.fromiter(positions, dtype=np.int64, count=len(positions))
+    items = np.asarray(entry_items, dtype=np.int64)
+    weights = np.asarray(entry_weights, dtype=np.float64)
+    starts = np.asarray(row_starts, dtype=np.int64)
+    entry_rows = np.repeat(np.arange(len(starts) - 1), np.diff(starts))
+    norms = np.sqrt(np.bincount(items, weights=weights * weights, minlength=len(item_ids)))
+
+    # The matrix by column: each item's entries, one per user who has it
+    by_item = np.argsort(items, kind="stable")
+    item_starts = np.searchsorted(items[by_item], np.arange(len(item_ids) + 1))
+
+    neighbors: Dict[int, List[Tuple[int, float]]] = {}
+
+    for position in range(len(item_ids)):
+        entries = by_item[item_starts[position] : item_starts[position + 1]]
+        if len(entries) < MIN_CO_OCCURRENCE:
+            continue
+
+        # Every entry of the users who have this item
+        users = entry_rows[entries]
+        lengths = starts[users + 1] - starts[users]
+        gathered = np.repeat(starts[users] - np.cumsum(lengths) + lengths, lengths)
+        gathered += np.arange(lengths.sum())
+
+        others = items[gathered]
+        products = np.repeat(weights[entries], lengths) * weights[gathered]
+        keep = others != position
+
+        candidates, inverse = np.unique(others[keep], return_inverse=True)
+        co_occurrences = np.bincount(inverse, minlength=len(candidates))
+        dots = np.bincount(inverse, weights=products[keep], minlength=len(candidates))
+
+        # Pairs seen together by too few users are noise
+        frequent = co_occurrences >= MIN_CO_OCCURRENCE
+        if not frequent.any():
+            continue
+
+        candidates = candidates[frequent]
+        scores = dots[frequent] / (norms[position] * norms[candidates])
+        best = np.lexsort((item_ids[candidates], -scores))[:top_n]
+
+        neighbors[int(item_ids[position])] = [
+            (int(item_ids[candidates[index]]), float(scores[index])) for index in best
+        ]
+
+    return neighbors
+
+
+def rebuild_item_neighbors(top_n: int = settings.ITEM_NEIGHBORS_TOP_N) -> int:
+    """
+    Batch job: streams every user document, recomputes the neighbor table
+    and replaces it in Mongo. Returns the number of movies with neighbors.
+    """
+    started_at = datetime.now(timezone.utc)
+
+    user_rows = (
+        user_item_weights(user_doc)
+        for user_doc in users_collection.find({}, USER_PROJECTION)
+    )
+    neighbors = compute_item_neighbors(user_rows, top_n)
+
+    if neighbors:
+        neighbors_collection.bulk_write(
+            [
+                ReplaceOne(
+                    {"movie_id": movie_id},
+                    {
+                        "movie_id": movie_id,
+                        "neighbors": [
+                            {"movie_id": neighbor_id, "score": round(score, 6)}
+                            for neighbor_id, score in movie_neighbors
+                        ],
+                        "updated_at": started_at,
+                    },
+                    upsert=True,
+                )
+                for movie_id, movie_neighbors in neighbors.items()
+            ],
+            ordered=False,
+        )
+
+    # Movies that lost all their neighbors since the previous run
+    neighbors_collection.delete_many({"updated_at": {"$ne": started_at}})
+    neighbors_collection.create_index("movie_id", unique=True)
+
+    return len(neighbors)
+
+
+def find_neighbor_movie_ids(user: User, limit: int = 20) -> List[int]:
+    """Merge the precomputed neighbors of the user's own movies"""
+    user_weights = user_item_weights(user.model_dump())
+    if not user_weights:
+        return []
+
+    known_ids = (
+        set(user.favorite_movies)
+        | set(user.watchlist)
+        | {rating.movie_id for rating in user.ratings}
+    )
+    scores: Dict[int, float] = defaultdict(float)
+
+    for document in neighbors_collection.find(
+        {"movie_id": {"$in": list(user_weights)}}, {"_id": 0}
+    ):
+        source_weight = user_weights[document["movie_id"]]
+
+        for neighbor in document.get("neighbors", []):
+            if neighbor["movie_id"] not in known_ids:
+                scores[neighbor["movie_id"]] += source_weight * neighbor["score"]
+
+    return heapq.nlargest(limit, scores, key=scores.get)
+
+
+async def recommend_from_neighbors(user: User, limit: int = 20) -> List[Movie]:
+    movie_ids = find_neighbor_movie_ids(user, limit)
+    if not movie_ids:
+        return []
+
+    return await fetch_multiple_movies_details(movie_ids)
@@ -0,0 +1,129 @@
+from typing import Callable, Dict, List, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+def _gzip(body: bytes) -> bytes:
+    # mtime=0 keeps the output deterministic, so ETags of gzipped bodies are stable
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+def available_encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Supported encodings, in order of preference"""
+    encoders = {"br": _brotli} if brotli is not None else {}
+    encoders["gzip"] = _gzip
+
+    return encoders
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    accepted = []
+
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = params.strip()
+
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+
+        accepted.append(coding.strip().lower())
+
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = accepted_encodings(accept_encoding)
+
+    for encoding in available_encoders():
+        if encoding in accepted or "*" in accepted:
+            return encoding
+
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    allowed = {
+        allowed_type.strip().lower()
+        for allowed_type in settings.COMPRESSION_CONTENT_TYPES.split(",")
+    }
+
+    return media_type in allowed
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses whose content type is allowlisted and whose body is
+    at least COMPRESSION_MIN_SIZE bytes, with brotli when installed and
+    accepted, else gzip. Sits inside HTTPCacheMiddleware, so ETags are
+    computed per encoded representation.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = dict(scope.get("headers") or []).get(b"accept-encoding", b"")
+        encoding = choose_encoding(accept_encoding.decode("latin-1"))
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        body: List[bytes] = []
+
+        async def send_compressed(message: Message):
+            nonlocal start
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+
+                if "content-encoding" in headers or not is_compressible(
+                    headers.get("content-type", "")
+                ):
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if start is None:
+                await send(message)
+                return
+
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            content = b"".join(body)
+            headers = MutableHeaders(raw=list(start["headers"]))
+            headers.add_vary_header("Accept-Encoding")
+
+            if len(content) >= settings.COMPRESSION_MIN_SIZE:
+                content = available_encoders()[encoding](content)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(content))
+
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": content})
+
+        await self.app(scope, receive, send_compressed)
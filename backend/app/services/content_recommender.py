@@ -0,0 +1,288 @@
+from typing import Dict, Iterable, List, Optional
+from app.core.config import settings
+from app.schemas.movie import Movie
+from app.schemas.user import User
+from app.services.tmdb import (
+    fetch_popular_movies,
+    fetch_top_rated_movies,
+    fetch_multiple_movies_details,
+)
+from app.services.ollama_recommender import PROMPT_SECTIONS, categorize_ratings
+import numpy as np
+import asyncio
+import math
+import re
+import threading
+import zlib
+
+# TMDB's movie genre ids - one one-hot column each in the feature matrix
+GENRE_COLUMNS = [
+    28, 12, 16, 35, 80, 99, 18, 10751, 14, 36,
+    27, 10402, 9648, 10749, 878, 10770, 53, 10752, 37,
+]
+GENRE_INDEX = {genre_id: index for index, genre_id in enumerate(GENRE_COLUMNS)}
+
+NUMERIC_DIMENSIONS = 3  # popularity, vote_average, release year
+OVERVIEW_DIMENSIONS = 64  # hashed bag-of-words over the overview text
+FEATURE_DIMENSIONS = len(GENRE_COLUMNS) + NUMERIC_DIMENSIONS + OVERVIEW_DIMENSIONS
+NUMERIC_COLUMNS = slice(len(GENRE_COLUMNS), len(GENRE_COLUMNS) + NUMERIC_DIMENSIONS)
+
+GENRE_WEIGHT = 1.0
+NUMERIC_WEIGHT = 0.5
+OVERVIEW_WEIGHT = 0.5
+
+FAVORITE_WEIGHT = 1.0
+WATCHLIST_WEIGHT = 0.5
+
+# The user's movies that make up the profile, strongest signals first. Bounds
+# the TMDB details fetched for movies outside the catalog
+MAX_PROFILE_MOVIES = 40
+
+TOKEN_PATTERN = re.compile(r"[a-z]{3,}")
+
+
+def _movie_genre_ids(movie: Movie) -> List[int]:
+    """List results carry genre_ids, detail results carry genres objects"""
+    if movie.genre_ids:
+        return movie.genre_ids
+
+    return [
+        genre.get("id") for genre in movie.genres or [] if isinstance(genre, dict)
+    ]
+
+
+def _release_year(movie: Movie) -> Optional[int]:
+    if not movie.release_date or len(movie.release_date) < 4:
+        return None
+
+    try:
+        return int(movie.release_date[:4])
+    except ValueError:
+        return None
+
+
+def _overview_embedding(overview: Optional[str]) -> np.ndarray:
+    """Feature-hashed, L2-normalised bag of words for the overview"""
+    vector = np.zeros(OVERVIEW_DIMENSIONS, dtype=np.float32)
+
+    for token in TOKEN_PATTERN.findall((overview or "").lower()):
+        digest = zlib.crc32(token.encode())
+        sign = 1.0 if digest & 1 else -1.0
+        vector[(digest >> 1) % OVERVIEW_DIMENSIONS] += sign
+
+    norm = np.linalg.norm(vector)
+
+    return vector / norm if norm else vector
+
+
+def build_feature_vector(movie: Movie) -> np.ndarray:
+    """Raw (uncentered) feature row for a single movie"""
+    vector = np.zeros(FEATURE_DIMENSIONS, dtype=np.float32)
+
+    genre_ids = [gid for gid in _movie_genre_ids(movie) if gid in GENRE_INDEX]
+    for genre_id in genre_ids:
+        vector[GENRE_INDEX[genre_id]] = GENRE_WEIGHT / math.sqrt(len(genre_ids))
+
+    offset = len(GENRE_COLUMNS)
+    year = _release_year(movie)
+
+    vector[offset] = min(math.log1p(movie.popularity or 0) / 10, 1.0)
+    vector[offset + 1] = (movie.vote_average or 0) / 10
+    vector[offset + 2] = min(max(((year or 1990) - 1900) / 130, 0.0), 1.0)
+    vector[offset : offset + NUMERIC_DIMENSIONS] *= NUMERIC_WEIGHT
+
+    vector[offset + NUMERIC_DIMENSIONS :] = (
+        _overview_embedding(movie.overview) * OVERVIEW_WEIGHT
+    )
+
+    return vector
+
+
+class MovieFeatureMatrix:
+    """
+    In-memory catalog of movies as a dense float32 matrix.
+
+    Numeric columns are centered over the catalog and rows are L2-normalised,
+    so scoring a user profile against every movie is one matrix-vector product.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._movies: Dict[int, Movie] = {}
+        self._raw_rows: Dict[int, np.ndarray] = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._matrix = np.empty((0, FEATURE_DIMENSIONS), dtype=np.float32)
+        self._row_index: Dict[int, int] = {}
+        self._numeric_mean = np.zeros(NUMERIC_DIMENSIONS, dtype=np.float32)
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._movies)
+
+    def __contains__(self, movie_id: int) -> bool:
+        return movie_id in self._movies
+
+    def add_movies(self, movies: Iterable[Movie]) -> None:
+        with self._lock:
+            for movie in movies:
+                self._movies[movie.id] = movie
+                self._raw_rows[movie.id] = build_feature_vector(movie)
+                self._dirty = True
+
+    def _snapshot(self):
+        """Rebuild the matrix if movies were added, then return a consistent view"""
+        with self._lock:
+            if self._dirty:
+                ids = list(self._raw_rows.keys())
+                matrix = np.vstack([self._raw_rows[movie_id] for movie_id in ids])
+
+                self._numeric_mean = matrix[:, NUMERIC_COLUMNS].mean(axis=0)
+                matrix[:, NUMERIC_COLUMNS] -= self._numeric_mean
+
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+
+                self._matrix = matrix / norms
+                self._ids = np.asarray(ids, dtype=np.int64)
+                self._row_index = {movie_id: row for row, movie_id in enumerate(ids)}
+                self._dirty = False
+
+            return self._matrix, self._ids, self._row_index, self._numeric_mean
+
+    @staticmethod
+    def _catalog_row(movie: Movie, numeric_mean: np.ndarray) -> np.ndarray:
+        """A movie's row as if it were in the catalog, without adding it"""
+        row = build_feature_vector(movie)
+        row[NUMERIC_COLUMNS] -= numeric_mean
+        norm = np.linalg.norm(row)
+
+        return row / norm if norm else row
+
+    def profile_vector(
+        self, weights: Dict[int, float], extra_movies: Iterable[Movie] = ()
+    ) -> Optional[np.ndarray]:
+        """
+        Weighted sum of the rows for the given movie ids. extra_movies are
+        movies outside the catalog, scored without joining it.
+        """
+        matrix, _, row_index, numeric_mean = self._snapshot()
+
+        catalog_ids = [movie_id for movie_id in weights if movie_id in row_index]
+        rows = [matrix[row_index[movie_id]] for movie_id in catalog_ids]
+        row_weights = [weights[movie_id] for movie_id in catalog_ids]
+
+        for movie in extra_movies:
+            if movie.id in weights and movie.id not in row_index:
+                rows.append(self._catalog_row(movie, numeric_mean))
+                row_weights.append(weights[movie.id])
+
+        if not rows:
+            return None
+
+        profile = np.asarray(row_weights, dtype=np.float32) @ np.vstack(rows)
+        norm = np.linalg.norm(profile)
+
+        return profile / norm if norm else None
+
+    def top_k(
+        self, profile: np.ndarray, k: int, exclude: Iterable[int] = ()
+    ) -> List[Movie]:
+        """Score every movie against the profile and return the k best"""
+        matrix, ids, row_index, _ = self._snapshot()
+
+        excluded_rows = [row_index[mid] for mid in set(exclude) if mid in row_index]
+        candidates = min(k, len(ids) - len(excluded_rows))
+        if candidates <= 0:
+            return []
+
+        scores = matrix @ profile
+        scores[excluded_rows] = -np.inf
+
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+        top = top[np.argsort(-scores[top])]
+
+        return [self._movies[int(ids[row])] for row in top]
+
+
+feature_matrix = MovieFeatureMatrix()
+
+
+def build_user_weights(user: User) -> Dict[int, float]:
+    """Per-movie profile weights; low ratings pull the profile away"""
+    weights: Dict[int, float] = {}
+
+    for movie_id in user.watchlist:
+        weights[movie_id] = weights.get(movie_id, 0.0) + WATCHLIST_WEIGHT
+
+    for movie_id in user.favorite_movies:
+        weights[movie_id] = weights.get(movie_id, 0.0) + FAVORITE_WEIGHT
+
+    for rating in user.ratings:
+        weights[rating.movie_id] = weights.get(rating.movie_id, 0.0) + (
+            (rating.rating - 5.5) / 4.5
+        )
+
+    return {movie_id: weight for movie_id, weight in weights.items() if weight}
+
+
+def profile_movie_ids(user: User) -> List[int]:
+    """
+    The user's movies in prompt section order: newest favorites, strongest
+    ratings, newest watchlist - capped at MAX_PROFILE_MOVIES
+    """
+    candidates = {
+        "favorites": reversed(user.favorite_movies),
+        "watchlist": reversed(user.watchlist),
+        **categorize_ratings(user.ratings),
+    }
+    ordered = dict.fromkeys(
+        movie_id for key, _, _ in PROMPT_SECTIONS for movie_id in candidates[key]
+    )
+
+    return list(ordered)[:MAX_PROFILE_MOVIES]
+
+
+async def refresh_feature_matrix(
+    pages: int = settings.CONTENT_RECOMMENDER_CATALOG_PAGES,
+) -> int:
+    """Load popular and top rated pages from TMDB into the feature matrix"""
+    results = await asyncio.gather(
+        *(fetch_popular_movies(page) for page in range(1, pages + 1)),
+        *(fetch_top_rated_movies(page) for page in range(1, pages + 1)),
+        return_exceptions=True,
+    )
+
+    movies = [
+        movie for result in results if isinstance(result, list) for movie in result
+    ]
+    feature_matrix.add_movies(movies)
+
+    return len(movies)
+
+
+async def recommend_similar_movies(user: User, limit: int = 20) -> List[Movie]:
+    """Content-based recommendations without any LLM call"""
+    all_weights = build_user_weights(user)
+    weights = {
+        movie_id: all_weights[movie_id]
+        for movie_id in profile_movie_ids(user)
+        if movie_id in all_weights
+    }
+
+    # Profile movies outside the catalog count, but don't join the shared matrix
+    missing_ids = [movie_id for movie_id in weights if movie_id not in feature_matrix]
+    extra_movies = []
+    if missing_ids:
+        extra_movies = await fetch_multiple_movies_details(missing_ids)
+
+    profile = feature_matrix.profile_vector(weights, extra_movies)
+    if profile is None:
+        return []
+
+    known_ids = (
+        set(user.favorite_movies)
+        | set(user.watchlist)
+        | {rating.movie_id for rating in user.ratings}
+    )
+
+    return feature_matrix.top_k(profile, limit, exclude=known_ids)
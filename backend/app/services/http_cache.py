@@ -0,0 +1,170 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from collections import OrderedDict
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.services.metrics import record_cache_lookup
+import hashlib
+import time
+
+# Cache-Control per route template. Genres, cast and trailers hardly change;
+# popular movies are reordered by TMDB through the day
+CACHE_POLICIES: Dict[str, Tuple[str, int]] = {
+    "/movies/genres": ("public, max-age=86400", 86400),
+    "/movies/{movie_id}/cast": ("public, max-age=86400", 86400),
+    "/movies/{movie_id}/trailer": ("public, max-age=86400", 86400),
+    "/movies/popular": ("public, max-age=300, stale-while-revalidate=600", 300),
+}
+ETAG_MEMO_SIZE = 4096
+
+# Path, query string and Accept-Encoding
+MemoKey = Tuple[str, bytes, bytes]
+
+
+class EtagMemo(NamedTuple):
+    etag: bytes
+    cache_control: bytes
+    # The 200's Vary, so a 304 names the same variant
+    vary: Optional[bytes]
+    route: BaseRoute
+    expires_at: float
+
+
+def compute_etag(body: bytes) -> bytes:
+    """Strong validator: identical bodies, byte for byte, share an ETag"""
+    return b'"' + hashlib.sha256(body).hexdigest()[:32].encode() + b'"'
+
+
+def etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    candidates = [candidate.strip() for candidate in if_none_match.split(b",")]
+
+    return b"*" in candidates or etag in candidates
+
+
+def not_modified_start(
+    etag: bytes, cache_control: bytes, vary: Optional[bytes] = None
+) -> Message:
+    headers = [(b"etag", etag), (b"cache-control", cache_control)]
+
+    if vary is not None:
+        headers.append((b"vary", vary))
+
+    return {"type": "http.response.start", "status": 304, "headers": headers}
+
+
+class HTTPCacheMiddleware:
+    """
+    Adds Cache-Control and a body ETag to the routes in CACHE_POLICIES and
+    answers matching If-None-Match requests with 304. ETags served within
+    the route's max-age are remembered per URL, so revalidations in that
+    window get their 304 without the endpoint running at all.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.memo: "OrderedDict[MemoKey, EtagMemo]" = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not settings.HTTP_CACHE_ENABLED
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        # Responses vary by encoding, and so do their ETags
+        key = (
+            scope["path"],
+            scope.get("query_string", b""),
+            headers.get(b"accept-encoding", b""),
+        )
+        if_none_match = headers.get(b"if-none-match")
+
+        if if_none_match and await self._answer_from_memo(key, if_none_match, scope, send):
+            return
+
+        start: Optional[Message] = None
+        policy: Optional[Tuple[str, int]] = None
+        body: List[bytes] = []
+
+        async def send_with_validators(message: Message):
+            nonlocal start, policy
+
+            if message["type"] == "http.response.start":
+                route_path = getattr(scope.get("route"), "path", None)
+                policy = CACHE_POLICIES.get(route_path) if message["status"] == 200 else None
+
+                if policy is None:
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if start is None:
+                await send(message)
+                return
+
+            # Buffer the (small, JSON) body to hash it
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            content = b"".join(body)
+            etag = compute_etag(content)
+            cache_control = policy[0].encode()
+            vary = dict(
+                (name.lower(), value) for name, value in start["headers"]
+            ).get(b"vary")
+            self._remember(
+                key,
+                EtagMemo(
+                    etag, cache_control, vary, scope["route"], time.monotonic() + policy[1]
+                ),
+            )
+
+            if if_none_match and etag_matches(if_none_match, etag):
+                await send(not_modified_start(etag, cache_control, vary))
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            headers = [
+                (name, value)
+                for name, value in start["headers"]
+                if name.lower() not in (b"etag", b"cache-control")
+            ]
+            headers += [(b"etag", etag), (b"cache-control", cache_control)]
+
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": content})
+
+        await self.app(scope, receive, send_with_validators)
+
+    def _remember(self, key: MemoKey, memo: EtagMemo):
+        self.memo[key] = memo
+        self.memo.move_to_end(key)
+
+        while len(self.memo) > ETAG_MEMO_SIZE:
+            self.memo.popitem(last=False)
+
+    async def _answer_from_memo(
+        self, key: MemoKey, if_none_match: bytes, scope: Scope, send: Send
+    ) -> bool:
+        memo = self.memo.get(key)
+
+        if memo is None or time.monotonic() > memo.expires_at:
+            return False
+
+        hit = etag_matches(if_none_match, memo.etag)
+        record_cache_lookup("etag_memo", hit)
+
+        if not hit:
+            return False
+
+        # Lets the outer middleware label the request by its route
+        scope["route"] = memo.route
+        await send(not_modified_start(memo.etag, memo.cache_control, memo.vary))
+        await send({"type": "http.response.body", "body": b""})
+
+        return True
@@ -0,0 +1,160 @@
+from typing import Callable
+from contextlib import contextmanager
+from functools import wraps
+from urllib.parse import urlsplit
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+import inspect
+import re
+import time
+
+# Recommendations and LLM calls run for tens of seconds, the defaults stop at 10s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LLM_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+SIZE_BUCKETS = (100, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size by route",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+TMDB_REQUEST_LATENCY = Histogram(
+    "tmdb_request_duration_seconds",
+    "TMDB upstream latency by endpoint and status",
+    ["endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+MONGO_OPERATION_LATENCY = Histogram(
+    "mongo_operation_duration_seconds",
+    "Mongo operation latency by service function",
+    ["function"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Cache lookups by cache and result", ["cache", "result"]
+)
+PREFETCHES = Counter(
+    "prefetches_total", "Read-ahead page prefetches by outcome", ["outcome"]
+)
+OLLAMA_INFERENCE_DURATION = Histogram(
+    "ollama_inference_duration_seconds",
+    "Ollama completion duration",
+    ["mode"],
+    buckets=LLM_BUCKETS,
+)
+OLLAMA_TOKENS = Counter(
+    "ollama_tokens_total", "Tokens processed by Ollama", ["kind"]
+)
+RECOMMENDATION_STAGE_DURATION = Histogram(
+    "recommendation_stage_duration_seconds",
+    "Recommendation pipeline stage duration",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# Numeric path segments (movie, review and person ids) would explode label cardinality
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+# Review ids are hex strings
+_REVIEW_SEGMENT = re.compile(r"(?<=/review/)[^/]+")
+
+
+def tmdb_endpoint(url: str) -> str:
+    path = urlsplit(url).path
+    base_path = urlsplit(settings.BASE_URL).path
+
+    if path.startswith(base_path):
+        path = path[len(base_path) :]
+
+    path = _REVIEW_SEGMENT.sub("{id}", path)
+
+    return _ID_SEGMENT.sub("/{id}", path) or "/"
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+@contextmanager
+def time_mongo_operation(function: str):
+    started_at = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        MONGO_OPERATION_LATENCY.labels(function=function).observe(
+            time.perf_counter() - started_at
+        )
+
+
+def track_mongo_latency(func: Callable) -> Callable:
+    """Observe the duration of a Mongo-bound service function"""
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with time_mongo_operation(func.__name__):
+                return await func(*args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with time_mongo_operation(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class MetricsMiddleware:
+    """Request latency, in-flight requests and response sizes per route template"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message):
+            nonlocal status, size
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        started_at = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+
+            # The router stores the matched route in the scope; unmatched paths
+            # share one label instead of one series per URL
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+
+            REQUEST_LATENCY.labels(
+                method=method, route=route_path, status=str(status)
+            ).observe(time.perf_counter() - started_at)
+            RESPONSE_SIZE.labels(method=method, route=route_path).observe(size)
@@ -0,0 +1,62 @@
+from app.core.config import settings
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+# OLLAMA_SERVER_ENDPOINT points at the OpenAI-compatible API (".../v1");
+# loading and residency live on Ollama's native API next to it
+OLLAMA_NATIVE_URL = settings.OLLAMA_SERVER_ENDPOINT.rstrip("/").removesuffix("/v1")
+
+# Loading a 7B model from disk can take tens of seconds on CPU
+MODEL_LOAD_TIMEOUT_SECONDS = 120
+RESIDENCY_CHECK_TIMEOUT_SECONDS = 2
+
+
+def load_model(keep_alive: str = settings.OLLAMA_KEEP_ALIVE) -> bool:
+    """
+    Loads the model into memory (a generate call without a prompt only loads)
+    and resets Ollama's idle-unload timer to `keep_alive`.
+    """
+    try:
+        response = httpx.post(
+            f"{OLLAMA_NATIVE_URL}/api/generate",
+            json={"model": settings.MODEL_ID, "keep_alive": keep_alive},
+            timeout=MODEL_LOAD_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+
+        return True
+
+    except httpx.HTTPError as e:
+        logger.warning(f"Could not load model '{settings.MODEL_ID}': {e}")
+
+        return False
+
+
+def warm_up_model():
+    """Startup job, so the first recommendation request doesn't pay the cold load"""
+    if load_model():
+        logger.info(f"Model '{settings.MODEL_ID}' warmed up.")
+
+
+def keep_model_alive():
+    """Periodic ping; also reloads the model if Ollama unloaded it anyway"""
+    if load_model():
+        logger.info(f"Model '{settings.MODEL_ID}' kept alive for {settings.OLLAMA_KEEP_ALIVE}.")
+
+
+async def is_model_resident() -> bool:
+    """Asks Ollama which models are currently loaded in memory"""
+    try:
+        async with httpx.AsyncClient(timeout=RESIDENCY_CHECK_TIMEOUT_SECONDS) as client:
+            response = await client.get(f"{OLLAMA_NATIVE_URL}/api/ps")
+            response.raise_for_status()
+
+    except httpx.HTTPError:
+        return False
+
+    return any(
+        settings.MODEL_ID in (model.get("name"), model.get("model"))
+        for model in response.json().get("models", [])
+    )
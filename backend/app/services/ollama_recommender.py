@@ -1,14 +1,35 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from app.schemas.rating import RatingEntry
+from app.schemas.recommendation import RecommendedMovie
 from pydantic_ai.models.openai import OpenAIModel
 from pydantic_ai.providers.openai import OpenAIProvider
 from pydantic_ai.agent import Agent
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from pydantic import ValidationError
 from app.core.config import settings
 from app.schemas.user import User
-from app.services.tmdb import fetch_movie_details
+from app.schemas.movie import Movie
+from app.services.tmdb import fetch_multiple_movies_details
+from app.services.recommendation_cache import (
+    preference_signature,
+    recommendation_cache,
+)
+from app.services.tracing import span, record_stage
+from app.services.metrics import (
+    OLLAMA_INFERENCE_DURATION,
+    OLLAMA_TOKENS,
+    record_cache_lookup,
+)
+from contextlib import aclosing
+from itertools import zip_longest
 import json
 import re
 import asyncio
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
 
 
 # Enhanced system prompt that considers multiple data sources
@@ -23,8 +44,59 @@ SYSTEM_PROMPT = (
     "No extra text or explanation."
 )
 
+# Structured mode: the model fills a {title, year} array through pydantic-ai's
+# output tool, so the JSON is schema-constrained instead of regex-rescued
+STRUCTURED_SYSTEM_PROMPT = (
+    "You are an advanced movie recommendation assistant. "
+    "Based on the user's movie preferences including favorite movies, watchlist, and ratings, "
+    "recommend exactly 20 movies that match their taste. "
+    "Consider the user's rating patterns - movies they rated highly should influence recommendations more. "
+    "Avoid recommending movies that are already in their favorites or watchlist. "
+    "Return every movie with its original release year."
+)
+
+RECOMMENDATION_COUNT = 20
+# Room for the known titles the model repeats and that get filtered out
+RECOMMENDATION_HEADROOM = 10
+
+# One {"title": "...", "year": 1999} item is ~15-25 tokens, plus the tool call wrapper
+TOKENS_PER_RECOMMENDATION = 24
+RESPONSE_TOKEN_OVERHEAD = 64
+
 MODEL_SETTINGS = {"temperature": 0.2, "max_tokens": 768}
 
+BASE_INSTRUCTION = (
+    "Based on this user's movie preferences, recommend exactly 20 movies that would match their taste. "
+    "Prioritize movies similar to their favorites and highly-rated films. "
+    "Consider their watchlist interests but avoid recommending movies they've already rated poorly."
+)
+
+KNOWN_MOVIES_NOTE = (
+    "The user already knows every movie listed above - do not recommend them."
+)
+
+# Prompt sections in order: key, label, share of the title token budget
+PROMPT_SECTIONS = [
+    ("favorites", "FAVORITE MOVIES", 0.3),
+    ("high_rated", "HIGHLY RATED MOVIES (8-10/10)", 0.3),
+    ("medium_rated", "MODERATELY LIKED MOVIES (6-7/10)", 0.15),
+    ("watchlist", "MOVIES IN WATCHLIST (showing interest)", 0.15),
+    ("low_rated", "DISLIKED MOVIES (avoid similar)", 0.1),
+]
+
+CHARS_PER_TOKEN = 4
+# Average title plus its ", " separator
+TOKENS_PER_TITLE = 6
+# How many more candidates than the budget holds to fetch for genre diversity
+CANDIDATE_OVERSAMPLING = 2
+
+STRUCTURED_MODEL_SETTINGS = {
+    "temperature": 0.2,
+    "max_tokens": (RECOMMENDATION_COUNT + RECOMMENDATION_HEADROOM)
+    * TOKENS_PER_RECOMMENDATION
+    + RESPONSE_TOKEN_OVERHEAD,
+}
+
 MODEL = OpenAIModel(
     model_name=settings.MODEL_ID,
     provider=OpenAIProvider(base_url=settings.OLLAMA_SERVER_ENDPOINT),
@@ -46,167 +118,312 @@ def parse_json_array(raw: str) -> List[str]:
     return []
 
 
-async def get_movie_titles_from_ids(movie_ids: List[int]) -> List[str]:
-    """Fetch movie titles from TMDB API"""
+def collect_new_recommendations(
+    candidates: List[RecommendedMovie],
+    known_titles: List[str],
+    limit: int = RECOMMENDATION_COUNT,
+) -> List[RecommendedMovie]:
+    """Drop duplicates and movies the user already knows, keep model order"""
+    seen = {title.lower() for title in known_titles}
+    recommendations = []
+
+    for candidate in candidates:
+        key = candidate.title.strip().lower()
+
+        if key and key not in seen:
+            recommendations.append(candidate)
+            seen.add(key)
+
+            if len(recommendations) >= limit:
+                break
+
+    return recommendations
+
+
+class _EnoughRecommendations(Exception):
+    """Aborts a streamed run; a clean exit would drain the rest of the stream"""
+
+    def __init__(self, recommendations: List[RecommendedMovie]):
+        super().__init__()
+        self.recommendations = recommendations
+
+
+async def run_structured_recommendations(
+    agent: Agent, user_prompt: str, known_titles: List[str]
+) -> List[RecommendedMovie]:
+    """
+    Stream the structured output and stop generating as soon as enough
+    valid recommendations are parsed - aborting the stream stops inference.
+    Output cut off by max_tokens or ending in bad JSON keeps the items
+    already parsed.
+    """
+    partial: List[RecommendedMovie] = []
+    usage = None
+    started_at = time.perf_counter()
+    first_output_at = None
+    parse_seconds = 0.0
+
     try:
-        movies = await asyncio.gather(
-            *(fetch_movie_details(movie_id) for movie_id in movie_ids)
-        )
-        return [movie.title for movie in movies if movie]
-    except Exception:
-        return []
+        async with agent.run_stream(user_prompt) as result:
+            try:
+                async with aclosing(result.stream(debounce_by=None)) as stream:
+                    async for partial in stream:
+                        # Time to the first parsed output approximates prefill
+                        if first_output_at is None:
+                            first_output_at = time.perf_counter()
+
+                        parse_started_at = time.perf_counter()
+                        # Until the stream ends, the last item may still be mid-generation
+                        recommendations = collect_new_recommendations(
+                            partial[:-1], known_titles
+                        )
+                        parse_seconds += time.perf_counter() - parse_started_at
+
+                        if len(recommendations) >= RECOMMENDATION_COUNT:
+                            raise _EnoughRecommendations(recommendations)
+            finally:
+                usage = result.usage()
+
+    except _EnoughRecommendations as enough:
+        recommendations = enough.recommendations
+
+    except (ValidationError, UnexpectedModelBehavior) as e:
+        # The final, non-partial validation failed; nothing parsed, nothing to keep
+        if not partial:
+            raise
+
+        logger.warning(f"Structured output ended early, keeping parsed items: {e}")
+        recommendations = collect_new_recommendations(partial[:-1], known_titles)
+
+    else:
+        recommendations = collect_new_recommendations(partial, known_titles)
+
+    finished_at = time.perf_counter()
+    first_output_at = first_output_at or finished_at
+
+    record_stage("llm_prefill", (first_output_at - started_at) * 1000)
+    record_stage(
+        "llm_generation",
+        (finished_at - first_output_at - parse_seconds) * 1000,
+        request_tokens=usage.request_tokens,
+        response_tokens=usage.response_tokens,
+    )
+    record_stage("parse", parse_seconds * 1000, recommendations=len(recommendations))
+
+    OLLAMA_INFERENCE_DURATION.labels(mode="structured").observe(
+        finished_at - started_at
+    )
+    OLLAMA_TOKENS.labels(kind="prompt").inc(usage.request_tokens or 0)
+    OLLAMA_TOKENS.labels(kind="completion").inc(usage.response_tokens or 0)
+
+    return recommendations
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate - Mistral's tokenizer averages ~4 chars per token"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
 
 
 def categorize_ratings(ratings: List[RatingEntry]) -> Dict[str, List[int]]:
-    """Categorize movies by rating levels"""
+    """
+    Categorize movies by rating levels. Within a level the strongest
+    ratings come first (highest, or lowest for disliked), then the newest.
+    """
     high_rated = []  # 8-10
     medium_rated = []  # 6-7
     low_rated = []  # 1-5
 
-    for rating_data in ratings:
+    # Ratings are appended as they are given, so a higher index is more recent
+    for recency, rating_data in enumerate(ratings):
         score = rating_data.rating
-        movie_id = rating_data.movie_id
+        entry = (score, recency, rating_data.movie_id)
 
         if score >= 8:
-            high_rated.append(movie_id)
+            high_rated.append(entry)
         elif score >= 6:
-            medium_rated.append(movie_id)
+            medium_rated.append(entry)
         else:
-            low_rated.append(movie_id)
+            low_rated.append(entry)
+
+    def strongest_first(entries, highest: bool) -> List[int]:
+        entries.sort(key=lambda e: (-e[0] if highest else e[0], -e[1]))
+        return [movie_id for _, _, movie_id in entries]
 
     return {
-        "high_rated": high_rated,
-        "medium_rated": medium_rated,
-        "low_rated": low_rated,
+        "high_rated": strongest_first(high_rated, highest=True),
+        "medium_rated": strongest_first(medium_rated, highest=True),
+        "low_rated": strongest_first(low_rated, highest=False),
     }
 
 
-def build_enhanced_prompt(
-    favorite_titles: List[str],
-    watchlist_titles: List[str],
-    rating_categories: Dict[str, List[str]],
-    existing_movies: List[str],
-) -> str:
-    """Build comprehensive user prompt with all preference data"""
+def _primary_genre(movie: Movie) -> Optional[int]:
+    if movie.genres:
+        return movie.genres[0].get("id")
+    if movie.genre_ids:
+        return movie.genre_ids[0]
+    return None
 
-    prompt_parts = []
 
-    # Add favorite movies
-    if favorite_titles:
-        prompt_parts.append(f"FAVORITE MOVIES: {', '.join(favorite_titles)}")
+def diversify_by_genre(movies: List[Movie]) -> List[Movie]:
+    """Round-robin over primary genres so one genre cannot fill the budget"""
+    buckets: Dict[Optional[int], List[Movie]] = {}
 
-    # Add highly rated movies (these are strong indicators)
-    if rating_categories["high_rated"]:
-        prompt_parts.append(
-            f"HIGHLY RATED MOVIES (8-10/10): {', '.join(rating_categories['high_rated'])}"
-        )
+    for movie in movies:
+        buckets.setdefault(_primary_genre(movie), []).append(movie)
 
-    # Add medium rated movies
-    if rating_categories["medium_rated"]:
-        prompt_parts.append(
-            f"MODERATELY LIKED MOVIES (6-7/10): {', '.join(rating_categories['medium_rated'])}"
-        )
+    return [
+        movie
+        for genre_round in zip_longest(*buckets.values())
+        for movie in genre_round
+        if movie is not None
+    ]
 
-    # Add watchlist context (shows interest but not yet watched)
-    if watchlist_titles:
-        prompt_parts.append(
-            f"MOVIES IN WATCHLIST (showing interest): {', '.join(watchlist_titles)}"
-        )
 
-    # Add movies to avoid
-    if rating_categories["low_rated"]:
-        prompt_parts.append(
-            f"DISLIKED MOVIES (avoid similar): {', '.join(rating_categories['low_rated'])}"
-        )
+async def select_prompt_titles(
+    user: User, token_budget: int = settings.PROMPT_TOKEN_BUDGET
+) -> Dict[str, List[str]]:
+    """
+    Sample the user's movies into the prompt sections within the token
+    budget: most relevant first, genre-diverse, unused budget carried over.
+    """
+    rating_categories = categorize_ratings(user.ratings)
+    candidates = {
+        "favorites": list(reversed(user.favorite_movies)),
+        "watchlist": list(reversed(user.watchlist)),
+        **rating_categories,
+    }
 
-    # Add existing movies to avoid duplicates
-    if existing_movies:
-        prompt_parts.append(
-            f"DO NOT RECOMMEND (already known): {', '.join(existing_movies)}"
-        )
+    # Instruction, note and section labels are fixed costs of the prompt
+    fixed_tokens = estimate_tokens(BASE_INSTRUCTION + KNOWN_MOVIES_NOTE) + sum(
+        estimate_tokens(f"\n{label}: ") for _, label, _ in PROMPT_SECTIONS
+    )
+    titles_budget = max(token_budget - fixed_tokens, 0)
+    allowances = {
+        key: int(titles_budget * share) for key, _, share in PROMPT_SECTIONS
+    }
 
-    base_instruction = (
-        "Based on this user's movie preferences, recommend exactly 20 movies that would match their taste. "
-        "Prioritize movies similar to their favorites and highly-rated films. "
-        "Consider their watchlist interests but avoid recommending movies they've already rated poorly."
+    # Fetch a genre-diversity margin beyond what each allowance can hold
+    pools = await asyncio.gather(
+        *(
+            fetch_multiple_movies_details(
+                candidates[key][
+                    : math.ceil(allowances[key] / TOKENS_PER_TITLE)
+                    * CANDIDATE_OVERSAMPLING
+                ]
+            )
+            for key, _, _ in PROMPT_SECTIONS
+        )
     )
 
-    return base_instruction + "\n\n" + "\n".join(prompt_parts)
+    section_titles: Dict[str, List[str]] = {}
+    carry_over = 0
 
+    for (key, _, _), pool in zip(PROMPT_SECTIONS, pools):
+        allowance = allowances[key] + carry_over
+        used = 0
+        titles = []
 
-async def generate_enhanced_movie_recommendations(user: User) -> List[str]:
-    """Generate movie recommendations using comprehensive user data"""
+        for movie in diversify_by_genre(pool):
+            cost = estimate_tokens(movie.title + ", ")
 
-    # Get movie titles for all user data
-    favorite_titles = await get_movie_titles_from_ids(user.favorite_movies)
-    watchlist_titles = await get_movie_titles_from_ids(user.watchlist)
+            if used + cost > allowance:
+                break
 
-    # Process ratings data
-    rating_categories = categorize_ratings(user.ratings)
+            titles.append(movie.title)
+            used += cost
 
-    # Get titles for rated movies
-    high_rated_titles = await get_movie_titles_from_ids(rating_categories["high_rated"])
-    medium_rated_titles = await get_movie_titles_from_ids(
-        rating_categories["medium_rated"]
-    )
-    low_rated_titles = await get_movie_titles_from_ids(rating_categories["low_rated"])
-
-    # Combine all existing movies to avoid duplicates
-    all_existing_movies = (
-        favorite_titles
-        + watchlist_titles
-        + high_rated_titles
-        + medium_rated_titles
-        + low_rated_titles
-    )
+        section_titles[key] = titles
+        carry_over = allowance - used
 
-    # Build the enhanced prompt
-    user_prompt = build_enhanced_prompt(
-        favorite_titles=favorite_titles,
-        watchlist_titles=watchlist_titles,
-        rating_categories={
-            "high_rated": high_rated_titles,
-            "medium_rated": medium_rated_titles,
-            "low_rated": low_rated_titles,
-        },
-        existing_movies=all_existing_movies,
-    )
+    return section_titles
+
+
+def build_enhanced_prompt(section_titles: Dict[str, List[str]]) -> str:
+    """
+    Build the user prompt from already-sampled titles. Known movies are not
+    repeated in a "do not recommend" list - they are filtered out in code.
+    """
+    prompt_parts = [
+        f"{label}: {', '.join(section_titles[key])}"
+        for key, label, _ in PROMPT_SECTIONS
+        if section_titles.get(key)
+    ]
+
+    if prompt_parts:
+        prompt_parts.append(KNOWN_MOVIES_NOTE)
+
+    return BASE_INSTRUCTION + "\n\n" + "\n".join(prompt_parts)
 
-    # Fallback for users with minimal data
-    if not any([favorite_titles, high_rated_titles, watchlist_titles]):
-        user_prompt = (
-            "This user is new to the platform. Recommend 20 popular, highly-rated movies "
-            "from diverse genres including action, drama, comedy, thriller, sci-fi, and romance. "
-            "Focus on critically acclaimed films that appeal to broad audiences."
+
+async def generate_enhanced_movie_recommendations(
+    user: User, use_cache: bool = True
+) -> List[RecommendedMovie]:
+    """
+    Generate movie recommendations using comprehensive user data. Without
+    use_cache the model always runs; the output still refreshes the cache.
+    """
+
+    # Users with the same (or a very similar) taste signature share LLM output;
+    # the endpoint drops anything this user already knows after resolution
+    signature = preference_signature(user)
+
+    if use_cache:
+        with span("cache_lookup") as attributes:
+            cached_recommendations = recommendation_cache.get(signature)
+            attributes["hit"] = bool(cached_recommendations)
+            record_cache_lookup("recommendation", attributes["hit"])
+
+        if cached_recommendations:
+            logger.info(f"Serving cached recommendations for user {user.id}")
+            return cached_recommendations
+
+    with span("prefetch") as attributes:
+        section_titles = await select_prompt_titles(user)
+        attributes["titles"] = sum(len(titles) for titles in section_titles.values())
+
+    with span("prompt_build") as attributes:
+        user_prompt = build_enhanced_prompt(section_titles)
+
+        # Fallback for users with minimal data
+        if not any(
+            section_titles[key] for key in ("favorites", "high_rated", "watchlist")
+        ):
+            user_prompt = (
+                "This user is new to the platform. Recommend 20 popular, highly-rated movies "
+                "from diverse genres including action, drama, comedy, thriller, sci-fi, and romance. "
+                "Focus on critically acclaimed films that appeal to broad audiences."
+            )
+
+        prompt_tokens = estimate_tokens(STRUCTURED_SYSTEM_PROMPT) + estimate_tokens(
+            user_prompt
         )
+        attributes["estimated_tokens"] = prompt_tokens
+
+    logger.info(
+        f"Recommendation prompt for user {user.id}: ~{prompt_tokens} tokens "
+        f"(budget {settings.PROMPT_TOKEN_BUDGET})"
+    )
 
     # Create and run the agent
     agent = Agent(
         model=MODEL,
-        system_prompt=[SYSTEM_PROMPT],
-        model_settings=MODEL_SETTINGS,
+        output_type=List[RecommendedMovie],
+        system_prompt=[STRUCTURED_SYSTEM_PROMPT],
+        model_settings=STRUCTURED_MODEL_SETTINGS,
     )
 
     try:
-        response = await agent.run(user_prompt)
-        movies = parse_json_array(response.data)
-
-        # Ensure we return exactly 20 movies, filter out any that might be duplicates
-        unique_movies = []
-        seen = set()
-
-        for movie in movies:
-            if movie and movie.lower() not in seen and movie not in all_existing_movies:
-                unique_movies.append(movie)
-                seen.add(movie.lower())
-
-                if len(unique_movies) >= 20:
-                    break
+        recommendations = await run_structured_recommendations(
+            agent,
+            user_prompt,
+            [title for titles in section_titles.values() for title in titles],
+        )
+        recommendation_cache.put(signature, recommendations)
 
-        return unique_movies[:20]
+        return recommendations
 
     except Exception as e:
-        print(f"Error generating recommendations: {e}")
+        logger.warning(f"Error generating recommendations: {e}")
         return []
 
 
@@ -224,7 +441,8 @@ async def generate_movie_recommendations(favorite_movies: List[str]) -> List[str
         model_settings=MODEL_SETTINGS,
     )
 
-    response = await agent.run(user_prompt)
+    with OLLAMA_INFERENCE_DURATION.labels(mode="legacy").time():
+        response = await agent.run(user_prompt)
     movies = parse_json_array(response.data)
 
     return movies
@@ -0,0 +1,172 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from collections import OrderedDict
+from app.core.config import settings
+from app.services.metrics import PREFETCHES, record_cache_lookup
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PageLoader = Callable[[str], Awaitable[Any]]
+
+# Pending loads per event loop: a task can only be awaited on its own
+PendingKey = Tuple[asyncio.AbstractEventLoop, str]
+
+
+class PageCache:
+    """
+    LRU of TMDB responses keyed by URL, each kept for ttl_seconds. Safe to
+    share between threads, whatever loop each one runs.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            if time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+            return entry[1]
+
+    def put(self, key: str, results: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), results)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class UpstreamPressure:
+    """
+    TMDB requests in flight, and a back-off window after throttling or
+    server errors. Speculative requests are held back while either applies.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.backoff_until = 0.0
+        self._lock = threading.Lock()
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, status: str):
+        with self._lock:
+            self.in_flight -= 1
+
+            if status == "429" or status == "connection_error" or status.startswith("5"):
+                self.backoff_until = time.monotonic() + settings.PREFETCH_BACKOFF_SECONDS
+
+    def is_high(self) -> bool:
+        return (
+            self.in_flight >= settings.PREFETCH_MAX_UPSTREAM_IN_FLIGHT
+            or time.monotonic() < self.backoff_until
+        )
+
+
+class Prefetcher:
+    """
+    Serves pages through the cache and warms the page users are likely to
+    request next. A page requested while it is being prefetched or loaded
+    waits for that request instead of repeating it - on the same event loop
+    only, as code driving its own loop (asyncio.run in a thread) can share
+    the cache.
+    """
+
+    def __init__(
+        self,
+        load: PageLoader,
+        cache: PageCache,
+        pressure: UpstreamPressure,
+        name: str = "tmdb_page",
+    ):
+        self.load = load
+        self.cache = cache
+        self.pressure = pressure
+        self.name = name
+        self.pending: Dict[PendingKey, asyncio.Task] = {}
+
+    async def get(self, key: str) -> Any:
+        results = self.cache.get(key)
+        pending_key = (asyncio.get_running_loop(), key)
+        pending = self.pending.get(pending_key)
+
+        if results is None and pending is not None:
+            results = await asyncio.shield(pending)
+
+        record_cache_lookup(self.name, results is not None)
+
+        if results is None:
+            # Concurrent misses share one load, and its errors; a failed
+            # prefetch (None) is retried here
+            pending = self.pending.get(pending_key)
+            if pending is None:
+                pending = self.pending[pending_key] = asyncio.create_task(
+                    self._load(pending_key)
+                )
+
+            results = await asyncio.shield(pending)
+
+        return results
+
+    def prefetch(self, key: str) -> bool:
+        if not settings.PREFETCH_ENABLED:
+            return False
+
+        pending_key = (asyncio.get_running_loop(), key)
+
+        if pending_key in self.pending or key in self.cache:
+            outcome = "duplicate"
+        elif len(self.pending) >= settings.PREFETCH_MAX_PENDING:
+            outcome = "full"
+        elif self.pressure.is_high():
+            outcome = "upstream_pressure"
+        else:
+            outcome = "scheduled"
+            self.pending[pending_key] = asyncio.create_task(self._run(pending_key))
+
+        PREFETCHES.labels(outcome=outcome).inc()
+
+        return outcome == "scheduled"
+
+    async def _load(self, pending_key: PendingKey) -> Any:
+        key = pending_key[1]
+
+        try:
+            results = await self.load(key)
+            self.cache.put(key, results)
+
+            return results
+        finally:
+            self.pending.pop(pending_key, None)
+
+    async def _run(self, pending_key: PendingKey) -> Optional[Any]:
+        try:
+            return await self._load(pending_key)
+        except Exception as e:
+            logger.debug(f"Prefetch of {pending_key[1]} failed: {e}")
+
+            return None
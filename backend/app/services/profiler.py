@@ -0,0 +1,198 @@
+from typing import Counter as CounterType, List, Optional
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import FrameType
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.config import settings
+from app.schemas.profile import ProfileInfo
+from app.services.security import create_access_token, verify_profiling_token
+import logging
+import random
+import re
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+PROFILE_SUFFIX = ".folded"
+
+# Sync endpoints and dependencies run in the thread pool, not on the event
+# loop; other threads are sampled only while they execute application code
+APP_MODULE_PREFIX = "app."
+
+# One profile at a time keeps the overhead bounded: concurrent requests share
+# the event loop thread, so their samples would be mixed anyway
+_profiling_lock = threading.Lock()
+
+
+def frame_name(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+
+    return f"{module}.{frame.f_code.co_qualname}"
+
+
+def fold_stack(frame: Optional[FrameType]) -> str:
+    """Root-first `a;b;c` stack, the input format of flamegraph.pl and speedscope"""
+    names = []
+
+    while frame is not None:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Samples the event loop thread's stack, plus any thread running application
+    code, from a background thread at a fixed interval. Nothing is traced in
+    between, so the profiled code runs at full speed.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: CounterType[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> CounterType[str]:
+        self._stopped.set()
+        self._thread.join()
+
+        return self.samples
+
+    def _run(self):
+        sampler_id = threading.get_ident()
+
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+
+                stack = fold_stack(frame)
+
+                if thread_id == self.thread_id or _runs_app_code(stack):
+                    self.samples[stack] += 1
+
+
+def _runs_app_code(stack: str) -> bool:
+    return stack.startswith(APP_MODULE_PREFIX) or f";{APP_MODULE_PREFIX}" in stack
+
+
+def create_profiling_token(expires_minutes: int = 60) -> str:
+    """Signed value for the X-Profile-Token header"""
+    return create_access_token(
+        {"purpose": "profiling"}, expires_delta=timedelta(minutes=expires_minutes)
+    )
+
+
+def should_profile(scope: Scope) -> bool:
+    token = dict(scope.get("headers") or []).get(PROFILE_TOKEN_HEADER)
+
+    if token and verify_profiling_token(token.decode()):
+        return True
+
+    return settings.PROFILING_ENABLED and random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+def _route_slug(route_path: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", route_path).strip("_") or "root"
+
+
+def write_profile(
+    samples: CounterType[str], method: str, route_path: str, duration_ms: float
+) -> Path:
+    output_dir = Path(settings.PROFILING_OUTPUT_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    name = (
+        f"{int(time.time() * 1000)}_{method}_{_route_slug(route_path)}"
+        f"_{int(duration_ms)}ms{PROFILE_SUFFIX}"
+    )
+    path = output_dir / name
+    path.write_text(
+        "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+    )
+
+    # Keep only the newest profiles
+    for old_profile in sorted(output_dir.glob(f"*{PROFILE_SUFFIX}"))[
+        : -settings.PROFILING_MAX_FILES
+    ]:
+        old_profile.unlink(missing_ok=True)
+
+    return path
+
+
+def list_profiles() -> List[ProfileInfo]:
+    output_dir = Path(settings.PROFILING_OUTPUT_DIR)
+
+    if not output_dir.is_dir():
+        return []
+
+    profiles = []
+    for path in sorted(output_dir.glob(f"*{PROFILE_SUFFIX}"), reverse=True):
+        stat = path.stat()
+        profiles.append(
+            ProfileInfo(
+                name=path.name,
+                size_bytes=stat.st_size,
+                created_at=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+            )
+        )
+
+    return profiles
+
+
+def find_profile(name: str) -> Optional[Path]:
+    # Only bare file names from the listing - no path traversal
+    if Path(name).name != name or not name.endswith(PROFILE_SUFFIX):
+        return None
+
+    path = Path(settings.PROFILING_OUTPUT_DIR) / name
+
+    return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a sampled fraction of requests (PROFILING_ENABLED) or any request
+    carrying a valid X-Profile-Token, writing one folded-stack file per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or not should_profile(scope)
+            or not _profiling_lock.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(
+            threading.get_ident(), settings.PROFILING_INTERVAL_MS / 1000
+        )
+        started_at = time.perf_counter()
+        sampler.start()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            samples = sampler.stop()
+            _profiling_lock.release()
+
+            duration_ms = (time.perf_counter() - started_at) * 1000
+            route_path = getattr(scope.get("route"), "path", "unmatched")
+
+            if samples:
+                path = write_profile(samples, scope["method"], route_path, duration_ms)
+                logger.info(f"Wrote profile {path.name}")
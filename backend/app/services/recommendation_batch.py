@@ -0,0 +1,133 @@
+from typing import Dict, Iterable, List
+from datetime import datetime, timedelta, timezone
+from pymongo import MongoClient
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.schemas.recommendation import RecommendedMovie
+from app.schemas.user import User
+from app.services.ollama_recommender import generate_enhanced_movie_recommendations
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+client = MongoClient(settings.MONGO_CONNECTION_STRING)
+db = client.get_database(settings.MONGO_DATABASE_NAME)
+users_collection = db.get_collection(settings.MONGO_COLLECTION_NAME)
+recommendations_collection = db.get_collection(
+    settings.RECOMMENDATIONS_COLLECTION_NAME
+)
+
+logger = logging.getLogger(__name__)
+
+# Verified users with at least some taste data - new users get the cold-start set
+ACTIVE_USERS_FILTER = {
+    "is_verified": True,
+    "$or": [
+        {"favorite_movies.0": {"$exists": True}},
+        {"watchlist.0": {"$exists": True}},
+        {"ratings.0": {"$exists": True}},
+    ],
+}
+
+
+def profile_fingerprint(user: User) -> str:
+    """Changes whenever favorites, watchlist or ratings change"""
+    profile = {
+        "favorite_movies": sorted(user.favorite_movies),
+        "watchlist": sorted(user.watchlist),
+        "ratings": sorted((r.movie_id, r.rating) for r in user.ratings),
+    }
+
+    return hashlib.sha1(json.dumps(profile).encode()).hexdigest()
+
+
+def store_recommendations(user: User, recommendations: List[RecommendedMovie]):
+    recommendations_collection.replace_one(
+        {"user_id": user.id},
+        {
+            "user_id": user.id,
+            "fingerprint": profile_fingerprint(user),
+            "recommendations": [r.model_dump() for r in recommendations],
+            "updated_at": datetime.now(timezone.utc),
+        },
+        upsert=True,
+    )
+
+
+def find_precomputed_recommendations(user: User) -> List[RecommendedMovie]:
+    """Stored recommendations, only while fresh and the profile is unchanged"""
+    document = recommendations_collection.find_one({"user_id": user.id})
+
+    if not document or document.get("fingerprint") != profile_fingerprint(user):
+        return []
+
+    updated_at = document["updated_at"]
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+
+    max_age = timedelta(hours=settings.PRECOMPUTED_RECOMMENDATIONS_MAX_AGE_HOURS)
+    if datetime.now(timezone.utc) - updated_at > max_age:
+        return []
+
+    return [RecommendedMovie(**r) for r in document.get("recommendations", [])]
+
+
+def batch_concurrency() -> int:
+    """Fill Ollama's parallel slots, minus the ones kept for interactive requests"""
+    return max(
+        settings.OLLAMA_NUM_PARALLEL - settings.RECOMMENDATION_BATCH_RESERVED_SLOTS, 1
+    )
+
+
+async def refresh_recommendations(
+    users: Iterable[User], concurrency: int
+) -> Dict[str, float]:
+    """
+    Recompute and store recommendations for many users. `concurrency` workers
+    pull from the same iterator, so exactly that many completions are in
+    flight and Ollama can batch them across its parallel slots.
+    """
+    users_iterator = iter(users)
+    stats = {"users": 0, "refreshed": 0, "failed": 0}
+
+    async def worker():
+        for user in users_iterator:
+            stats["users"] += 1
+            # One user's failure mustn't cancel the rest of the batch
+            try:
+                # A refresh recomputes; cached output may be hours old or another user's
+                recommendations = await generate_enhanced_movie_recommendations(
+                    user, use_cache=False
+                )
+
+                if recommendations:
+                    # Runs on the app's event loop, next to requests
+                    await run_in_threadpool(
+                        store_recommendations, user, recommendations
+                    )
+                    stats["refreshed"] += 1
+            except Exception as e:
+                stats["failed"] += 1
+                logger.warning(f"Recommendations refresh failed for {user.id}: {e}")
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    stats["seconds"] = round(elapsed, 2)
+    stats["users_per_minute"] = (
+        round(stats["users"] / elapsed * 60, 2) if elapsed else 0.0
+    )
+
+    return stats
+
+
+async def refresh_all_recommendations() -> Dict[str, float]:
+    users = (
+        User.from_document(user_data)
+        for user_data in users_collection.find(ACTIVE_USERS_FILTER, {"_id": 0})
+    )
+
+    return await refresh_recommendations(users, batch_concurrency())
@@ -0,0 +1,141 @@
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+from collections import OrderedDict
+from app.core.config import settings
+from app.schemas.recommendation import RecommendedMovie
+from app.schemas.user import User
+import time
+
+# How many of the user's strongest signals make up the preference signature
+SIGNATURE_SIZE = 10
+HIGH_RATING = 8
+
+SignatureKey = Tuple[int, ...]
+
+
+class CacheEntry(NamedTuple):
+    signature: FrozenSet[int]
+    recommendations: List[RecommendedMovie]
+    created_at: float
+
+
+def preference_signature(user: User) -> FrozenSet[int]:
+    """
+    Canonical taste signature: newest favorites, then the highest-rated movies.
+    Users with the same popular favorites end up with the same signature.
+    """
+    signature: List[int] = []
+
+    for movie_id in reversed(user.favorite_movies):
+        if len(signature) >= SIGNATURE_SIZE:
+            break
+        if movie_id not in signature:
+            signature.append(movie_id)
+
+    high_rated = sorted(
+        (rating for rating in user.ratings if rating.rating >= HIGH_RATING),
+        key=lambda rating: -rating.rating,
+    )
+    for rating in high_rated:
+        if len(signature) >= SIGNATURE_SIZE:
+            break
+        if rating.movie_id not in signature:
+            signature.append(rating.movie_id)
+
+    return frozenset(signature)
+
+
+def jaccard(first: FrozenSet[int], second: FrozenSet[int]) -> float:
+    if not first and not second:
+        return 0.0
+
+    return len(first & second) / len(first | second)
+
+
+class RecommendationCache:
+    """
+    LLM outputs keyed by preference signature. A miss on the exact signature
+    falls back to the most similar cached signature (Jaccard), found through
+    an inverted movie-id index so only overlapping entries are compared.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, min_similarity: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.min_similarity = min_similarity
+        self._entries: "OrderedDict[SignatureKey, CacheEntry]" = OrderedDict()
+        self._index: Dict[int, Set[SignatureKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: SignatureKey) -> None:
+        entry = self._entries.pop(key)
+
+        for movie_id in entry.signature:
+            keys = self._index.get(movie_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[movie_id]
+
+    def _is_expired(self, entry: CacheEntry) -> bool:
+        return time.monotonic() - entry.created_at > self.ttl_seconds
+
+    def get(self, signature: FrozenSet[int]) -> Optional[List[RecommendedMovie]]:
+        if not signature:
+            return None
+
+        key = tuple(sorted(signature))
+        entry = self._entries.get(key)
+
+        if entry is None:
+            candidate_keys = set().union(
+                *(self._index.get(movie_id, ()) for movie_id in signature)
+            )
+            best_similarity = self.min_similarity
+
+            for candidate_key in candidate_keys:
+                candidate = self._entries[candidate_key]
+                similarity = jaccard(signature, candidate.signature)
+
+                if similarity >= best_similarity and not self._is_expired(candidate):
+                    key, entry, best_similarity = candidate_key, candidate, similarity
+
+        if entry is None:
+            return None
+
+        if self._is_expired(entry):
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+
+        return entry.recommendations
+
+    def put(
+        self, signature: FrozenSet[int], recommendations: List[RecommendedMovie]
+    ) -> None:
+        if not signature or not recommendations:
+            return
+
+        key = tuple(sorted(signature))
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = CacheEntry(signature, recommendations, time.monotonic())
+        for movie_id in signature:
+            self._index.setdefault(movie_id, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._index.clear()
+
+
+recommendation_cache = RecommendationCache(
+    max_entries=settings.RECOMMENDATION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RECOMMENDATION_CACHE_TTL_MINUTES * 60,
+    min_similarity=settings.RECOMMENDATION_CACHE_MIN_SIMILARITY,
+)
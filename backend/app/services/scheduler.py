@@ -1,8 +1,16 @@
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from datetime import datetime, timedelta, timezone
 from pymongo import MongoClient
 from app.core.config import settings
 from app.utils.app_instance import application
+from app.services.content_recommender import refresh_feature_matrix
+from app.services.collaborative_filtering import rebuild_item_neighbors
+from app.services.cold_start import refresh_cold_start_movies
+from app.services.ollama_lifecycle import warm_up_model, keep_model_alive
+from app.services.recommendation_batch import refresh_all_recommendations
+from app.services.catalog_sync import sync_catalog
+from app.services.tmdb import fetch_movies_genres
+import asyncio
 import logging
 
 # Configure logging
@@ -28,13 +36,142 @@ def delete_unverified_users():
 
     logger.info(f"Deleted {result.deleted_count} unverified user(s) older than 24h.")
 
-# Initialize the scheduler
-scheduler = BackgroundScheduler()
+async def refresh_content_recommender():
+    """Reloads the content-based recommender's feature matrix from TMDB."""
+    try:
+        loaded = await refresh_feature_matrix()
+        logger.info(f"Refreshed content recommender with {loaded} movie(s).")
+    except Exception as e:
+        logger.warning(f"Content recommender refresh failed: {e}")
+
+async def refresh_cold_start_recommendations():
+    """Rebuilds the precomputed recommendations served to brand-new users."""
+    try:
+        loaded = await refresh_cold_start_movies()
+        logger.info(f"Refreshed cold-start recommendations with {loaded} movie(s).")
+    except Exception as e:
+        logger.warning(f"Cold-start recommendations refresh failed: {e}")
+
+def refresh_item_neighbors():
+    """
+    Recomputes the item-item neighbor table from all users' favorites,
+    watchlists and ratings.
+    """
+    try:
+        movies_count = rebuild_item_neighbors()
+        logger.info(f"Rebuilt item neighbors for {movies_count} movie(s).")
+    except Exception as e:
+        logger.warning(f"Item neighbors rebuild failed: {e}")
+
+async def refresh_stored_recommendations():
+    """
+    Recomputes the stored recommendations of every active user in batches
+    sized to Ollama's parallel slots.
+    """
+    try:
+        stats = await refresh_all_recommendations()
+        logger.info(
+            f"Refreshed recommendations for {stats['refreshed']}/{stats['users']} user(s) "
+            f"in {stats['seconds']}s ({stats['users_per_minute']} users/min, "
+            f"{stats['failed']} failed)."
+        )
+    except Exception as e:
+        logger.warning(f"Stored recommendations refresh failed: {e}")
+
+async def sync_movie_catalog():
+    """
+    Imports the catalog mirror on the first run, then applies TMDB's
+    changes since the previous sync.
+    """
+    try:
+        stats = await sync_catalog()
+        logger.info(f"Synced movie catalog: {stats}")
+    except Exception as e:
+        logger.warning(f"Movie catalog sync failed: {e}")
+
+async def refresh_genre_map():
+    """Reloads the genre id -> name map used to add genre names to movie results."""
+    try:
+        genres = await fetch_movies_genres()
+        logger.info(f"Refreshed genre map with {len(genres)} genre(s).")
+    except Exception as e:
+        logger.warning(f"Genre map refresh failed: {e}")
+
+# Initialize the scheduler. Async jobs run on the app's event loop, next to the
+# requests sharing their caches and aiohttp tasks; sync jobs run in its
+# default thread pool
+scheduler = AsyncIOScheduler()
 
 @application.on_event("startup")
-def startup_event():
+async def startup_event():
+    # Bound to the loop serving requests, which the lifespan may replace
+    scheduler.configure(event_loop=asyncio.get_running_loop())
+
     # Schedule the job to run daily at 2:00 AM
     scheduler.add_job(delete_unverified_users, 'cron', hour=3)
+    scheduler.add_job(
+        refresh_item_neighbors,
+        'cron',
+        hour=4,
+        id="refresh_item_neighbors",
+        replace_existing=True,
+    )
+    # Build the feature matrix right away, then keep it fresh
+    scheduler.add_job(
+        refresh_content_recommender,
+        'interval',
+        hours=settings.CONTENT_RECOMMENDER_REFRESH_HOURS,
+        next_run_time=datetime.now(timezone.utc),
+        id="refresh_content_recommender",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        refresh_cold_start_recommendations,
+        'interval',
+        hours=settings.COLD_START_REFRESH_HOURS,
+        next_run_time=datetime.now(timezone.utc),
+        id="refresh_cold_start_recommendations",
+        replace_existing=True,
+    )
+
+    scheduler.add_job(
+        refresh_genre_map,
+        'interval',
+        hours=settings.GENRE_MAP_REFRESH_HOURS,
+        next_run_time=datetime.now(timezone.utc),
+        id="refresh_genre_map",
+        replace_existing=True,
+    )
+
+    if settings.RECOMMENDATION_BATCH_ENABLED:
+        scheduler.add_job(
+            refresh_stored_recommendations,
+            'cron',
+            hour=5,
+            id="refresh_stored_recommendations",
+            replace_existing=True,
+        )
+
+    if settings.CATALOG_MIRROR_ENABLED:
+        scheduler.add_job(
+            sync_movie_catalog,
+            'interval',
+            hours=settings.CATALOG_SYNC_INTERVAL_HOURS,
+            next_run_time=datetime.now(timezone.utc),
+            id="sync_movie_catalog",
+            replace_existing=True,
+        )
+
+    if settings.OLLAMA_WARMUP_ON_STARTUP:
+        # Runs in the loop's thread pool, so startup doesn't wait for the load
+        scheduler.add_job(warm_up_model, id="warm_up_model", replace_existing=True)
+    scheduler.add_job(
+        keep_model_alive,
+        'interval',
+        minutes=settings.OLLAMA_KEEP_ALIVE_INTERVAL_MINUTES,
+        id="keep_model_alive",
+        replace_existing=True,
+    )
 
     scheduler.start()
 
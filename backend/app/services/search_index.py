@@ -0,0 +1,256 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from bisect import bisect_left, insort
+import heapq
+from app.core.config import settings
+from app.schemas.movie import Movie
+import re
+import unicodedata
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+TYPO_SCORE = 0.6
+
+# Shorter words are too ambiguous to match with a typo
+MIN_TYPO_TOKEN_LENGTH = 4
+# Bounds the work for one- and two-letter prefixes while typing
+MAX_PREFIX_TOKENS = 200
+MAX_SUGGEST_SCAN = 500
+
+
+class SearchHit(NamedTuple):
+    score: float
+    movie: dict
+
+
+def normalize(text: str) -> str:
+    """Lowercase without accents, so "Amélie" and "amelie" are the same word"""
+    decomposed = unicodedata.normalize("NFKD", text)
+
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_PATTERN.findall(normalize(text)) if text else []
+
+
+def _deletes(token: str) -> Set[str]:
+    return {token[:i] + token[i + 1 :] for i in range(len(token))}
+
+
+class MovieSearchIndex:
+    """
+    In-memory inverted index over the titles, original titles and release
+    years of movies seen in TMDB responses. The last query word matches as a
+    prefix, for search-as-you-type, and words within one edit (symmetric
+    delete lookup) match with a lower score.
+    """
+
+    def __init__(self, max_movies: int):
+        self.max_movies = max_movies
+        self.movies: Dict[int, dict] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        # Sorted vocabulary, for prefix ranges
+        self.vocabulary: List[str] = []
+        # Each word and its one-deletion variants -> the words they came from
+        self.variants: Dict[str, Set[str]] = {}
+        self.titles: Dict[str, Set[int]] = {}
+        # Sorted (title from the nth word on, movie id, n == 0), so a bisect
+        # finds titles starting with a prefix at any word boundary
+        self.title_keys: List[Tuple[str, int, bool]] = []
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    def add(self, movie: dict) -> bool:
+        movie_id = movie.get("id")
+        title = movie.get("title")
+
+        if movie_id is None or not title:
+            return False
+
+        document = {field: movie.get(field) for field in Movie.model_fields}
+
+        if movie_id in self.movies:
+            # Keep popularity and votes fresh; titles don't change
+            self.movies[movie_id].update(
+                {key: value for key, value in document.items() if value is not None}
+            )
+            return False
+
+        if len(self.movies) >= self.max_movies:
+            return False
+
+        self.movies[movie_id] = document
+        titles = {title, movie.get("original_title") or title}
+        words = {word for text in titles for word in tokenize(text)}
+
+        release_date = movie.get("release_date") or ""
+        if release_date[:4].isdigit():
+            words.add(release_date[:4])
+
+        for word in words:
+            self._add_word(word, movie_id)
+
+        for text in titles:
+            title_words = tokenize(text)
+            self.titles.setdefault(" ".join(title_words), set()).add(movie_id)
+
+            for start in range(len(title_words)):
+                insort(
+                    self.title_keys,
+                    (" ".join(title_words[start:]), movie_id, start == 0),
+                )
+
+        return True
+
+    def _add_word(self, word: str, movie_id: int):
+        postings = self.postings.get(word)
+
+        if postings is None:
+            postings = self.postings[word] = set()
+            insort(self.vocabulary, word)
+
+            for variant in _deletes(word) | {word}:
+                self.variants.setdefault(variant, set()).add(word)
+
+        postings.add(movie_id)
+
+    def _prefixed(self, prefix: str) -> Iterable[str]:
+        start = bisect_left(self.vocabulary, prefix)
+
+        for word in self.vocabulary[start : start + MAX_PREFIX_TOKENS]:
+            if not word.startswith(prefix):
+                break
+            yield word
+
+    def _typo_matches(self, word: str) -> Set[str]:
+        matches = set(self.variants.get(word, ()))
+
+        for variant in _deletes(word):
+            matches |= self.variants.get(variant, set())
+
+        matches.discard(word)
+
+        return matches
+
+    def _word_scores(self, word: str, is_last: bool) -> Dict[int, float]:
+        scores = dict.fromkeys(self.postings.get(word, ()), EXACT_SCORE)
+
+        if is_last:
+            for prefixed in self._prefixed(word):
+                for movie_id in self.postings[prefixed]:
+                    scores.setdefault(movie_id, PREFIX_SCORE)
+
+        if len(word) >= MIN_TYPO_TOKEN_LENGTH:
+            for similar in self._typo_matches(word):
+                for movie_id in self.postings[similar]:
+                    scores.setdefault(movie_id, TYPO_SCORE)
+
+        return scores
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """Movies matching every query word, best matches and most popular first"""
+        words = tokenize(query)
+        scores: Optional[Dict[int, float]] = None
+
+        for index, word in enumerate(words):
+            word_scores = self._word_scores(word, index == len(words) - 1)
+            scores = (
+                word_scores
+                if scores is None
+                else {
+                    movie_id: scores[movie_id] + score
+                    for movie_id, score in word_scores.items()
+                    if movie_id in scores
+                }
+            )
+
+            if not scores:
+                return []
+
+        if not scores:
+            return []
+
+        ranked = heapq.nsmallest(
+            limit,
+            scores.items(),
+            key=lambda item: (-item[1], -(self.movies[item[0]].get("popularity") or 0)),
+        )
+
+        return [
+            SearchHit(round(score / len(words), 3), self.movies[movie_id])
+            for movie_id, score in ranked
+        ]
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[dict]:
+        """
+        Movies with a title word starting with the prefix, titles that start
+        with it first, then by popularity
+        """
+        key = " ".join(tokenize(prefix))
+
+        if not key:
+            return []
+
+        start = bisect_left(self.title_keys, (key,))
+        matches: Dict[int, bool] = {}
+
+        for title_key, movie_id, from_start in self.title_keys[
+            start : start + MAX_SUGGEST_SCAN
+        ]:
+            if not title_key.startswith(key):
+                break
+            matches[movie_id] = matches.get(movie_id, False) or from_start
+
+        ranked = heapq.nlargest(
+            limit,
+            matches.items(),
+            key=lambda item: (item[1], self.movies[item[0]].get("popularity") or 0),
+        )
+
+        return [self.movies[movie_id] for movie_id, _ in ranked]
+
+    def find_title(self, title: str, year: Optional[int] = None) -> Optional[dict]:
+        """The most popular movie with exactly this title (and release year)"""
+        candidates = [
+            self.movies[movie_id]
+            for movie_id in self.titles.get(" ".join(tokenize(title)), ())
+        ]
+
+        if year:
+            candidates = [
+                movie
+                for movie in candidates
+                if (movie.get("release_date") or "").startswith(str(year))
+            ]
+
+        return max(
+            candidates, key=lambda movie: movie.get("popularity") or 0, default=None
+        )
+
+
+def is_confident(hits: List[SearchHit], upstream_total: Optional[int]) -> bool:
+    """
+    The index holds the query's whole result set: TMDB reported how many
+    movies match it, and at least that many match every query word exactly.
+    Prefix and typo matches are guesses TMDB's relevance ranking does better.
+    """
+    if upstream_total is None:
+        return False
+
+    exact_hits = sum(hit.score >= EXACT_SCORE for hit in hits)
+
+    return exact_hits >= upstream_total
+
+
+movie_index = MovieSearchIndex(settings.SEARCH_INDEX_MAX_MOVIES)
+
+
+def index_movies(movies: Iterable[dict]):
+    if not settings.SEARCH_INDEX_ENABLED:
+        return
+
+    for movie in movies:
+        movie_index.add(movie)
@@ -52,4 +52,13 @@ def verify_user_email_token(token: str):
     except JWTError:
         raise HTTPException(status_code=400, detail={"field": "token", "message": "Invalid or expired token"})
     
-    return data
\ No newline at end of file
+    return data
+
+
+def verify_profiling_token(token: str) -> bool:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return False
+
+    return payload.get("purpose") == "profiling"
@@ -3,50 +3,549 @@ from app.schemas.movie import (
     Movie,
     MovieCast,
     MovieCastResponse,
+    MovieFullResponse,
     MovieReview,
     MovieReviewsResponse,
+    MovieSuggestion,
     MovieTrailerResponse,
 )
 from app.schemas.genre import Genre
 import aiohttp
 import asyncio
+import orjson
 from fastapi import HTTPException
 from .tmdb_constants import tmdb_to_http_map
-from typing import List
+from app.services.metrics import TMDB_REQUEST_LATENCY, record_cache_lookup, tmdb_endpoint
+from app.services.search_index import index_movies, is_confident, movie_index, tokenize
+from app.services.catalog import (
+    find_catalog_by_genre,
+    find_catalog_movie,
+    find_catalog_popular,
+    store_catalog_movies,
+)
+from app.services.prefetch import PageCache, Prefetcher, UpstreamPressure
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# One validator call per page instead of one model instantiation per result
+movie_list_adapter = TypeAdapter(List[Movie])
+
+
+# Movie's fields in declaration order, with the numeric coercion its
+# validation applies - what FastAPI would serialize for a Movie
+MOVIE_FIELD_TYPES = {
+    "id": int,
+    "title": None,
+    "overview": None,
+    "popularity": float,
+    "poster_path": None,
+    "vote_average": float,
+    "vote_count": int,
+    "genre_ids": None,
+    "genres": None,
+    "genre_names": None,
+    "release_date": None,
+}
+REQUIRED_MOVIE_FIELDS = {
+    name for name, field in Movie.model_fields.items() if field.is_required()
+}
+
+TMDB_PAGE_SIZE = 20
+
+# Genre id -> name, loaded at startup and refreshed on a schedule
+genre_map: Dict[int, str] = {}
+
+# Filtered search scans, keyed by query and filters, so the next page picks
+# up where the previous one stopped instead of rescanning from TMDB page 1
+SEARCH_SCAN_TTL_SECONDS = 600
+SEARCH_SCAN_CACHE_SIZE = 256
+
+
+class SearchFilters(NamedTuple):
+    genre: Optional[int] = None
+    min_rating: Optional[float] = None
+    max_rating: Optional[float] = None
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in self)
+
+    @property
+    def exact_year(self) -> Optional[int]:
+        """The one year TMDB search can filter on, when the bounds pin it"""
+        if self.min_year is not None and self.min_year == self.max_year:
+            return self.min_year
+
+        return None
+
+    def matches(self, movie: dict) -> bool:
+        if self.genre is not None and self.genre not in (movie.get("genre_ids") or []):
+            return False
+
+        rating = movie.get("vote_average")
+        if self.min_rating is not None and (rating is None or rating < self.min_rating):
+            return False
+        if self.max_rating is not None and (rating is None or rating > self.max_rating):
+            return False
+
+        if self.min_year is not None or self.max_year is not None:
+            year = release_year(movie)
+
+            if year is None:
+                return False
+            if self.min_year is not None and year < self.min_year:
+                return False
+            if self.max_year is not None and year > self.max_year:
+                return False
+
+        return True
+
+
+class _SearchScan:
+    def __init__(self):
+        self.results: List[dict] = []
+        self.next_page = 1
+        self.exhausted = False
+        self.created_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+
+_search_scans: "OrderedDict[tuple, _SearchScan]" = OrderedDict()
+
+# The source picked for each normalized search query - the local index's
+# ranked hits, or None for TMDB - so all pages of a query come from one ranking
+SEARCH_SOURCE_TTL_SECONDS = 600
+SEARCH_SOURCE_CACHE_SIZE = 1024
+LOCAL_SEARCH_MAX_RESULTS = 200
+_search_sources: "OrderedDict[str, Tuple[float, Optional[List[dict]]]]" = OrderedDict()
+# TMDB's total_results per normalized search query, so the index only answers
+# queries it provably has every result for
+_search_totals: "OrderedDict[str, int]" = OrderedDict()
 
+# Background TMDB searches filling the index for prefixes it can't complete,
+# keyed by normalized query
+_pending_suggestion_refills: Dict[str, asyncio.Task] = {}
+_recent_suggestion_refills: "OrderedDict[str, float]" = OrderedDict()
+RECENT_SUGGESTION_REFILLS_SIZE = 1024
 
-async def fetch_popular_movies(page: int = 1):
-    url = f"{settings.BASE_URL}/movie/popular?api_key={settings.TMDB_API_KEY}&language=en-US&page={page}"
+
+def release_year(movie: dict) -> Optional[int]:
+    release_date = movie.get("release_date") or ""
+
+    return int(release_date[:4]) if release_date[:4].isdigit() else None
+
+
+def popular_movies_url(page: int = 1) -> str:
+    return f"{settings.BASE_URL}/movie/popular?api_key={settings.TMDB_API_KEY}&language=en-US&page={page}"
+
+
+def search_movies_url(query: str, page: int = 1, year: Optional[int] = None) -> str:
+    url = f"{settings.BASE_URL}/search/movie?api_key={settings.TMDB_API_KEY}&query={query}&language=en-US&page={page}"
+    if year:
+        url += f"&primary_release_year={year}"
+
+    return url
+
+
+def movies_by_genre_url(genre_id: int, page: int = 1) -> str:
+    return f"{settings.BASE_URL}/discover/movie?api_key={settings.TMDB_API_KEY}&with_genres={genre_id}&page={page}"
+
+
+def discover_movies_url(page: int = 1, filters: SearchFilters = SearchFilters()) -> str:
+    url = f"{settings.BASE_URL}/discover/movie?api_key={settings.TMDB_API_KEY}&language=en-US&sort_by=popularity.desc&page={page}"
+
+    if filters.genre is not None:
+        url += f"&with_genres={filters.genre}"
+    if filters.min_rating is not None:
+        url += f"&vote_average.gte={filters.min_rating}"
+    if filters.max_rating is not None:
+        url += f"&vote_average.lte={filters.max_rating}"
+    if filters.min_year is not None:
+        url += f"&primary_release_date.gte={filters.min_year}-01-01"
+    if filters.max_year is not None:
+        url += f"&primary_release_date.lte={filters.max_year}-12-31"
+
+    return url
+
+
+def movie_details_url(movie_id: int) -> str:
+    return f"{settings.BASE_URL}/movie/{movie_id}?api_key={settings.TMDB_API_KEY}&language=en-US"
+
+
+def project_movie(movie: dict) -> dict:
+    """The Movie fields of a TMDB result, without building a model"""
+    projected = {}
+
+    for field, field_type in MOVIE_FIELD_TYPES.items():
+        value = movie.get(field)
+
+        # Fail like Movie validation would, not with a partial response
+        if value is None and field in REQUIRED_MOVIE_FIELDS:
+            raise ValueError(f"TMDB movie result is missing '{field}'")
+
+        projected[field] = (
+            field_type(value) if field_type and value is not None else value
+        )
+
+    return projected
+
+
+def movie_list_json(
+    movies: List[dict],
+    include_genre_names: bool = False,
+    total_pages: Optional[int] = None,
+) -> bytes:
+    """
+    A MovieResponse body serialized straight from TMDB results, for the list
+    endpoints - skips building Movie objects and FastAPI's re-validation.
+    """
+    projected = [project_movie(movie) for movie in movies]
+
+    if include_genre_names:
+        for movie in projected:
+            movie["genre_names"] = genre_names_of(movie["genre_ids"], movie["genres"])
+
+    if total_pages is None:
+        return orjson.dumps({"movies": projected})
+
+    return orjson.dumps({"movies": projected, "total_pages": total_pages})
+
+
+async def _fetch_results(url: str) -> List[dict]:
     movies_data = await make_request(url)
-    movies = [Movie(**movie) for movie in movies_data.get("results", [])]
+
+    return movies_data.get("results", [])
+
+
+upstream_pressure = UpstreamPressure()
+page_prefetcher = Prefetcher(
+    _fetch_results,
+    PageCache(settings.PAGE_CACHE_SIZE, settings.PAGE_CACHE_TTL_SECONDS),
+    upstream_pressure,
+)
+
+
+async def _cached_page(url: str, next_url: str) -> List[dict]:
+    """A cached TMDB page; users paging through a list want the next one soon"""
+    results = await page_prefetcher.get(url)
+
+    # A short page is the last one
+    if len(results) >= TMDB_PAGE_SIZE:
+        page_prefetcher.prefetch(next_url)
+
+    return results
+
+
+async def _popular_results(page: int) -> List[dict]:
+    """Popular movies from the catalog mirror when it covers the page, else TMDB"""
+    results = find_catalog_popular(page)
+
+    if results is None:
+        results = await _cached_page(popular_movies_url(page), popular_movies_url(page + 1))
+
+    index_movies(results)
+
+    return results
+
+
+async def fetch_popular_movies(page: int = 1):
+    movies = movie_list_adapter.validate_python(await _popular_results(page))
 
     return movies
 
 
-async def search_movies(query: str, page: int = 1):
-    url = f"{settings.BASE_URL}/search/movie?api_key={settings.TMDB_API_KEY}&query={query}&language=en-US&page={page}"
+async def fetch_popular_movies_json(page: int = 1, include_genre_names: bool = False) -> bytes:
+    return movie_list_json(await _popular_results(page), include_genre_names)
+
+
+async def fetch_top_rated_movies(page: int = 1):
+    url = f"{settings.BASE_URL}/movie/top_rated?api_key={settings.TMDB_API_KEY}&language=en-US&page={page}"
     movies_data = await make_request(url)
-    movies = [Movie(**movie) for movie in movies_data.get("results", [])]
+    index_movies(movies_data.get("results", []))
+    movies = movie_list_adapter.validate_python(movies_data.get("results", []))
+
+    return movies
+
+
+def record_search_total(query: str, total_results: Optional[int]):
+    if total_results is None:
+        return
+
+    key = " ".join(tokenize(query))
+    _search_totals[key] = total_results
+    _search_totals.move_to_end(key)
+    while len(_search_totals) > SEARCH_SOURCE_CACHE_SIZE:
+        _search_totals.popitem(last=False)
+
+
+async def search_movies_page(
+    query: str, page: int = 1, year: Optional[int] = None
+) -> Tuple[List[dict], int]:
+    """A page of TMDB search results as raw dicts, and TMDB's total pages"""
+    movies_data = await make_request(search_movies_url(query, page, year))
+    index_movies(movies_data.get("results", []))
+
+    if year is None:
+        record_search_total(query, movies_data.get("total_results"))
+
+    return movies_data.get("results", []), movies_data.get("total_pages", 0)
+
+
+async def search_movies(query: str, page: int = 1, year: Optional[int] = None):
+    results, _ = await search_movies_page(query, page, year)
+    movies = movie_list_adapter.validate_python(results)
+
+    return movies
+
+
+def _search_scan(query: str, filters: SearchFilters) -> _SearchScan:
+    key = (query, filters)
+    scan = _search_scans.get(key)
+
+    if scan is None or time.monotonic() - scan.created_at > SEARCH_SCAN_TTL_SECONDS:
+        scan = _search_scans[key] = _SearchScan()
+
+    _search_scans.move_to_end(key)
+    while len(_search_scans) > SEARCH_SCAN_CACHE_SIZE:
+        _search_scans.popitem(last=False)
+
+    return scan
+
+
+async def search_filtered_results(
+    query: str, page: int, filters: SearchFilters
+) -> List[dict]:
+    """
+    One page of filtered search results as raw TMDB dicts. Without query text
+    discover applies every filter upstream, so its pages are already full.
+    Text search only narrows by an exact year; the rest is filtered here,
+    fetching TMDB pages until the requested page is filled, TMDB runs out,
+    or SEARCH_MAX_UPSTREAM_PAGES were fetched for this request.
+    """
+    if not query.strip():
+        movies_data = await make_request(discover_movies_url(page, filters))
+        index_movies(movies_data.get("results", []))
+
+        return movies_data.get("results", [])
+
+    scan = _search_scan(query, filters)
+    wanted = page * TMDB_PAGE_SIZE
+
+    async with scan.lock:
+        fetched = 0
+
+        while (
+            len(scan.results) < wanted
+            and not scan.exhausted
+            and fetched < settings.SEARCH_MAX_UPSTREAM_PAGES
+        ):
+            movies_data = await make_request(
+                search_movies_url(query, scan.next_page, filters.exact_year)
+            )
+            index_movies(movies_data.get("results", []))
+            if filters.exact_year is None:
+                record_search_total(query, movies_data.get("total_results"))
+            scan.results.extend(
+                movie for movie in movies_data.get("results", []) if filters.matches(movie)
+            )
+            scan.exhausted = scan.next_page >= movies_data.get("total_pages", 0)
+            scan.next_page += 1
+            fetched += 1
+
+    return scan.results[wanted - TMDB_PAGE_SIZE : wanted]
+
+
+async def search_movies_filtered(query: str, page: int, filters: SearchFilters):
+    movies_data = await search_filtered_results(query, page, filters)
+    movies = movie_list_adapter.validate_python(movies_data)
 
     return movies
 
 
+def search_local_index(query: str, page: int = 1) -> Optional[Tuple[List[dict], int]]:
+    """
+    A page of search results from the local index and its total pages, or
+    None when TMDB answers the query. The source is picked on the query's
+    first request and kept for its later pages, so pages never mix rankings.
+    A query TMDB hasn't answered yet goes to TMDB, which reports its total.
+    """
+    if not settings.SEARCH_INDEX_ENABLED:
+        return None
+
+    key = " ".join(tokenize(query))
+    source = _search_sources.get(key)
+
+    if source is None or time.monotonic() - source[0] > SEARCH_SOURCE_TTL_SECONDS:
+        hits = movie_index.search(query, LOCAL_SEARCH_MAX_RESULTS)
+        confident = is_confident(hits, _search_totals.get(key))
+        record_cache_lookup("search_index", confident)
+
+        source = (time.monotonic(), [hit.movie for hit in hits] if confident else None)
+        _search_sources[key] = source
+        while len(_search_sources) > SEARCH_SOURCE_CACHE_SIZE:
+            _search_sources.popitem(last=False)
+    else:
+        _search_sources.move_to_end(key)
+
+    movies = source[1]
+    if movies is None:
+        return None
+
+    total_pages = -(-len(movies) // TMDB_PAGE_SIZE)
+
+    return movies[(page - 1) * TMDB_PAGE_SIZE : page * TMDB_PAGE_SIZE], total_pages
+
+
+def suggest_movies(query: str, limit: int) -> List[MovieSuggestion]:
+    """
+    Title suggestions from the local index only, so typing never waits on
+    TMDB. Short lists schedule a debounced TMDB search that fills the index
+    for the next keystrokes.
+    """
+    movies = movie_index.suggest(query, limit)
+    record_cache_lookup("suggest", len(movies) >= limit)
+
+    if len(movies) < limit:
+        schedule_suggestion_refill(query)
+
+    return [
+        MovieSuggestion(id=movie["id"], title=movie["title"], year=release_year(movie))
+        for movie in movies
+    ]
+
+
+def schedule_suggestion_refill(query: str):
+    key = " ".join(tokenize(query))
+
+    if (
+        len(key) < settings.SUGGEST_MIN_UPSTREAM_CHARS
+        or key in _pending_suggestion_refills
+        or time.monotonic() - _recent_suggestion_refills.get(key, float("-inf"))
+        < settings.SUGGEST_REFILL_INTERVAL_SECONDS
+    ):
+        return
+
+    # The user kept typing: searches for the shorter prefixes are stale
+    for pending_key in list(_pending_suggestion_refills):
+        if key.startswith(pending_key):
+            _pending_suggestion_refills.pop(pending_key).cancel()
+
+    _pending_suggestion_refills[key] = asyncio.create_task(_refill_suggestions(key))
+
+
+async def _refill_suggestions(key: str):
+    await asyncio.sleep(settings.SUGGEST_DEBOUNCE_MS / 1000)
+
+    # Past the debounce window the search is no longer cancelled
+    _pending_suggestion_refills.pop(key, None)
+    _recent_suggestion_refills[key] = time.monotonic()
+    while len(_recent_suggestion_refills) > RECENT_SUGGESTION_REFILLS_SIZE:
+        _recent_suggestion_refills.popitem(last=False)
+
+    try:
+        await search_movies(key)
+    except Exception as e:
+        logger.warning(f"Suggestion refill for '{key}' failed: {e}")
+
+
+async def find_movie_by_title(title: str, year: Optional[int] = None) -> Optional[Movie]:
+    """
+    The movie a recommended title refers to: an exact title match from the
+    local index, else TMDB's most relevant result. The release year
+    disambiguates remakes and same-titled movies.
+    """
+    if settings.SEARCH_INDEX_ENABLED:
+        indexed = movie_index.find_title(title, year)
+        record_cache_lookup("title_resolution", indexed is not None)
+
+        if indexed is not None:
+            return Movie(**indexed)
+
+    search_results = await search_movies(title, year=year)
+
+    if not search_results and year:
+        search_results = await search_movies(title)
+
+    return search_results[0] if search_results else None
+
+
 async def fetch_movies_genres():
+    global genre_map
+
     url = f"{settings.BASE_URL}/genre/movie/list?api_key={settings.TMDB_API_KEY}&language=en-US"
     genres_data = await make_request(url)
     genres = [Genre(**genre) for genre in genres_data.get("genres", [])]
 
+    # Every fetch refreshes the map, replaced whole so readers never see it half-built
+    genre_map = {genre["id"]: genre["name"] for genre in genres_data.get("genres", [])}
+
     return genres
 
 
+async def load_genre_map() -> Dict[int, str]:
+    """
+    The cached genre map, fetched on first use if the startup load hasn't
+    happened yet. Empty when TMDB can't be reached: results then go without
+    names rather than fail.
+    """
+    if not genre_map:
+        try:
+            await fetch_movies_genres()
+        except Exception as e:
+            logger.warning(f"Genre map load failed: {e}")
+
+    return genre_map
+
+
+def genre_names_of(
+    genre_ids: Optional[List[int]], genres: Optional[List[dict]] = None
+) -> List[str]:
+    """Detail results carry genres objects, list results only genre_ids"""
+    if genres:
+        return [genre["name"] for genre in genres if genre.get("name")]
+
+    return [genre_map[genre_id] for genre_id in genre_ids or [] if genre_id in genre_map]
+
+
+def add_genre_names(movies: List[Movie]) -> List[Movie]:
+    for movie in movies:
+        movie.genre_names = genre_names_of(movie.genre_ids, movie.genres)
+
+    return movies
+
+
+async def _genre_results(genre_id: int, page: int) -> List[dict]:
+    results = find_catalog_by_genre(genre_id, page)
+
+    if results is None:
+        results = await _cached_page(
+            movies_by_genre_url(genre_id, page), movies_by_genre_url(genre_id, page + 1)
+        )
+
+    index_movies(results)
+
+    return results
+
+
 async def fetch_movies_by_genre(genre_id: int, page: int = 1):
-    url = f"{settings.BASE_URL}/discover/movie?api_key={settings.TMDB_API_KEY}&with_genres={genre_id}&page={page}"
-    movies_data = await make_request(url)
-    movies = [Movie(**movie) for movie in movies_data.get("results", [])]
+    movies = movie_list_adapter.validate_python(await _genre_results(genre_id, page))
 
     return movies
 
 
+async def fetch_movies_by_genre_json(
+    genre_id: int, page: int = 1, include_genre_names: bool = False
+) -> bytes:
+    return movie_list_json(await _genre_results(genre_id, page), include_genre_names)
+
+
 async def fetch_multiple_movies_details(movie_ids: List[int]) -> List[Movie]:
     tasks = [fetch_movie_details(movie_id) for movie_id in movie_ids]
     movies = await asyncio.gather(*tasks, return_exceptions=True)
@@ -55,52 +554,122 @@ async def fetch_multiple_movies_details(movie_ids: List[int]) -> List[Movie]:
 
 
 async def fetch_movie_details(movie_id: int):
-    url = f"{settings.BASE_URL}/movie/{movie_id}?api_key={settings.TMDB_API_KEY}&language=en-US"
-    movie_data = await make_request(url)
+    movie_data = find_catalog_movie(movie_id)
+
+    if movie_data is None:
+        movie_data = await make_request(movie_details_url(movie_id))
+
+        # Movies outside the imported slice join the mirror once requested
+        if settings.CATALOG_MIRROR_ENABLED:
+            await run_in_threadpool(store_catalog_movies, [movie_data])
+
+    index_movies([movie_data])
 
     return Movie(**movie_data)
 
 
-async def fetch_movie_cast(movie_id: int) -> MovieCastResponse:
-    url = (
-        f"{settings.BASE_URL}/movie/{movie_id}/credits?api_key={settings.TMDB_API_KEY}"
-    )
-    cast_data = await make_request(url)
-    cast = [
+def movie_cast(credits: dict) -> List[MovieCast]:
+    return [
         MovieCast(
             id=actor.get("id"),
             name=actor.get("name"),
             character=actor.get("character"),
             profile_path=actor.get("profile_path"),
         )
-        for actor in cast_data["cast"]
+        for actor in credits["cast"]
     ]
 
-    return MovieCastResponse(movie_id=movie_id, cast=cast)
 
+async def fetch_movie_cast(movie_id: int) -> MovieCastResponse:
+    url = (
+        f"{settings.BASE_URL}/movie/{movie_id}/credits?api_key={settings.TMDB_API_KEY}"
+    )
+    cast_data = await make_request(url)
+
+    return MovieCastResponse(movie_id=movie_id, cast=movie_cast(cast_data))
+
+
+def movie_reviews_url(movie_id: int, page: int = 1) -> str:
+    return f"{settings.BASE_URL}/movie/{movie_id}/reviews?api_key={settings.TMDB_API_KEY}&language=en-US&page={page}"
+
+
+def review_url(review_id: str) -> str:
+    return f"{settings.BASE_URL}/review/{review_id}?api_key={settings.TMDB_API_KEY}"
+
+
+async def _fetch_json(url: str) -> dict:
+    return await make_request(url)
+
+
+# Review pages and single reviews, shared by the excerpt and full views
+review_fetcher = Prefetcher(
+    _fetch_json,
+    PageCache(settings.REVIEW_CACHE_SIZE, settings.REVIEW_CACHE_TTL_SECONDS),
+    upstream_pressure,
+    name="tmdb_reviews",
+)
+
+
+def review_excerpt(content: str, length: int) -> Tuple[str, bool]:
+    """The content cut to about `length` characters at a word boundary"""
+    if len(content) <= length:
+        return content, False
+
+    excerpt = content[:length]
+    last_space = excerpt.rfind(" ")
+
+    # Very long words are cut mid-word rather than losing half the excerpt
+    if last_space > length // 2:
+        excerpt = excerpt[:last_space]
 
-async def fetch_movie_reviews(movie_id: int, page: int = 1):
-    url = f"{settings.BASE_URL}/movie/{movie_id}/reviews?api_key={settings.TMDB_API_KEY}&language=en-US&page={page}"
+    return excerpt.rstrip(" \n,.;:-") + "…", True
 
-    response = await make_request(url, "GET")
 
+def _movie_review(review: dict, excerpt_length: Optional[int] = None) -> MovieReview:
+    content = review.get("content")
+    truncated = False
+
+    if excerpt_length is not None and content:
+        content, truncated = review_excerpt(content, excerpt_length)
+
+    return MovieReview(
+        id=review.get("id"),
+        author=review.get("author"),
+        content=content,
+        created_at=review.get("created_at"),
+        truncated=truncated,
+    )
+
+
+def movie_reviews(
+    movie_id: int, reviews_data: dict, excerpt_length: Optional[int] = None
+) -> MovieReviewsResponse:
     reviews = [
-        MovieReview(
-            id=review.get("id"),
-            author=review.get("author"),
-            content=review.get("content"),
-            created_at=review.get("created_at"),
-        )
-        for review in response.get("results", [])
+        _movie_review(review, excerpt_length)
+        for review in reviews_data.get("results", [])
     ]
 
     return MovieReviewsResponse(
         movie_id=movie_id,
         reviews=reviews,
-        total_results=response.get("total_results", 0),
+        total_results=reviews_data.get("total_results", 0),
     )
 
 
+async def fetch_movie_reviews(
+    movie_id: int, page: int = 1, excerpt_length: Optional[int] = None
+):
+    response = await review_fetcher.get(movie_reviews_url(movie_id, page))
+
+    return movie_reviews(movie_id, response, excerpt_length)
+
+
+async def fetch_review(review_id: str) -> MovieReview:
+    review = await review_fetcher.get(review_url(review_id))
+
+    return _movie_review(review)
+
+
 async def fetch_movie_trailer(movie_id: int) -> MovieTrailerResponse:
     url = (
         f"{settings.BASE_URL}/movie/{movie_id}/videos"
@@ -108,6 +677,10 @@ async def fetch_movie_trailer(movie_id: int) -> MovieTrailerResponse:
     )
     trailers_data = await make_request(url)
 
+    return movie_trailer(movie_id, trailers_data)
+
+
+def movie_trailer(movie_id: int, trailers_data: dict) -> MovieTrailerResponse:
     videos = trailers_data.get("results", [])
 
     yt_trailers = [
@@ -134,13 +707,67 @@ async def fetch_movie_trailer(movie_id: int) -> MovieTrailerResponse:
     )
 
 
+# Parts of /movies/{id}/full and the TMDB sub-resources appended for them
+FULL_MOVIE_PARTS = {
+    "details": None,
+    "cast": "credits",
+    "trailer": "videos",
+    "reviews": "reviews",
+}
+
+
+def full_movie_url(movie_id: int, parts: Iterable[str]) -> str:
+    url = movie_details_url(movie_id)
+    appended = [FULL_MOVIE_PARTS[part] for part in parts if FULL_MOVIE_PARTS[part]]
+
+    if appended:
+        url += f"&append_to_response={','.join(sorted(appended))}"
+
+    return url
+
+
+async def fetch_movie_full(
+    movie_id: int,
+    parts: Iterable[str] = tuple(FULL_MOVIE_PARTS),
+    excerpt_length: Optional[int] = None,
+) -> MovieFullResponse:
+    """
+    Details, cast, trailer and first review page in one TMDB request, via
+    append_to_response. Only the requested parts are fetched and returned.
+    """
+    parts = set(parts)
+    movie_data = await make_request(full_movie_url(movie_id, parts))
+    index_movies([movie_data])
+
+    full = {"movie_id": movie_id}
+
+    if "details" in parts:
+        full["details"] = Movie(**project_movie(movie_data))
+    if "cast" in parts:
+        full["cast"] = movie_cast(movie_data.get("credits") or {"cast": []})
+    if "trailer" in parts:
+        full["trailer"] = movie_trailer(movie_id, movie_data.get("videos") or {})
+    if "reviews" in parts:
+        full["reviews"] = movie_reviews(
+            movie_id, movie_data.get("reviews") or {}, excerpt_length
+        )
+
+    return MovieFullResponse(**full)
+
+
 async def make_request(url: str, method: str = "GET"):
+    started_at = time.perf_counter()
+    status = "connection_error"
+    upstream_pressure.started()
+
     async with aiohttp.ClientSession() as session:
         try:
             async with session.get(url) as response:
+                status = str(response.status)
+
                 if response.status >= 400:
                     try:
-                        error_data = await response.json()
+                        error_data = await response.json(loads=orjson.loads)
                         tmdb_code = error_data.get("status_code", response.status)
                         status_message = error_data.get(
                             "status_message", "Unknown error"
@@ -159,7 +786,13 @@ async def make_request(url: str, method: str = "GET"):
                 if method == "HEAD":
                     return response.status
 
-                return await response.json()
+                return await response.json(loads=orjson.loads)
 
         except aiohttp.ClientConnectionError as e:
             raise HTTPException(status_code=503, detail=f"Connection error: {e}")
+
+        finally:
+            upstream_pressure.finished(status)
+            TMDB_REQUEST_LATENCY.labels(
+                endpoint=tmdb_endpoint(url), status=status
+            ).observe(time.perf_counter() - started_at)
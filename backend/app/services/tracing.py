@@ -0,0 +1,87 @@
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from app.services.metrics import RECOMMENDATION_STAGE_DURATION
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Stage(NamedTuple):
+    name: str
+    duration_ms: float
+    attributes: Dict[str, Any]
+
+
+class PipelineTrace:
+    """Per-request record of pipeline stages, in the order they finished"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stages: List[Stage] = []
+        self.started_at = time.perf_counter()
+
+    def record(self, name: str, duration_ms: float, **attributes):
+        self.stages.append(Stage(name, round(duration_ms, 2), attributes))
+
+    @property
+    def total_ms(self) -> float:
+        return round((time.perf_counter() - self.started_at) * 1000, 2)
+
+    def server_timing(self) -> str:
+        """Stage timings in Server-Timing header format"""
+        entries = [f"{stage.name};dur={stage.duration_ms}" for stage in self.stages]
+        entries.append(f"total;dur={self.total_ms}")
+
+        return ", ".join(entries)
+
+    def summary(self) -> str:
+        parts = []
+        for stage in self.stages:
+            attributes = "".join(f" {k}={v}" for k, v in stage.attributes.items())
+            parts.append(f"{stage.name}={stage.duration_ms}ms{attributes}")
+
+        return f"{self.name} trace: total={self.total_ms}ms " + " ".join(parts)
+
+
+# Asyncio tasks copy the context, so stages recorded inside gathered
+# coroutines still land in the request's trace
+_current_trace: ContextVar[Optional[PipelineTrace]] = ContextVar(
+    "pipeline_trace", default=None
+)
+
+
+@contextmanager
+def start_trace(name: str) -> Iterator[PipelineTrace]:
+    trace = PipelineTrace(name)
+    token = _current_trace.set(trace)
+
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        logger.info(trace.summary())
+
+
+def record_stage(name: str, duration_ms: float, **attributes):
+    """Record an already-measured stage; only metrics outside of a trace"""
+    RECOMMENDATION_STAGE_DURATION.labels(stage=name).observe(duration_ms / 1000)
+    trace = _current_trace.get()
+
+    if trace is not None:
+        trace.record(name, duration_ms, **attributes)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """
+    Time the enclosed block as a stage. The yielded dict can be filled with
+    attributes (counts, hits) that are only known once the block ran.
+    """
+    started_at = time.perf_counter()
+
+    try:
+        yield attributes
+    finally:
+        record_stage(name, (time.perf_counter() - started_at) * 1000, **attributes)
@@ -13,6 +13,7 @@ from fastapi import HTTPException, status, BackgroundTasks
 from app.services.tmdb import make_request
 from app.services.security import get_password_hash, verify_password, get_password_hash
 from app.services.email import auth_email_create_token_and_send_email
+from app.services.metrics import time_mongo_operation
 
 client = MongoClient(settings.MONGO_CONNECTION_STRING)
 db = client.get_database(settings.MONGO_DATABASE_NAME)
@@ -20,30 +21,33 @@ users_collection = db.get_collection(settings.MONGO_COLLECTION_NAME)
 
 
 def find_user_by_email(email: str) -> Optional[User]:
-    user_data = users_collection.find_one({"email": email})
+    with time_mongo_operation("find_user_by_email"):
+        user_data = users_collection.find_one({"email": email})
 
     if not user_data:
         return None
 
-    return User(**user_data)
+    return User.from_document(user_data)
 
 
 def find_user_by_username(username: str) -> Optional[User]:
-    user_data = users_collection.find_one({"username": username})
+    with time_mongo_operation("find_user_by_username"):
+        user_data = users_collection.find_one({"username": username})
 
     if not user_data:
         return None
 
-    return User(**user_data)
+    return User.from_document(user_data)
 
 
 def find_user_by_id(user_id: str) -> Optional[User]:
-    user_data = users_collection.find_one({"id": user_id})
+    with time_mongo_operation("find_user_by_id"):
+        user_data = users_collection.find_one({"id": user_id})
 
     if not user_data:
         return None
 
-    return User(**user_data)
+    return User.from_document(user_data)
 
 
 def get_user(identifier: str) -> User:
@@ -95,7 +99,8 @@ def create_user(user: UserCreate, background_tasks: BackgroundTasks) -> User:
 
     try:
         new_user = User(**user_data)
-        users_collection.insert_one(new_user.model_dump())
+        with time_mongo_operation("create_user"):
+            users_collection.insert_one(new_user.model_dump())
 
         auth_email_create_token_and_send_email(
             new_user.id, new_user.email, background_tasks
@@ -131,7 +136,8 @@ def create_or_update_google_user(user_info) -> User:
         user_dict["username"] = user_dict.get("email").split("@")[0]
 
         user = User(**user_dict)
-        users_collection.insert_one(user.model_dump())
+        with time_mongo_operation("create_or_update_google_user"):
+            users_collection.insert_one(user.model_dump())
 
     else:
         if not user.google_id:
@@ -149,9 +155,10 @@ def create_or_update_google_user(user_info) -> User:
 def update_user(user: User) -> User:
     user_dict = user.model_dump()
 
-    updated_user = users_collection.find_one_and_update(
-        {"id": user.id}, {"$set": user_dict}, return_document=ReturnDocument.AFTER
-    )
+    with time_mongo_operation("update_user"):
+        updated_user = users_collection.find_one_and_update(
+            {"id": user.id}, {"$set": user_dict}, return_document=ReturnDocument.AFTER
+        )
 
     if not updated_user:
         raise HTTPException(
@@ -159,7 +166,7 @@ def update_user(user: User) -> User:
             detail={"field": "username", "message": "User not found"},
         )
 
-    return User(**updated_user)
+    return User.from_document(updated_user)
 
 
 def validate_password_confirmation(new_pass: str, new_pass_confirm: str):
@@ -291,11 +298,12 @@ def update_user_profile(
     elif not db_updates and user_email_response:
         return UserResponse(user=current_user, message=user_email_response.message)
 
-    updated_user = users_collection.find_one_and_update(
-        {"id": current_user.id},
-        {"$set": db_updates},
-        return_document=ReturnDocument.AFTER,
-    )
+    with time_mongo_operation("update_user_profile"):
+        updated_user = users_collection.find_one_and_update(
+            {"id": current_user.id},
+            {"$set": db_updates},
+            return_document=ReturnDocument.AFTER,
+        )
 
     if not updated_user:
         raise HTTPException(
@@ -304,19 +312,22 @@ def update_user_profile(
 
     if db_updates and user_email_response:
         return UserResponse(
-            user=User(**updated_user),
+            user=User.from_document(updated_user),
             message=f"Profile updated. {user_email_response.message}",
         )
 
-    return UserResponse(user=User(**updated_user), message="Profile updated")
+    return UserResponse(
+        user=User.from_document(updated_user), message="Profile updated"
+    )
 
 
 def verify_user_email(user_id: str, email: str) -> User:
-    updated_user = users_collection.find_one_and_update(
-        {"id": user_id},
-        {"$set": {"email": email, "is_verified": True}},
-        return_document=ReturnDocument.AFTER,
-    )
+    with time_mongo_operation("verify_user_email"):
+        updated_user = users_collection.find_one_and_update(
+            {"id": user_id},
+            {"$set": {"email": email, "is_verified": True}},
+            return_document=ReturnDocument.AFTER,
+        )
 
     if not updated_user:
         raise HTTPException(
@@ -324,22 +335,25 @@ def verify_user_email(user_id: str, email: str) -> User:
             detail={"field": "email", "message": "User not found"},
         )
 
-    return User(**updated_user)
+    return User.from_document(updated_user)
 
 
 def reset_user_password(
     current_user: User, new_password: str, confirm_new_password: str
 ) -> UserResponse:
     validate_password_confirmation(new_password, confirm_new_password)
+    hashed_password = get_password_hash(new_password)
 
-    updated_user = users_collection.find_one_and_update(
-        {"id": current_user.id},
-        {"$set": {"hashed_password": get_password_hash(new_password)}},
-        return_document=ReturnDocument.AFTER,
-    )
+    with time_mongo_operation("reset_user_password"):
+        updated_user = users_collection.find_one_and_update(
+            {"id": current_user.id},
+            {"$set": {"hashed_password": hashed_password}},
+            return_document=ReturnDocument.AFTER,
+        )
 
     return UserResponse(
-        user=User(**updated_user), message="Password has been reset successfully"
+        user=User.from_document(updated_user),
+        message="Password has been reset successfully",
     )
 
 
@@ -354,11 +368,12 @@ async def add_movie_to_favorites(user: User, movie_id: int):
     except HTTPException:
         raise HTTPException(status_code=404, detail="Movie not found")
 
-    updated_user = users_collection.find_one_and_update(
-        {"id": user.id},
-        {"$addToSet": {"favorite_movies": movie_id}},
-        return_document=ReturnDocument.AFTER,
-    )
+    with time_mongo_operation("add_movie_to_favorites"):
+        updated_user = users_collection.find_one_and_update(
+            {"id": user.id},
+            {"$addToSet": {"favorite_movies": movie_id}},
+            return_document=ReturnDocument.AFTER,
+        )
 
     return updated_user.get("favorite_movies")
 
@@ -367,11 +382,12 @@ def remove_movie_from_favorites(user: User, movie_id: int):
     if movie_id not in user.favorite_movies:
         raise HTTPException(status_code=404, detail="Movie not found in favorites")
 
-    updated_user = users_collection.find_one_and_update(
-        {"id": user.id},
-        {"$pull": {"favorite_movies": movie_id}},
-        return_document=ReturnDocument.AFTER,
-    )
+    with time_mongo_operation("remove_movie_from_favorites"):
+        updated_user = users_collection.find_one_and_update(
+            {"id": user.id},
+            {"$pull": {"favorite_movies": movie_id}},
+            return_document=ReturnDocument.AFTER,
+        )
 
     return updated_user.get("favorite_movies")
 
@@ -387,11 +403,12 @@ async def add_movie_to_watchlist(user: User, movie_id: int):
     except HTTPException:
         raise HTTPException(status_code=404, detail="Movie not found")
 
-    updated_user = users_collection.find_one_and_update(
-        {"id": user.id},
-        {"$addToSet": {"watchlist": movie_id}},
-        return_document=ReturnDocument.AFTER,
-    )
+    with time_mongo_operation("add_movie_to_watchlist"):
+        updated_user = users_collection.find_one_and_update(
+            {"id": user.id},
+            {"$addToSet": {"watchlist": movie_id}},
+            return_document=ReturnDocument.AFTER,
+        )
 
     return updated_user.get("watchlist")
 
@@ -400,11 +417,12 @@ def remove_movie_from_watchlist(user: User, movie_id: int):
     if movie_id not in user.watchlist:
         raise HTTPException(status_code=404, detail="Movie not found in watchlist")
 
-    updated_user = users_collection.find_one_and_update(
-        {"id": user.id},
-        {"$pull": {"watchlist": movie_id}},
-        return_document=ReturnDocument.AFTER,
-    )
+    with time_mongo_operation("remove_movie_from_watchlist"):
+        updated_user = users_collection.find_one_and_update(
+            {"id": user.id},
+            {"$pull": {"watchlist": movie_id}},
+            return_document=ReturnDocument.AFTER,
+        )
 
     return updated_user.get("watchlist")
 
@@ -421,23 +439,25 @@ async def add_movie_rating(user: User, movie_id: int, rating: int):
         raise HTTPException(status_code=404, detail="Movie not found")
 
     new_rating_entry = RatingEntry(movie_id=movie_id, rating=rating).model_dump()
-    existing_rating = users_collection.find_one(
-        {"id": user.id, "ratings.movie_id": new_rating_entry["movie_id"]}
-    )
 
-    if existing_rating:
-        updated_user = users_collection.find_one_and_update(
-            {"id": user.id, "ratings.movie_id": new_rating_entry["movie_id"]},
-            {"$set": {"ratings.$.rating": new_rating_entry["rating"]}},
-            return_document=ReturnDocument.AFTER,
-        )
-    else:
-        updated_user = users_collection.find_one_and_update(
-            {"id": user.id},
-            {"$addToSet": {"ratings": new_rating_entry}},
-            return_document=ReturnDocument.AFTER,
+    with time_mongo_operation("add_movie_rating"):
+        existing_rating = users_collection.find_one(
+            {"id": user.id, "ratings.movie_id": new_rating_entry["movie_id"]}
         )
 
+        if existing_rating:
+            updated_user = users_collection.find_one_and_update(
+                {"id": user.id, "ratings.movie_id": new_rating_entry["movie_id"]},
+                {"$set": {"ratings.$.rating": new_rating_entry["rating"]}},
+                return_document=ReturnDocument.AFTER,
+            )
+        else:
+            updated_user = users_collection.find_one_and_update(
+                {"id": user.id},
+                {"$addToSet": {"ratings": new_rating_entry}},
+                return_document=ReturnDocument.AFTER,
+            )
+
     return updated_user.get("ratings")
 
 
@@ -450,10 +470,11 @@ def delete_movie_rating(user: User, movie_id: int):
             detail="Rating not found for this movie",
         )
 
-    updated_user = users_collection.find_one_and_update(
-        {"id": user.id},
-        {"$pull": {"ratings": {"movie_id": movie_id}}},
-        return_document=ReturnDocument.AFTER,
-    )
+    with time_mongo_operation("delete_movie_rating"):
+        updated_user = users_collection.find_one_and_update(
+            {"id": user.id},
+            {"$pull": {"ratings": {"movie_id": movie_id}}},
+            return_document=ReturnDocument.AFTER,
+        )
 
     return updated_user.get("ratings")
@@ -0,0 +1,132 @@
+"""
+Response compression cost vs bytes saved on representative JSON bodies: a
+page of long reviews, a multi-movie /movies/?ids= response and a popular
+page. Reports per-call compression time and compressed size per encoder.
+
+    cd backend
+    python -m benchmarks.compression --output compression.json
+"""
+
+from typing import Callable, Dict
+from benchmarks.fakes import fake_movie, movie_page
+from benchmarks.models import measure
+import argparse
+import gzip
+import json
+import orjson
+import random
+import sys
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SYLLABLES = "ka lo mi re tu sa ne vi do pa an el is or um th er in qu st".split()
+
+
+def vocabulary(rng: random.Random, size: int = 3000) -> list:
+    return [
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+        for _ in range(size)
+    ]
+
+
+def review_text(rng: random.Random, words: list, count: int) -> str:
+    # Zipf-like word frequencies, roughly like English prose
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+
+    return " ".join(rng.choices(words, weights, k=count)).capitalize() + "."
+
+
+def payloads() -> Dict[str, bytes]:
+    rng = random.Random(7)
+    words = vocabulary(rng)
+
+    reviews = {
+        "movie_id": 550,
+        "reviews": [
+            {
+                "id": f"review-{i}",
+                "author": f"Critic {i}",
+                "content": review_text(rng, words, rng.randint(300, 1500)),
+                "created_at": "2024-01-01T00:00:00.000Z",
+            }
+            for i in range(20)
+        ],
+        "total_results": 57,
+    }
+    movie_fields = (
+        "id title overview popularity poster_path vote_average vote_count "
+        "genre_ids release_date"
+    ).split()
+
+    return {
+        "reviews_page": orjson.dumps(reviews),
+        "movies_by_ids_50": orjson.dumps(
+            [
+                {field: fake_movie(movie_id).get(field) for field in movie_fields}
+                for movie_id in range(1, 51)
+            ]
+        ),
+        "popular_page": orjson.dumps({"movies": movie_page(1, 1)["results"]}),
+    }
+
+
+def encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    available = {
+        f"gzip-{level}": lambda body, level=level: gzip.compress(
+            body, compresslevel=level, mtime=0
+        )
+        for level in (1, 6, 9)
+    }
+
+    if brotli is not None:
+        for quality in (1, 4, 11):
+            available[f"br-{quality}"] = lambda body, quality=quality: brotli.compress(
+                body, quality=quality
+            )
+
+    return available
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-seconds", type=float, default=0.2)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if brotli is None:
+        print("brotli is not installed: gzip only", file=sys.stderr)
+
+    report = {}
+    for payload_name, body in payloads().items():
+        report[payload_name] = {"raw_bytes": len(body), "encoders": {}}
+
+        for encoder_name, encode in encoders().items():
+            size = len(encode(body))
+            per_call_us = measure(lambda: encode(body), args.repeat, args.min_seconds)
+            report[payload_name]["encoders"][encoder_name] = {
+                "per_call_us": round(per_call_us, 1),
+                "bytes": size,
+                "ratio": round(size / len(body), 3),
+                # Bytes kept off the wire per millisecond of CPU
+                "saved_bytes_per_cpu_ms": round((len(body) - size) / per_call_us * 1000),
+            }
+            print(
+                f"{payload_name:<18}{encoder_name:<9}{len(body):>9} -> {size:>8} B"
+                f"{per_call_us:>12.1f} us",
+                file=sys.stderr,
+            )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+Local stand-ins for the upstream services: a TMDB API serving canned JSON and
+an OpenAI-compatible chat completions endpoint standing in for Ollama. Both
+add configurable latency and count the calls they receive.
+"""
+
+from collections import Counter
+from aiohttp import web
+import asyncio
+import gzip
+import json
+import random
+import re
+import time
+
+GENRES = [
+    {"id": 28, "name": "Action"},
+    {"id": 12, "name": "Adventure"},
+    {"id": 35, "name": "Comedy"},
+    {"id": 18, "name": "Drama"},
+    {"id": 27, "name": "Horror"},
+    {"id": 878, "name": "Science Fiction"},
+    {"id": 53, "name": "Thriller"},
+]
+PAGE_SIZE = 20
+TOTAL_PAGES = 50
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)|(?<=/review)/[^/]+")
+
+
+def fake_movie(movie_id: int) -> dict:
+    rng = random.Random(movie_id)
+
+    return {
+        "id": movie_id,
+        "title": f"Movie {movie_id}",
+        "overview": f"Overview of movie {movie_id}. " * 4,
+        "poster_path": f"/poster_{movie_id}.jpg",
+        "backdrop_path": f"/backdrop_{movie_id}.jpg",
+        "release_date": f"{1970 + movie_id % 55}-0{1 + movie_id % 9}-15",
+        "vote_average": round(rng.uniform(4, 9), 1),
+        "vote_count": rng.randint(10, 20_000),
+        "popularity": round(rng.uniform(1, 500), 3),
+        "genre_ids": [GENRES[movie_id % len(GENRES)]["id"], GENRES[movie_id % 3]["id"]],
+        "original_language": "en",
+        "adult": False,
+        "video": False,
+    }
+
+
+def movie_page(seed: int, page: int) -> dict:
+    start = (seed * 1000 + (page - 1) * PAGE_SIZE) % 100_000 + 1
+
+    return {
+        "page": page,
+        "results": [fake_movie(movie_id) for movie_id in range(start, start + PAGE_SIZE)],
+        "total_pages": TOTAL_PAGES,
+        "total_results": TOTAL_PAGES * PAGE_SIZE,
+    }
+
+
+class FakeTMDB:
+    def __init__(
+        self,
+        latency_ms: float = 20,
+        jitter_ms: float = 5,
+        catalog_size: int = 1000,
+        changed_per_page: int = 50,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.catalog_size = catalog_size
+        self.changed_per_page = changed_per_page
+        # Movies answering 404, like titles removed from TMDB
+        self.deleted_ids = set()
+        self.calls = Counter()
+        self.app = web.Application()
+        self.app.router.add_get("/3/{path:.*}", self.handle)
+        self.app.router.add_get("/p/exports/{name}", self.handle_export)
+
+    async def handle_export(self, request: web.Request) -> web.Response:
+        """Daily id export: gzipped JSON lines, like files.tmdb.org"""
+        self.calls["/p/exports"] += 1
+        lines = [
+            json.dumps(
+                {
+                    "adult": False,
+                    "id": movie_id,
+                    "original_title": f"Movie {movie_id}",
+                    "popularity": fake_movie(movie_id)["popularity"],
+                    "video": False,
+                }
+            )
+            for movie_id in range(1, self.catalog_size + 1)
+        ]
+
+        return web.Response(body=gzip.compress("\n".join(lines).encode()))
+
+    async def handle(self, request: web.Request) -> web.Response:
+        path = "/" + request.match_info["path"]
+        self.calls[_ID_SEGMENT.sub("/{id}", path)] += 1
+
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        await asyncio.sleep(max(delay, 0) / 1000)
+
+        match = re.fullmatch(r"/movie/(\d+)", path)
+        if match and int(match.group(1)) in self.deleted_ids:
+            return web.json_response(
+                {"status_code": 34, "status_message": "The resource could not be found."},
+                status=404,
+            )
+
+        return web.json_response(self.payload(path, request.query))
+
+    def payload(self, path: str, query) -> dict:
+        page = int(query.get("page", 1))
+
+        if path == "/genre/movie/list":
+            return {"genres": GENRES}
+
+        if path in ("/movie/popular", "/movie/top_rated"):
+            return movie_page(1 if path.endswith("popular") else 2, page)
+
+        if path == "/search/movie":
+            return movie_page(sum(map(ord, query.get("query", ""))) % 97, page)
+
+        if path == "/discover/movie":
+            return movie_page(int(query.get("with_genres", "0").split(",")[0]) % 89, page)
+
+        if path == "/movie/changes":
+            # Every other catalog movie changed, spread over two pages
+            start = (page - 1) * self.changed_per_page * 2 + 1
+            return {
+                "page": page,
+                "results": [
+                    {"id": movie_id, "adult": False}
+                    for movie_id in range(start, start + self.changed_per_page * 2, 2)
+                ],
+                "total_pages": 2,
+                "total_results": self.changed_per_page * 2,
+            }
+
+        match = re.fullmatch(r"/review/(\d+)-(\d+)", path)
+        if match:
+            return self.movie_resource(int(match.group(1)), "/reviews", 1)["results"][
+                int(match.group(2))
+            ]
+
+        match = re.fullmatch(r"/movie/(\d+)(/\w+)?", path)
+        if match:
+            movie_id = int(match.group(1))
+            movie = self.movie_resource(movie_id, match.group(2), page)
+
+            if not match.group(2):
+                for resource in filter(None, query.get("append_to_response", "").split(",")):
+                    movie[resource] = self.movie_resource(movie_id, f"/{resource}", 1)
+
+            return movie
+
+        return {"results": []}
+
+    def movie_resource(self, movie_id: int, resource: str, page: int) -> dict:
+        if resource == "/credits":
+            return {
+                "id": movie_id,
+                "cast": [
+                    {
+                        "id": movie_id * 100 + i,
+                        "name": f"Actor {i}",
+                        "character": f"Character {i}",
+                        "profile_path": f"/actor_{i}.jpg",
+                    }
+                    for i in range(15)
+                ],
+            }
+
+        if resource == "/reviews":
+            return {
+                "id": movie_id,
+                "page": page,
+                "results": [
+                    {
+                        "id": f"{movie_id}-{i}",
+                        "author": f"Critic {i}",
+                        "content": "A thoughtful review. " * 50,
+                        "created_at": "2024-01-01T00:00:00.000Z",
+                        "url": f"https://example.com/review/{movie_id}-{i}",
+                        "author_details": {"rating": 7.0},
+                    }
+                    for i in range(5)
+                ],
+                "total_pages": 3,
+                "total_results": 15,
+            }
+
+        if resource == "/videos":
+            return {
+                "id": movie_id,
+                "results": [
+                    {
+                        "key": f"trailer{movie_id}",
+                        "site": "YouTube",
+                        "type": "Trailer",
+                        "official": True,
+                        "name": "Official Trailer",
+                    }
+                ],
+            }
+
+        return fake_movie(movie_id)
+
+
+class FakeLLM:
+    """
+    OpenAI-compatible /v1/chat/completions. Structured requests (with tools)
+    stream the output tool call one recommendation at a time, so early stop
+    on the client side is exercised like against Ollama.
+    """
+
+    def __init__(self, prefill_ms: float = 300, per_item_ms: float = 30):
+        self.prefill_ms = prefill_ms
+        self.per_item_ms = per_item_ms
+        self.calls = 0
+        self.items_streamed = 0
+        self.app = web.Application()
+        self.app.router.add_post("/v1/chat/completions", self.handle)
+
+    def recommendations(self, count: int = 30) -> list:
+        start = random.randint(1, 90_000)
+
+        return [
+            {"title": f"Movie {movie_id}", "year": 1970 + movie_id % 55}
+            for movie_id in range(start, start + count)
+        ]
+
+    @staticmethod
+    def chunk(model: str, delta: dict, finish_reason=None, usage=None) -> bytes:
+        body = {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": (
+                [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                if delta is not None
+                else []
+            ),
+        }
+        if usage:
+            body["usage"] = usage
+
+        return f"data: {json.dumps(body)}\n\n".encode()
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.calls += 1
+        body = await request.json()
+        model = body.get("model", "bench")
+        items = self.recommendations()
+
+        await asyncio.sleep(self.prefill_ms / 1000)
+
+        if not body.get("stream"):
+            await asyncio.sleep(self.per_item_ms * len(items) / 1000)
+            self.items_streamed += len(items)
+
+            return web.json_response(
+                {
+                    "id": "chatcmpl-bench",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": json.dumps([i["title"] for i in items]),
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {"prompt_tokens": 400, "completion_tokens": 300, "total_tokens": 700},
+                }
+            )
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        tool_name = body["tools"][0]["function"]["name"]
+
+        try:
+            await response.write(
+                self.chunk(
+                    model,
+                    {
+                        "role": "assistant",
+                        "tool_calls": [
+                            {
+                                "index": 0,
+                                "id": "call_bench",
+                                "type": "function",
+                                "function": {"name": tool_name, "arguments": '{"response": ['},
+                            }
+                        ],
+                    },
+                )
+            )
+
+            for index, item in enumerate(items):
+                await asyncio.sleep(self.per_item_ms / 1000)
+                self.items_streamed += 1
+                arguments = ("," if index else "") + json.dumps(item)
+                await response.write(
+                    self.chunk(
+                        model,
+                        {"tool_calls": [{"index": 0, "function": {"arguments": arguments}}]},
+                    )
+                )
+
+            await response.write(
+                self.chunk(model, {"tool_calls": [{"index": 0, "function": {"arguments": "]}"}}]})
+            )
+            await response.write(self.chunk(model, {}, finish_reason="tool_calls"))
+            await response.write(
+                self.chunk(
+                    model,
+                    None,
+                    usage={
+                        "prompt_tokens": 400,
+                        "completion_tokens": 12 * len(items),
+                        "total_tokens": 400 + 12 * len(items),
+                    },
+                )
+            )
+            await response.write(b"data: [DONE]\n\n")
+
+        except ConnectionResetError:
+            # The client stopped reading once it had enough recommendations
+            pass
+
+        return response
+
+
+async def start_server(app: web.Application) -> tuple:
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    return runner, f"http://127.0.0.1:{port}"
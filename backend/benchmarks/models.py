@@ -0,0 +1,140 @@
+"""
+Micro-benchmarks for Pydantic model construction and serialization on the
+hot paths: TMDB result pages, users loaded on every authenticated request
+and the shared validators. Reports the best per-call time in microseconds.
+
+    cd backend
+    python -m benchmarks.models --output models.json
+"""
+
+from typing import Callable, Dict
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from benchmarks.fakes import movie_page
+from benchmarks.run import PLACEHOLDER_ENV
+import argparse
+import json
+import orjson
+import os
+import re
+import sys
+import timeit
+
+for key, value in {
+    **PLACEHOLDER_ENV,
+    "BASE_URL": "http://localhost/3",
+    "OLLAMA_SERVER_ENDPOINT": "http://localhost/v1",
+    "MONGO_CONNECTION_STRING": "mongodb://localhost:27017",
+}.items():
+    os.environ.setdefault(key, value)
+
+from app.schemas.movie import Movie, MovieResponse  # noqa: E402
+from app.schemas.user import User, UserCreate  # noqa: E402
+from app.schemas.validator import PHONE_NUMBER_PATTERN, USERNAME_PATTERN  # noqa: E402
+from app.services.tmdb import movie_list_adapter  # noqa: E402
+
+RATING_COUNTS = (10, 1_000, 5_000)
+
+
+def user_document(ratings: int) -> dict:
+    return {
+        **User(username="bench_user", email="bench@example.com").model_dump(),
+        "_id": "66a0c0ffee0000000000beef",
+        "favorite_movies": list(range(200)),
+        "watchlist": list(range(200)),
+        "ratings": [
+            {"movie_id": movie_id, "rating": movie_id % 10 + 1}
+            for movie_id in range(ratings)
+        ],
+    }
+
+
+def cases() -> Dict[str, Callable]:
+    page = movie_page(1, 1)["results"]
+    page_bytes = json.dumps(movie_page(1, 1)).encode()
+    movies = movie_list_adapter.validate_python(page)
+    response = MovieResponse(movies=movies)
+    signup = {
+        "username": "bench_user",
+        "password": "Password123",
+        "confirm_password": "Password123",
+        "email": "bench@example.com",
+        "first_name": "Bench",
+        "last_name": "User",
+        "phone_number": "+1234567890",
+    }
+
+    benchmarks = {
+        "movie_page/kwargs": lambda: [Movie(**movie) for movie in page],
+        "movie_page/type_adapter": lambda: movie_list_adapter.validate_python(page),
+        "movie_response/jsonable_encoder+json": lambda: json.dumps(
+            jsonable_encoder(response)
+        ),
+        "movie_response/model_dump_json": response.model_dump_json,
+        # What FastAPI does for a response_model route: dump, then render
+        "movie_response/JSONResponse": lambda: JSONResponse(
+            response.model_dump(mode="json")
+        ),
+        "movie_response/ORJSONResponse": lambda: ORJSONResponse(
+            response.model_dump(mode="json")
+        ),
+        "tmdb_page/json_loads": lambda: json.loads(page_bytes),
+        "tmdb_page/orjson_loads": lambda: orjson.loads(page_bytes),
+        "user_create/validate": lambda: UserCreate(**signup),
+        "regex/username_inline": lambda: re.fullmatch(r"^[a-zA-Z0-9_]+$", "bench_user"),
+        "regex/username_compiled": lambda: USERNAME_PATTERN.fullmatch("bench_user"),
+        "regex/phone_inline": lambda: re.fullmatch(r"^\+?\d{9,15}$", "+1234567890"),
+        "regex/phone_compiled": lambda: PHONE_NUMBER_PATTERN.fullmatch("+1234567890"),
+    }
+
+    for ratings in RATING_COUNTS:
+        document = user_document(ratings)
+        user = User.from_document(document)
+
+        benchmarks[f"user_{ratings}_ratings/kwargs"] = lambda d=document: User(**d)
+        benchmarks[f"user_{ratings}_ratings/model_validate"] = (
+            lambda d=document: User.model_validate(d)
+        )
+        benchmarks[f"user_{ratings}_ratings/from_document"] = (
+            lambda d=document: User.from_document(d)
+        )
+        benchmarks[f"user_{ratings}_ratings/model_dump"] = user.model_dump
+
+    return benchmarks
+
+
+def measure(func: Callable, repeat: int, min_seconds: float) -> float:
+    """Best per-call time in microseconds over `repeat` autoranged rounds"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_seconds / 0.2))
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-seconds", type=float, default=0.2)
+    parser.add_argument("--filter", help="only run benchmarks containing this text")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, func in cases().items():
+        if args.filter and args.filter not in name:
+            continue
+
+        results[name] = round(measure(func, args.repeat, args.min_seconds), 3)
+        print(f"{name:<45}{results[name]:>12.3f} us", file=sys.stderr)
+
+    output = json.dumps({"per_call_us": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""
+Load-test the backend against local stand-ins and report throughput,
+p50/p95/p99 latency per scenario and upstream call counts as JSON.
+
+The app runs in-process (no lifespan, so the scheduler stays off) behind an
+httpx ASGI transport; TMDB and the LLM are local aiohttp servers and Mongo is
+mongomock unless --mongo-url points to a real server.
+
+    cd backend
+    python -m benchmarks.run --duration 30 --output bench.json
+    python -m benchmarks.run --duration 30 --compare bench.json
+"""
+
+from typing import Dict, List, Optional
+from collections import defaultdict
+from datetime import datetime, timezone
+from benchmarks.fakes import FakeLLM, FakeTMDB, start_server
+import argparse
+import asyncio
+import httpx
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+# Relative weights of the user journeys in the default mix
+DEFAULT_MIX = {
+    "browse_popular": 30,
+    "browse_genre": 10,
+    "search": 20,
+    "movie_details": 10,
+    "favorite": 10,
+    "rate": 10,
+    "recommendations": 10,
+}
+SEARCH_WORDS = ["star", "love", "night", "war", "dark", "king", "city", "last", "life"]
+GENRE_IDS = [28, 12, 35, 18, 27, 878, 53]
+
+# Required settings the benchmark does not exercise
+PLACEHOLDER_ENV = {
+    "TMDB_API_KEY": "bench",
+    "SECRET_KEY": "bench-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "EMAIL_ACCESS_TOKEN_EXPIRE_HOURS": "24",
+    "MONGO_DATABASE_NAME": "MovieCompassBench",
+    "MONGO_COLLECTION_NAME": "Users",
+    "GOOGLE_CLIENT_ID": "bench",
+    "GOOGLE_CLIENT_SECRET": "bench",
+    "GOOGLE_REDIRECT_URI": "http://localhost/callback",
+    "GOOGLE_AUTHORIZATION_ENDPOINT": "http://localhost/auth",
+    "GOOGLE_TOKEN_ENDPOINT": "http://localhost/token",
+    "GOOGLE_USERINFO_ENDPOINT": "http://localhost/userinfo",
+    "EMAIL_FROM": "bench@example.com",
+    "EMAIL_USERNAME": "bench",
+    "EMAIL_PASSWORD": "bench",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "25",
+    "MODEL_ID": "bench-model",
+    "FRONTEND_URL": "http://localhost:5173",
+    "OPENAI_API_KEY": "bench",
+}
+
+
+def configure_environment(tmdb_url: str, llm_url: str, mongo_url: Optional[str]):
+    """Must run before the app is imported - settings and Mongo clients are module-level"""
+    for key, value in PLACEHOLDER_ENV.items():
+        os.environ.setdefault(key, value)
+
+    os.environ["BASE_URL"] = f"{tmdb_url}/3"
+    os.environ["OLLAMA_SERVER_ENDPOINT"] = f"{llm_url}/v1"
+
+    if mongo_url:
+        os.environ["MONGO_CONNECTION_STRING"] = mongo_url
+    else:
+        import mongomock
+        import pymongo
+
+        os.environ["MONGO_CONNECTION_STRING"] = "mongodb://localhost:27017"
+        pymongo.MongoClient = mongomock.MongoClient
+
+
+def seed_users(count: int, rng: random.Random) -> List[str]:
+    """Verified users with some history; returns their bearer tokens"""
+    from app.schemas.rating import RatingEntry
+    from app.schemas.user import User
+    from app.services.security import create_access_token
+    from app.services.user import users_collection
+
+    users_collection.delete_many({"username": {"$regex": "^bench_"}})
+    tokens = []
+
+    for index in range(count):
+        user = User(
+            username=f"bench_{index}",
+            email=f"bench_{index}@example.com",
+            is_verified=True,
+            favorite_movies=rng.sample(range(1, 5_000), 5),
+            watchlist=rng.sample(range(1, 5_000), 5),
+            ratings=[
+                RatingEntry(movie_id=movie_id, rating=rng.randint(1, 10))
+                for movie_id in rng.sample(range(1, 5_000), 10)
+            ],
+        )
+        users_collection.insert_one(user.model_dump())
+        tokens.append(create_access_token({"sub": user.id}))
+
+    return tokens
+
+
+async def run_scenario(name: str, client, token: str, rng: random.Random) -> bool:
+    """One user journey; returns whether it succeeded"""
+    headers = {"Authorization": f"Bearer {token}"}
+    movie_id = rng.randint(1, 5_000)
+
+    if name == "browse_popular":
+        response = await client.get(f"/movies/popular?page={rng.randint(1, 5)}")
+    elif name == "browse_genre":
+        response = await client.get(f"/movies/genre/{rng.choice(GENRE_IDS)}")
+    elif name == "search":
+        response = await client.get(f"/movies/search?query={rng.choice(SEARCH_WORDS)}")
+    elif name == "movie_details":
+        ids = "&".join(f"ids={movie_id + i}" for i in range(5))
+        responses = await asyncio.gather(
+            client.get(f"/movies/?{ids}"),
+            client.get(f"/movies/{movie_id}/cast"),
+            client.get(f"/movies/{movie_id}/reviews"),
+            client.get(f"/movies/{movie_id}/trailer"),
+        )
+        return all(response.status_code == 200 for response in responses)
+    elif name == "movie_page_full":
+        # The same movie page as movie_details, from the aggregated endpoint
+        responses = await asyncio.gather(
+            client.get(f"/movies/?{'&'.join(f'ids={movie_id + i}' for i in range(1, 5))}"),
+            client.get(f"/movies/{movie_id}/full?excerpt_length=300"),
+        )
+        return all(response.status_code == 200 for response in responses)
+    elif name == "favorite":
+        response = await client.put(f"/users/me/favorite/{movie_id}", headers=headers)
+        if response.status_code == 400:  # already a favorite - toggle off
+            response = await client.delete(
+                f"/users/me/favorite/{movie_id}", headers=headers
+            )
+    elif name == "rate":
+        response = await client.put(
+            f"/users/me/rating/{movie_id}?rating={rng.randint(1, 10)}", headers=headers
+        )
+    elif name == "recommendations":
+        response = await client.post("/users/me/recommendations", headers=headers)
+    else:
+        raise ValueError(f"Unknown scenario: {name}")
+
+    return response.status_code == 200
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    ordered = sorted(latencies)
+
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+
+
+async def drive_load(
+    application,
+    tokens: List[str],
+    mix: Dict[str, int],
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> Dict[str, Dict]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    names, weights = zip(*mix.items())
+    transport = httpx.ASGITransport(app=application)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=120
+    ) as client:
+        deadline = time.perf_counter() + duration
+
+        async def virtual_user(index: int):
+            rng = random.Random(seed + index)
+            token = tokens[index % len(tokens)]
+
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                started_at = time.perf_counter()
+
+                try:
+                    ok = await run_scenario(name, client, token, rng)
+                except Exception:
+                    ok = False
+
+                latencies[name].append(time.perf_counter() - started_at)
+                if not ok:
+                    errors[name] += 1
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started_at
+
+    scenarios = {
+        name: summarize(latencies[name], errors[name], elapsed) for name in sorted(latencies)
+    }
+    overall = summarize(
+        [value for values in latencies.values() for value in values],
+        sum(errors.values()),
+        elapsed,
+    )
+
+    return {"elapsed_seconds": round(elapsed, 2), "scenarios": scenarios, "overall": overall}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(args) -> Dict:
+    tmdb = FakeTMDB(latency_ms=args.tmdb_latency_ms, jitter_ms=args.tmdb_jitter_ms)
+    llm = FakeLLM(prefill_ms=args.llm_prefill_ms, per_item_ms=args.llm_item_ms)
+    tmdb_runner, tmdb_url = await start_server(tmdb.app)
+    llm_runner, llm_url = await start_server(llm.app)
+
+    try:
+        configure_environment(tmdb_url, llm_url, args.mongo_url)
+        from app.main import application
+
+        rng = random.Random(args.seed)
+        tokens = seed_users(args.users, rng)
+        mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+
+        results = await drive_load(
+            application, tokens, mix, args.concurrency, args.duration, args.seed
+        )
+    finally:
+        await tmdb_runner.cleanup()
+        await llm_runner.cleanup()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "seed": args.seed,
+            "mix": mix,
+            "tmdb_latency_ms": args.tmdb_latency_ms,
+            "llm_prefill_ms": args.llm_prefill_ms,
+            "llm_item_ms": args.llm_item_ms,
+            "mongo": "real" if args.mongo_url else "mongomock",
+        },
+        **results,
+        "upstream_calls": {
+            "tmdb_total": sum(tmdb.calls.values()),
+            "tmdb": dict(tmdb.calls.most_common()),
+            "llm": llm.calls,
+            "llm_items_streamed": llm.items_streamed,
+        },
+    }
+
+
+def compare(current: Dict, baseline: Dict) -> str:
+    """Per-scenario deltas against a previous run"""
+    lines = [f"{'scenario':<18}{'metric':<16}{'baseline':>12}{'current':>12}{'change':>10}"]
+    pairs = [("overall", current["overall"], baseline.get("overall", {}))] + [
+        (name, stats, baseline.get("scenarios", {}).get(name, {}))
+        for name, stats in current["scenarios"].items()
+    ]
+
+    for name, stats, previous in pairs:
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            before, after = previous.get(metric), stats[metric]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            lines.append(
+                f"{name:<18}{metric:<16}{before if before is not None else '-':>12}"
+                f"{after:>12}{change:>10}"
+            )
+
+    tmdb_before = baseline.get("upstream_calls", {}).get("tmdb_total")
+    lines.append(
+        f"{'upstream':<18}{'tmdb_total':<16}{tmdb_before if tmdb_before is not None else '-':>12}"
+        f"{current['upstream_calls']['tmdb_total']:>12}"
+    )
+
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users")
+    parser.add_argument("--users", type=int, default=50, help="seeded accounts")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mix", help='JSON scenario weights, e.g. \'{"search": 1}\'')
+    parser.add_argument("--tmdb-latency-ms", type=float, default=20)
+    parser.add_argument("--tmdb-jitter-ms", type=float, default=5)
+    parser.add_argument("--llm-prefill-ms", type=float, default=300)
+    parser.add_argument("--llm-item-ms", type=float, default=30)
+    parser.add_argument("--mongo-url", help="use a real Mongo instead of mongomock")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="previous JSON report to diff against")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Per-request access logs would dominate the run's own overhead
+    for noisy_logger in ("aiohttp.access", "httpx", "app"):
+        logging.getLogger(noisy_logger).setLevel(logging.WARNING)
+
+    report = asyncio.run(run_benchmark(args))
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as file:
+            print(compare(report, json.load(file)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import mongomock.collection
+import pytest
+
+
+# -----------------------------------------------------------------------------
+# mongomock 4.1 predates the sort option pymongo 4.9+ passes to bulk ops
+# -----------------------------------------------------------------------------
+def _without_sort(method):
+    def add(self, *args, sort=None, **kwargs):
+        return method(self, *args, **kwargs)
+
+    return add
+
+
+@pytest.fixture(autouse=True)
+def _mongomock_bulk_write(monkeypatch):
+    builder = mongomock.collection.BulkOperationBuilder
+    monkeypatch.setattr(builder, "add_replace", _without_sort(builder.add_replace))
+    monkeypatch.setattr(builder, "add_update", _without_sort(builder.add_update))
@@ -8,6 +8,7 @@ import app.services.user as user_service  # swap collection
 import app.services.email as email_service  # stub e-mails
 import app.services.tmdb as tmdb_service  # stub TMDB
 from app.core.config import settings
+from app.services.prefetch import PageCache, Prefetcher, UpstreamPressure
 
 
 # -----------------------------------------------------------------------------
@@ -48,6 +49,24 @@ def _stub_email(monkeypatch):
     monkeypatch.setattr(email_service, "send_reset_password_email", _noop_send)
 
 
+# -----------------------------------------------------------------------------
+# TMDB pages – no caching or read-ahead, tests swap the stubs between calls
+# -----------------------------------------------------------------------------
+@pytest.fixture(autouse=True)
+def _no_page_cache(monkeypatch):
+    monkeypatch.setattr(
+        tmdb_service,
+        "page_prefetcher",
+        Prefetcher(tmdb_service._fetch_results, PageCache(0, 0), UpstreamPressure()),
+    )
+    monkeypatch.setattr(
+        tmdb_service,
+        "review_fetcher",
+        Prefetcher(tmdb_service._fetch_json, PageCache(0, 0), UpstreamPressure()),
+    )
+    monkeypatch.setattr(settings, "PREFETCH_ENABLED", False)
+
+
 # -----------------------------------------------------------------------------
 # Stub TMDB API calls with proper mock data
 # -----------------------------------------------------------------------------
@@ -28,6 +28,7 @@ def test_tmdb_movie_endpoints_integration(client):
     response_data = r.json()
     assert "movies" in response_data
     assert isinstance(response_data["movies"], list)
+    assert response_data["total_pages"] == 100
 
     # ---------- Test 3: Get genres ----------
     r = client.get("/movies/genres")
@@ -0,0 +1,136 @@
+# tests/services/test_catalog_service.py
+import mongomock
+import pytest
+import pytest_asyncio
+
+import app.services.catalog as catalog_mod
+import app.services.catalog_sync as sync_mod
+import app.services.tmdb as tmdb_mod
+from app.services.prefetch import PageCache, Prefetcher, UpstreamPressure
+from benchmarks.fakes import FakeTMDB, fake_movie, start_server
+
+
+@pytest.fixture(autouse=True)
+def _mongo(monkeypatch):
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr(catalog_mod, "movies_collection", db.movies)
+    monkeypatch.setattr(catalog_mod, "sync_state_collection", db.movies_sync_state)
+    monkeypatch.setattr(catalog_mod.settings, "CATALOG_MIRROR_ENABLED", True)
+    monkeypatch.setattr(catalog_mod.settings, "PREFETCH_ENABLED", False)
+    monkeypatch.setattr(
+        tmdb_mod,
+        "page_prefetcher",
+        Prefetcher(tmdb_mod._fetch_results, PageCache(16, 60), UpstreamPressure()),
+    )
+    return db
+
+
+@pytest_asyncio.fixture
+async def fake_tmdb(monkeypatch):
+    fake = FakeTMDB(latency_ms=0, jitter_ms=0, catalog_size=60, changed_per_page=10)
+    runner, url = await start_server(fake.app)
+    monkeypatch.setattr(sync_mod.settings, "BASE_URL", f"{url}/3")
+    monkeypatch.setattr(sync_mod.settings, "CATALOG_EXPORT_BASE_URL", f"{url}/p/exports")
+    monkeypatch.setattr(sync_mod.settings, "CATALOG_IMPORT_LIMIT", 40)
+
+    yield fake
+
+    await runner.cleanup()
+
+
+def _most_popular(count):
+    return sorted(
+        range(1, 61), key=lambda movie_id: fake_movie(movie_id)["popularity"], reverse=True
+    )[:count]
+
+
+def test_catalog_document_is_movie_shaped():
+    document = catalog_mod.catalog_document(
+        {"id": 5, "title": "Heat", "genres": [{"id": 80, "name": "Crime"}], "budget": 1}
+    )
+
+    assert document["_id"] == 5
+    assert document["genre_ids"] == [80]
+    assert "budget" not in document
+    assert set(document) - {"_id", "synced_at"} == set(tmdb_mod.Movie.model_fields)
+
+
+def test_parse_export_skips_adult_titles():
+    import gzip
+
+    payload = gzip.compress(b'{"id": 1, "adult": false}\n{"id": 2, "adult": true}\n\n')
+
+    assert [entry["id"] for entry in sync_mod.parse_export(payload)] == [1]
+
+
+@pytest.mark.asyncio
+async def test_import_then_incremental_changes(fake_tmdb, _mongo):
+    stats = await sync_mod.sync_catalog()
+
+    assert stats == {"stored": 40, "removed": 0}
+    assert {doc["_id"] for doc in _mongo.movies.find()} == set(_most_popular(40))
+    assert _mongo.movies_sync_state.find_one({"_id": "changes"})["synced_through"]
+
+    # Only mirrored movies are refreshed; deleted ones are dropped
+    changed_ids = set(range(1, 41, 2))
+    known_changed = changed_ids & set(_most_popular(40))
+    deleted_id = min(known_changed)
+    fake_tmdb.deleted_ids.add(deleted_id)
+    fake_tmdb.calls.clear()
+
+    stats = await sync_mod.sync_catalog()
+
+    assert stats == {
+        "changed": len(changed_ids),
+        "stored": len(known_changed) - 1,
+        "removed": 1,
+    }
+    assert fake_tmdb.calls["/movie/changes"] == 2
+    assert fake_tmdb.calls["/movie/{id}"] == len(known_changed)
+    assert _mongo.movies.find_one({"_id": deleted_id}) is None
+
+
+@pytest.mark.asyncio
+async def test_sync_refreshes_popularity_from_each_new_export(fake_tmdb, _mongo):
+    await sync_mod.sync_catalog()
+    movie_id = _most_popular(1)[0]
+    _mongo.movies.update_one({"_id": movie_id}, {"$set": {"popularity": 0.5}})
+
+    # The export the import used is not read again
+    stats = await sync_mod.sync_catalog()
+    assert "popularity_updated" not in stats
+
+    _mongo.movies_sync_state.update_one(
+        {"_id": "changes"}, {"$set": {"popularity_day": "2000-01-01"}}
+    )
+    stats = await sync_mod.sync_catalog()
+
+    assert stats["popularity_updated"] == 1
+    assert _mongo.movies.find_one({"_id": movie_id})["popularity"] == fake_movie(movie_id)["popularity"]
+    assert fake_tmdb.calls["/p/exports"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_come_from_the_mirror_with_tmdb_fallback(fake_tmdb):
+    await sync_mod.sync_catalog()
+    fake_tmdb.calls.clear()
+
+    popular = await tmdb_mod.fetch_popular_movies(1)
+    assert [movie.id for movie in popular] == _most_popular(20)
+
+    genre_page = catalog_mod.find_catalog_by_genre(28)
+    assert genre_page is None or all(28 in movie["genre_ids"] for movie in genre_page)
+
+    movie = await tmdb_mod.fetch_movie_details(_most_popular(1)[0])
+    assert movie.id == _most_popular(1)[0]
+    assert sum(fake_tmdb.calls.values()) == 0
+
+    # Beyond the mirror: TMDB answers, and the movie is mirrored from then on
+    outside_id = _most_popular(60)[-1]
+    await tmdb_mod.fetch_movie_details(outside_id)
+    await tmdb_mod.fetch_movie_details(outside_id)
+    assert fake_tmdb.calls["/movie/{id}"] == 1
+
+    # Page 3 would be short, so TMDB serves it
+    await tmdb_mod.fetch_popular_movies(3)
+    assert fake_tmdb.calls["/movie/popular"] == 1
@@ -0,0 +1,119 @@
+from unittest.mock import AsyncMock
+import asyncio
+
+import pytest
+
+import app.services.cold_start as cold_mod
+from app.schemas.genre import Genre
+from app.schemas.movie import Movie
+from app.schemas.rating import RatingEntry
+from app.schemas.user import User
+from fastapi import HTTPException
+
+
+def _movie(movie_id: int, genre_ids=None) -> Movie:
+    return Movie(id=movie_id, title=f"Movie {movie_id}", genre_ids=genre_ids or [])
+
+
+@pytest.fixture(autouse=True)
+def _empty_pool(monkeypatch):
+    monkeypatch.setattr(cold_mod, "cold_start_movies", [])
+    monkeypatch.setattr(cold_mod, "_refresh_lock", asyncio.Lock())
+
+
+@pytest.fixture
+def tmdb(monkeypatch):
+    mocks = {
+        "fetch_movies_genres": AsyncMock(return_value=[Genre(id=27, name="Horror")]),
+        "fetch_popular_movies": AsyncMock(
+            side_effect=lambda page: [_movie(page * 10 + 1, [28]), _movie(3, [35])]
+        ),
+        "fetch_top_rated_movies": AsyncMock(
+            side_effect=lambda page: [_movie(page * 100 + 1, [18])]
+        ),
+        "fetch_movies_by_genre": AsyncMock(return_value=[_movie(500, [27])]),
+    }
+    for name, mock in mocks.items():
+        monkeypatch.setattr(cold_mod, name, mock)
+    return mocks
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def test_is_new_user():
+    assert cold_mod.is_new_user(User(username="new", email="new@example.com"))
+    assert not cold_mod.is_new_user(
+        User(
+            username="old",
+            email="old@example.com",
+            ratings=[RatingEntry(movie_id=1, rating=5)],
+        )
+    )
+
+
+def test_merge_movie_lists_interleaves_and_dedupes():
+    merged = cold_mod.merge_movie_lists(
+        [[_movie(1), _movie(2)], [_movie(3), _movie(1)], [_movie(4)]], limit=10
+    )
+
+    assert [movie.id for movie in merged] == [1, 3, 4, 2]
+
+
+def test_rank_for_genres_prefers_overlap():
+    movies = [_movie(1, [28]), _movie(2, [35, 18]), _movie(3, [18])]
+
+    ranked = cold_mod.rank_for_genres(movies, [18, 35])
+
+    assert [movie.id for movie in ranked] == [2, 3, 1]
+
+
+# ---------------------------------------------------------------------------
+# Refresh + serving
+# ---------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_refresh_builds_pool_from_all_sources(tmdb):
+    count = await cold_mod.refresh_cold_start_movies()
+
+    ids = [movie.id for movie in cold_mod.cold_start_movies]
+    assert count == len(ids) == 6
+    assert {11, 21, 101, 201, 500, 3} == set(ids)
+    tmdb["fetch_movies_by_genre"].assert_awaited_once_with(27)
+
+
+@pytest.mark.asyncio
+async def test_refresh_keeps_previous_pool_when_tmdb_fails(monkeypatch, tmdb):
+    cold_mod.cold_start_movies = [_movie(1)]
+    for name in ("fetch_popular_movies", "fetch_top_rated_movies", "fetch_movies_by_genre"):
+        tmdb[name].side_effect = HTTPException(status_code=503)
+
+    assert await cold_mod.refresh_cold_start_movies() == 0
+    assert [movie.id for movie in cold_mod.cold_start_movies] == [1]
+
+
+@pytest.mark.asyncio
+async def test_get_recommendations_refreshes_lazily_and_personalizes(tmdb):
+    movies = await cold_mod.get_cold_start_recommendations(genre_ids=[27], limit=3)
+
+    assert len(movies) == 3
+    assert movies[0].id == 500
+    tmdb["fetch_movies_genres"].assert_awaited_once()
+
+    await cold_mod.get_cold_start_recommendations()
+    tmdb["fetch_movies_genres"].assert_awaited_once()  # served from the pool
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_requests_share_one_refresh(tmdb):
+    async def slow_genres():
+        await asyncio.sleep(0.01)
+        return [Genre(id=27, name="Horror")]
+
+    tmdb["fetch_movies_genres"].side_effect = slow_genres
+
+    results = await asyncio.gather(
+        *(cold_mod.get_cold_start_recommendations() for _ in range(5))
+    )
+
+    tmdb["fetch_movies_genres"].assert_awaited_once()
+    assert all(movies == results[0] for movies in results)
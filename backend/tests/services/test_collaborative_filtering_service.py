@@ -0,0 +1,141 @@
+from unittest.mock import AsyncMock
+
+import mongomock
+import pytest
+
+import app.services.collaborative_filtering as cf_mod
+from app.schemas.rating import RatingEntry
+from app.schemas.user import User
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+@pytest.fixture(autouse=True)
+def _mongo(monkeypatch):
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr(cf_mod, "users_collection", db.users)
+    monkeypatch.setattr(cf_mod, "neighbors_collection", db.item_neighbors)
+    return db
+
+
+def _user(**overrides) -> User:
+    base = dict(username="john", email="john@example.com")
+    base.update(overrides)
+    return User(**base)
+
+
+USER_DOCS = [
+    {"id": "a", "favorite_movies": [1, 2], "watchlist": [], "ratings": []},
+    {"id": "b", "favorite_movies": [1, 2, 3], "watchlist": [], "ratings": []},
+    {
+        "id": "c",
+        "favorite_movies": [3],
+        "watchlist": [4],
+        "ratings": [{"movie_id": 1, "rating": 9}, {"movie_id": 5, "rating": 2}],
+    },
+    {"id": "d", "favorite_movies": [3, 4], "watchlist": [], "ratings": []},
+]
+
+
+# ---------------------------------------------------------------------------
+# Pure helpers
+# ---------------------------------------------------------------------------
+def test_user_item_weights_keeps_strongest_positive_signal():
+    weights = cf_mod.user_item_weights(
+        {
+            "favorite_movies": [1],
+            "watchlist": [1, 2],
+            "ratings": [{"movie_id": 3, "rating": 8}, {"movie_id": 4, "rating": 3}],
+        }
+    )
+
+    assert weights == {1: cf_mod.FAVORITE_WEIGHT, 2: cf_mod.WATCHLIST_WEIGHT, 3: 0.8}
+
+
+def test_compute_item_neighbors_requires_co_occurrence():
+    rows = [{1: 1.0, 2: 1.0}, {1: 1.0, 2: 1.0}, {2: 1.0, 3: 1.0}]
+    neighbors = cf_mod.compute_item_neighbors(rows, top_n=5)
+
+    assert [movie_id for movie_id, _ in neighbors[1]] == [2]
+    assert 3 not in neighbors  # seen together only once
+    assert 0 < neighbors[1][0][1] <= 1
+
+
+def test_compute_item_neighbors_matches_pairwise_cosine():
+    import math
+    import random
+
+    rng = random.Random(3)
+    rows = [
+        {movie_id: rng.choice([0.5, 0.8, 1.0]) for movie_id in rng.sample(range(30), 8)}
+        for _ in range(40)
+    ]
+    neighbors = cf_mod.compute_item_neighbors(rows, top_n=100)
+
+    def cosine(a, b):
+        shared = [row for row in rows if a in row and b in row]
+        dot = sum(row[a] * row[b] for row in shared)
+        norm_a = math.sqrt(sum(row[a] ** 2 for row in rows if a in row))
+        norm_b = math.sqrt(sum(row[b] ** 2 for row in rows if b in row))
+        return len(shared), dot / (norm_a * norm_b)
+
+    for item, item_neighbors in neighbors.items():
+        scores = [score for _, score in item_neighbors]
+        assert scores == sorted(scores, reverse=True)
+
+        for other, score in item_neighbors:
+            shared, expected = cosine(item, other)
+            assert shared >= cf_mod.MIN_CO_OCCURRENCE
+            assert score == pytest.approx(expected)
+
+
+def test_user_item_weights_cap_keeps_strongest(monkeypatch):
+    monkeypatch.setattr(cf_mod, "MAX_ITEMS_PER_USER", 2)
+    weights = cf_mod.user_item_weights(
+        {"favorite_movies": [1], "watchlist": [2, 3], "ratings": [{"movie_id": 4, "rating": 7}]}
+    )
+
+    assert weights == {1: cf_mod.FAVORITE_WEIGHT, 4: 0.7}
+
+
+# ---------------------------------------------------------------------------
+# Batch job + online lookup
+# ---------------------------------------------------------------------------
+def test_rebuild_item_neighbors_stores_table(_mongo):
+    _mongo.users.insert_many(USER_DOCS)
+
+    count = cf_mod.rebuild_item_neighbors(top_n=10)
+
+    assert count == _mongo.item_neighbors.count_documents({})
+    doc = _mongo.item_neighbors.find_one({"movie_id": 1})
+    assert doc["neighbors"][0]["movie_id"] == 2
+
+
+def test_rebuild_item_neighbors_drops_stale_rows(_mongo):
+    _mongo.item_neighbors.insert_one({"movie_id": 99, "neighbors": [], "updated_at": None})
+    _mongo.users.insert_many(USER_DOCS)
+
+    cf_mod.rebuild_item_neighbors()
+
+    assert _mongo.item_neighbors.find_one({"movie_id": 99}) is None
+
+
+def test_find_neighbor_movie_ids_excludes_known(_mongo):
+    _mongo.users.insert_many(USER_DOCS)
+    cf_mod.rebuild_item_neighbors()
+
+    user = _user(favorite_movies=[1], ratings=[RatingEntry(movie_id=2, rating=4)])
+    movie_ids = cf_mod.find_neighbor_movie_ids(user)
+
+    assert 1 not in movie_ids and 2 not in movie_ids
+    assert movie_ids[0] == 3
+
+
+@pytest.mark.asyncio
+async def test_recommend_from_neighbors_without_signals_skips_tmdb(monkeypatch):
+    mock_fetch = AsyncMock()
+    monkeypatch.setattr(cf_mod, "fetch_multiple_movies_details", mock_fetch)
+
+    assert await cf_mod.recommend_from_neighbors(_user()) == []
+    mock_fetch.assert_not_awaited()
@@ -0,0 +1,118 @@
+# tests/services/test_compression_service.py
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response
+from fastapi.testclient import TestClient
+
+import pytest
+
+import app.services.compression as compression_mod
+from app.services.compression import CompressionMiddleware, choose_encoding
+from app.services.http_cache import HTTPCacheMiddleware
+
+LARGE = [{"id": i, "overview": "A ticking-time-bomb insomniac..." * 3} for i in range(50)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(compression_mod, "brotli", None)
+    monkeypatch.setattr(compression_mod.settings, "COMPRESSION_MIN_SIZE", 1024)
+
+    app = FastAPI()
+
+    @app.get("/movies/")
+    async def movies():
+        return LARGE
+
+    @app.get("/movies/genres")
+    async def genres():
+        return {"genres": LARGE}
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse("plain " * 1000)
+
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(HTTPCacheMiddleware)
+
+    return TestClient(app)
+
+
+def test_choose_encoding(monkeypatch):
+    monkeypatch.setattr(compression_mod, "brotli", None)
+
+    assert choose_encoding("gzip, deflate, br") == "gzip"
+    assert choose_encoding("br;q=1.0, gzip;q=0") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("*") == "gzip"
+    assert choose_encoding("") is None
+
+    monkeypatch.setattr(compression_mod, "brotli", object())
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip") == "gzip"
+
+
+def test_large_json_is_gzipped(client):
+    response = client.get("/movies/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == LARGE
+
+
+def test_small_and_unlisted_bodies_are_left_alone(client):
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    text = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/movies/", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in image.headers
+    assert text.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+
+
+def test_etags_are_per_encoding_and_revalidate(client):
+    gzipped = client.get("/movies/genres", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/movies/genres", headers={"Accept-Encoding": "identity"})
+
+    assert gzipped.headers["etag"] != plain.headers["etag"]
+
+    # Deterministic output: the same body compresses to the same ETag
+    again = client.get(
+        "/movies/genres",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert again.status_code == 304
+    # The 304 names the same variant as the 200 it revalidates
+    assert again.headers["vary"] == gzipped.headers["vary"] == "Accept-Encoding"
+
+    mismatched = client.get(
+        "/movies/genres",
+        headers={"Accept-Encoding": "identity", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert mismatched.status_code == 200
+
+
+def test_gzip_output_is_deterministic():
+    body = b'{"movies": []}' * 200
+
+    assert compression_mod._gzip(body) == compression_mod._gzip(body)
+    assert gzip.decompress(compression_mod._gzip(body)) == body
+
+
+def test_disabled(client, monkeypatch):
+    monkeypatch.setattr(compression_mod.settings, "COMPRESSION_ENABLED", False)
+
+    response = client.get("/movies/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
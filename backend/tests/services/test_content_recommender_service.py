@@ -0,0 +1,159 @@
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+import app.services.content_recommender as cr_mod
+from app.schemas.movie import Movie
+from app.schemas.rating import RatingEntry
+from app.schemas.user import User
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _movie(movie_id: int, genre_ids, overview: str = "", **kw) -> Movie:
+    return Movie(
+        id=movie_id,
+        title=f"Movie {movie_id}",
+        genre_ids=genre_ids,
+        overview=overview,
+        popularity=kw.get("popularity", 50.0),
+        vote_average=kw.get("vote_average", 7.0),
+        release_date=kw.get("release_date", "2010-01-01"),
+    )
+
+
+def _user(**overrides) -> User:
+    base = dict(username="john", email="john@example.com")
+    base.update(overrides)
+    return User(**base)
+
+
+CATALOG = [
+    _movie(1, [28, 878], "space marines fight alien invaders"),
+    _movie(2, [28, 878], "alien invaders attack a space station"),
+    _movie(3, [10749, 35], "two strangers fall in love in paris"),
+    _movie(4, [10749, 18], "a love story across decades in paris"),
+    _movie(5, [27], "a haunted house terrorises a family"),
+]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_matrix(monkeypatch):
+    matrix = cr_mod.MovieFeatureMatrix()
+    matrix.add_movies(CATALOG)
+    monkeypatch.setattr(cr_mod, "feature_matrix", matrix)
+    return matrix
+
+
+# ---------------------------------------------------------------------------
+# Feature construction
+# ---------------------------------------------------------------------------
+def test_build_feature_vector_shape_and_genres():
+    vector = cr_mod.build_feature_vector(_movie(9, [28, 12]))
+
+    assert vector.shape == (cr_mod.FEATURE_DIMENSIONS,)
+    assert vector[cr_mod.GENRE_INDEX[28]] > 0
+    assert vector[cr_mod.GENRE_INDEX[12]] > 0
+    assert vector[cr_mod.GENRE_INDEX[35]] == 0
+
+
+def test_build_feature_vector_reads_detail_genres():
+    movie = Movie(id=9, title="Detail", genres=[{"id": 18, "name": "Drama"}])
+    vector = cr_mod.build_feature_vector(movie)
+
+    assert vector[cr_mod.GENRE_INDEX[18]] > 0
+
+
+def test_build_user_weights_ratings_and_lists():
+    user = _user(
+        favorite_movies=[1],
+        watchlist=[3],
+        ratings=[RatingEntry(movie_id=5, rating=1), RatingEntry(movie_id=2, rating=10)],
+    )
+    weights = cr_mod.build_user_weights(user)
+
+    assert weights[1] == cr_mod.FAVORITE_WEIGHT
+    assert weights[3] == cr_mod.WATCHLIST_WEIGHT
+    assert weights[5] < 0 < weights[2]
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+def test_top_k_ranks_similar_movies_first(_fresh_matrix):
+    profile = _fresh_matrix.profile_vector({1: 1.0})
+    top = _fresh_matrix.top_k(profile, 2, exclude={1})
+
+    assert len(top) == 2
+    assert top[0].id == 2
+    assert all(movie.id != 1 for movie in top)
+
+
+def test_top_k_excluding_everything_returns_empty(_fresh_matrix):
+    profile = _fresh_matrix.profile_vector({1: 1.0})
+
+    assert _fresh_matrix.top_k(profile, 5, exclude={1, 2, 3, 4, 5}) == []
+
+
+def test_profile_vector_unknown_ids_is_none(_fresh_matrix):
+    assert _fresh_matrix.profile_vector({999: 1.0}) is None
+
+
+def test_matrix_rows_are_normalised(_fresh_matrix):
+    matrix, _, _, _ = _fresh_matrix._snapshot()
+
+    assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0, atol=1e-5)
+
+
+# ---------------------------------------------------------------------------
+# recommend_similar_movies
+# ---------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_recommend_similar_movies_excludes_known(monkeypatch):
+    monkeypatch.setattr(
+        cr_mod, "fetch_multiple_movies_details", AsyncMock(return_value=[])
+    )
+    user = _user(favorite_movies=[3], ratings=[RatingEntry(movie_id=4, rating=9)])
+
+    movies = await cr_mod.recommend_similar_movies(user, limit=2)
+
+    assert len(movies) == 2
+    assert {3, 4}.isdisjoint(movie.id for movie in movies)
+    cr_mod.fetch_multiple_movies_details.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_recommend_similar_movies_fetches_missing_movies(monkeypatch):
+    fetched = _movie(42, [27], "a haunted asylum")
+    mock_fetch = AsyncMock(return_value=[fetched])
+    monkeypatch.setattr(cr_mod, "fetch_multiple_movies_details", mock_fetch)
+
+    movies = await cr_mod.recommend_similar_movies(_user(favorite_movies=[42]))
+
+    mock_fetch.assert_awaited_once_with([42])
+    assert movies[0].id == 5
+    # Scored for this user only; the shared catalog doesn't grow
+    assert 42 not in cr_mod.feature_matrix
+
+
+@pytest.mark.asyncio
+async def test_recommend_similar_movies_caps_the_profile(monkeypatch):
+    mock_fetch = AsyncMock(return_value=[])
+    monkeypatch.setattr(cr_mod, "fetch_multiple_movies_details", mock_fetch)
+    monkeypatch.setattr(cr_mod, "MAX_PROFILE_MOVIES", 3)
+    user = _user(
+        favorite_movies=[100, 101],
+        ratings=[RatingEntry(movie_id=200 + i, rating=6 + i % 5) for i in range(500)],
+    )
+
+    await cr_mod.recommend_similar_movies(user)
+
+    # Newest favorite first, then the strongest, newest rating
+    mock_fetch.assert_awaited_once_with([101, 100, 699])
+
+
+@pytest.mark.asyncio
+async def test_recommend_similar_movies_new_user_returns_empty():
+    assert await cr_mod.recommend_similar_movies(_user()) == []
@@ -0,0 +1,106 @@
+# tests/services/test_http_cache_service.py
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import pytest
+
+import app.services.http_cache as http_cache_mod
+from app.services.http_cache import HTTPCacheMiddleware, compute_etag, etag_matches
+
+
+@pytest.fixture
+def api():
+    app = FastAPI()
+    app.state.calls = 0
+    app.state.genres = [{"id": 28, "name": "Action"}]
+
+    @app.get("/movies/genres")
+    async def genres():
+        app.state.calls += 1
+        return {"genres": app.state.genres}
+
+    @app.get("/movies/{movie_id}/cast")
+    async def cast(movie_id: int):
+        app.state.calls += 1
+        return {"movie_id": movie_id, "cast": []}
+
+    @app.get("/movies/search")
+    async def search(query: str):
+        return {"movies": []}
+
+    app.add_middleware(HTTPCacheMiddleware)
+
+    return app
+
+
+def test_etag_helpers():
+    etag = compute_etag(b"{}")
+
+    assert etag == compute_etag(b"{}") != compute_etag(b"{ }")
+    assert etag.startswith(b'"') and etag.endswith(b'"')
+    assert etag_matches(b'"other", ' + etag, etag)
+    assert etag_matches(b"*", etag)
+    assert not etag_matches(b'"other"', etag)
+
+
+def test_policy_routes_get_validators(api):
+    client = TestClient(api)
+
+    response = client.get("/movies/genres")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=86400"
+    assert response.headers["etag"] == compute_etag(response.content).decode()
+    assert response.json() == {"genres": [{"id": 28, "name": "Action"}]}
+
+    uncached = client.get("/movies/search?query=x")
+    assert "etag" not in uncached.headers
+    assert "cache-control" not in uncached.headers
+
+    # Errors are not cacheable
+    invalid = client.get("/movies/abc/cast")
+    assert invalid.status_code == 422
+    assert "etag" not in invalid.headers
+
+
+def test_revalidation_within_max_age_skips_the_endpoint(api):
+    client = TestClient(api)
+    etag = client.get("/movies/1/cast").headers["etag"]
+    assert api.state.calls == 1
+
+    response = client.get("/movies/1/cast", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert api.state.calls == 1
+
+    # Another URL of the same route is validated on its own
+    response = client.get("/movies/2/cast", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert api.state.calls == 2
+
+
+def test_expired_memo_revalidates_against_the_body(api, monkeypatch):
+    client = TestClient(api)
+    now = [1000.0]
+    monkeypatch.setattr(http_cache_mod.time, "monotonic", lambda: now[0])
+
+    etag = client.get("/movies/genres").headers["etag"]
+    now[0] += 86401
+
+    # Same body: still 304, but computed from a fresh response
+    response = client.get("/movies/genres", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert "vary" not in response.headers
+    assert api.state.calls == 2
+
+    now[0] += 86401
+    api.state.genres = [{"id": 35, "name": "Comedy"}]
+    response = client.get("/movies/genres", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_disabled(api, monkeypatch):
+    monkeypatch.setattr(http_cache_mod.settings, "HTTP_CACHE_ENABLED", False)
+
+    assert "etag" not in TestClient(api).get("/movies/genres").headers
@@ -0,0 +1,84 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.services import metrics
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "url, endpoint",
+    [
+        ("https://api.themoviedb.org/3/movie/popular?api_key=k&page=2", "/movie/popular"),
+        ("https://api.themoviedb.org/3/movie/550/credits?api_key=k", "/movie/{id}/credits"),
+        ("https://api.themoviedb.org/3/movie/550", "/movie/{id}"),
+        ("https://api.themoviedb.org/3/search/movie?query=2001", "/search/movie"),
+        ("https://api.themoviedb.org/3/review/5b1c3f9ec3a36848f8005f1e?api_key=k", "/review/{id}"),
+    ],
+)
+def test_tmdb_endpoint_templates_ids(monkeypatch, url, endpoint):
+    monkeypatch.setattr(metrics.settings, "BASE_URL", "https://api.themoviedb.org/3")
+
+    assert metrics.tmdb_endpoint(url) == endpoint
+
+
+def test_record_cache_lookup_counts_hits_and_misses():
+    before_hit = _sample("cache_lookups_total", cache="test", result="hit")
+    before_miss = _sample("cache_lookups_total", cache="test", result="miss")
+
+    metrics.record_cache_lookup("test", True)
+    metrics.record_cache_lookup("test", False)
+    metrics.record_cache_lookup("test", False)
+
+    assert _sample("cache_lookups_total", cache="test", result="hit") == before_hit + 1
+    assert _sample("cache_lookups_total", cache="test", result="miss") == before_miss + 2
+
+
+@pytest.mark.asyncio
+async def test_track_mongo_latency_sync_and_async():
+    @metrics.track_mongo_latency
+    def find_thing():
+        return 1
+
+    @metrics.track_mongo_latency
+    async def update_thing():
+        return 2
+
+    assert find_thing() == 1
+    assert await update_thing() == 2
+    assert _sample("mongo_operation_duration_seconds_count", function="find_thing") == 1
+    assert _sample("mongo_operation_duration_seconds_count", function="update_thing") == 1
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+def test_middleware_labels_by_route_template():
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/things/{thing_id}")
+    def read_thing(thing_id: int):
+        return {"id": thing_id}
+
+    client = TestClient(app)
+    labels = {"method": "GET", "route": "/things/{thing_id}"}
+    before = _sample("http_request_duration_seconds_count", status="200", **labels)
+
+    client.get("/things/1")
+    client.get("/things/2")
+    client.get("/nowhere")
+
+    assert _sample("http_request_duration_seconds_count", status="200", **labels) == before + 2
+    assert _sample("http_response_size_bytes_sum", **labels) > 0
+    assert _sample(
+        "http_request_duration_seconds_count", method="GET", route="unmatched", status="404"
+    ) >= 1
+    assert _sample("http_requests_in_flight") == 0
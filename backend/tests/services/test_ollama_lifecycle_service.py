@@ -0,0 +1,95 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+import app.services.ollama_lifecycle as lifecycle_mod
+from app.core.config import settings
+
+
+def _response(status: int, payload: dict = None) -> httpx.Response:
+    return httpx.Response(
+        status, json=payload or {}, request=httpx.Request("GET", "http://ollama")
+    )
+
+
+def test_native_url_strips_openai_suffix():
+    assert not lifecycle_mod.OLLAMA_NATIVE_URL.endswith("/v1")
+
+
+# ---------------------------------------------------------------------------
+# load_model / warm-up / keep-alive
+# ---------------------------------------------------------------------------
+@patch.object(lifecycle_mod.httpx, "post")
+def test_load_model_sends_model_and_keep_alive(mock_post):
+    mock_post.return_value = _response(200)
+
+    assert lifecycle_mod.load_model(keep_alive="1h") is True
+
+    url = mock_post.call_args.args[0]
+    assert url == f"{lifecycle_mod.OLLAMA_NATIVE_URL}/api/generate"
+    assert mock_post.call_args.kwargs["json"] == {
+        "model": settings.MODEL_ID,
+        "keep_alive": "1h",
+    }
+
+
+@patch.object(lifecycle_mod.httpx, "post")
+def test_load_model_connection_error_returns_false(mock_post):
+    mock_post.side_effect = httpx.ConnectError("down")
+
+    assert lifecycle_mod.load_model() is False
+
+
+@patch.object(lifecycle_mod.httpx, "post")
+def test_load_model_http_error_returns_false(mock_post):
+    mock_post.return_value = _response(404)
+
+    assert lifecycle_mod.load_model() is False
+
+
+@patch.object(lifecycle_mod.httpx, "post")
+def test_keep_model_alive_pings_ollama(mock_post):
+    mock_post.return_value = _response(200)
+
+    lifecycle_mod.keep_model_alive()
+
+    mock_post.assert_called_once()
+    assert (
+        mock_post.call_args.kwargs["json"]["keep_alive"] == settings.OLLAMA_KEEP_ALIVE
+    )
+
+
+# ---------------------------------------------------------------------------
+# is_model_resident
+# ---------------------------------------------------------------------------
+def _patch_async_client(monkeypatch, get):
+    client = MagicMock()
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+    client.get = get
+    monkeypatch.setattr(lifecycle_mod.httpx, "AsyncClient", lambda **kw: client)
+
+
+@pytest.mark.asyncio
+async def test_is_model_resident_true_when_listed(monkeypatch):
+    _patch_async_client(
+        monkeypatch,
+        AsyncMock(return_value=_response(200, {"models": [{"name": settings.MODEL_ID}]})),
+    )
+
+    assert await lifecycle_mod.is_model_resident() is True
+
+
+@pytest.mark.asyncio
+async def test_is_model_resident_false_when_unloaded(monkeypatch):
+    _patch_async_client(monkeypatch, AsyncMock(return_value=_response(200, {"models": []})))
+
+    assert await lifecycle_mod.is_model_resident() is False
+
+
+@pytest.mark.asyncio
+async def test_is_model_resident_false_when_unreachable(monkeypatch):
+    _patch_async_client(monkeypatch, AsyncMock(side_effect=httpx.ConnectError("down")))
+
+    assert await lifecycle_mod.is_model_resident() is False
@@ -0,0 +1,182 @@
+# tests/services/test_prefetch_service.py
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import app.services.prefetch as prefetch_mod
+import app.services.tmdb as tmdb_mod
+from app.services.prefetch import PageCache, Prefetcher, UpstreamPressure
+
+
+def _page(count=20):
+    return [{"id": i, "title": f"Movie {i}"} for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def _settings(monkeypatch):
+    monkeypatch.setattr(prefetch_mod.settings, "PREFETCH_ENABLED", True)
+    monkeypatch.setattr(prefetch_mod.settings, "PREFETCH_MAX_PENDING", 2)
+    monkeypatch.setattr(prefetch_mod.settings, "PREFETCH_MAX_UPSTREAM_IN_FLIGHT", 4)
+    monkeypatch.setattr(prefetch_mod.settings, "PREFETCH_BACKOFF_SECONDS", 30)
+
+
+def test_page_cache_expires_and_evicts(monkeypatch):
+    cache = PageCache(max_entries=2, ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr(prefetch_mod.time, "monotonic", lambda: now[0])
+
+    cache.put("a", [1])
+    cache.put("b", [2])
+    assert cache.get("a") == [1]
+
+    # "b" is now the least recently used
+    cache.put("c", [3])
+    assert "b" not in cache
+    assert "a" in cache
+
+    now[0] += 11
+    assert cache.get("a") is None
+
+
+def test_pressure_tracks_in_flight_and_backs_off(monkeypatch):
+    pressure = UpstreamPressure()
+
+    for _ in range(4):
+        pressure.started()
+    assert pressure.is_high()
+
+    for _ in range(4):
+        pressure.finished("200")
+    assert not pressure.is_high()
+
+    pressure.started()
+    pressure.finished("429")
+    assert pressure.is_high()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_deduplicated_bounded_and_reused():
+    release = asyncio.Event()
+    calls = []
+
+    async def load(key):
+        calls.append(key)
+        await release.wait()
+        return _page()
+
+    prefetcher = Prefetcher(load, PageCache(16, 60), UpstreamPressure())
+
+    assert prefetcher.prefetch("p2")
+    assert not prefetcher.prefetch("p2")
+    assert prefetcher.prefetch("p3")
+    assert not prefetcher.prefetch("p4")
+
+    # Requesting a page being prefetched waits for that request
+    waiting = asyncio.create_task(prefetcher.get("p2"))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await waiting == _page()
+    assert calls == ["p2", "p3"]
+    assert await prefetcher.get("p3") == _page()
+    assert prefetcher.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    release = asyncio.Event()
+    calls = []
+
+    async def load(key):
+        calls.append(key)
+        await release.wait()
+        if key == "broken":
+            raise RuntimeError("TMDB unavailable")
+        return _page()
+
+    prefetcher = Prefetcher(load, PageCache(16, 60), UpstreamPressure())
+
+    pages = [asyncio.create_task(prefetcher.get("p1")) for _ in range(5)]
+    broken = [asyncio.create_task(prefetcher.get("broken")) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*pages) == [_page()] * 5
+    for outcome in await asyncio.gather(*broken, return_exceptions=True):
+        assert isinstance(outcome, RuntimeError)
+    assert calls == ["p1", "broken"]
+    assert prefetcher.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_from_another_event_loop_is_not_awaited_here():
+    import threading
+
+    started = threading.Event()
+    release = threading.Event()
+
+    async def load(key):
+        started.set()
+        await asyncio.get_running_loop().run_in_executor(None, release.wait)
+        return _page()
+
+    prefetcher = Prefetcher(load, PageCache(16, 60), UpstreamPressure())
+
+    async def scheduler_job():
+        # Like a job driving its own loop with asyncio.run in a worker thread
+        assert prefetcher.prefetch("p2")
+        await asyncio.sleep(0)
+        await prefetcher.get("p2")
+
+    worker = threading.Thread(target=lambda: asyncio.run(scheduler_job()))
+    worker.start()
+    await asyncio.get_running_loop().run_in_executor(None, started.wait)
+
+    # The other loop's prefetch is running; this loop loads the page itself
+    # instead of awaiting a task attached to that loop
+    release.set()
+    assert await prefetcher.get("p2") == _page()
+
+    await asyncio.get_running_loop().run_in_executor(None, worker.join)
+    assert prefetcher.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_holds_back_under_upstream_pressure():
+    pressure = UpstreamPressure()
+    pressure.finished("503")
+    prefetcher = Prefetcher(AsyncMock(return_value=_page()), PageCache(16, 60), pressure)
+
+    assert not prefetcher.prefetch("p2")
+    prefetcher.load.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_popular_pages_read_ahead(mock_req, monkeypatch):
+    monkeypatch.setattr(
+        tmdb_mod,
+        "page_prefetcher",
+        Prefetcher(tmdb_mod._fetch_results, PageCache(16, 60), UpstreamPressure()),
+    )
+    mock_req.return_value = {"results": _page()}
+
+    await tmdb_mod.fetch_popular_movies(1)
+    await asyncio.sleep(0.01)
+
+    assert [call.args[0] for call in mock_req.await_args_list] == [
+        tmdb_mod.popular_movies_url(1),
+        tmdb_mod.popular_movies_url(2),
+    ]
+
+    # Page 2 comes from the cache; page 3 is read ahead in turn
+    await tmdb_mod.fetch_popular_movies(2)
+    await asyncio.sleep(0.01)
+    assert mock_req.await_count == 3
+
+    # Nothing is read ahead past a short (last) page
+    mock_req.return_value = {"results": _page(5)}
+    await tmdb_mod.fetch_movies_by_genre(28, 7)
+    await asyncio.sleep(0.01)
+    assert mock_req.await_count == 4
@@ -0,0 +1,151 @@
+import sys
+import threading
+import time
+from collections import Counter
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.endpoints import admin
+from app.services import profiler
+
+
+@pytest.fixture(autouse=True)
+def _profile_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiler.settings, "PROFILING_OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(profiler.settings, "PROFILING_ENABLED", False)
+    monkeypatch.setattr(profiler.settings, "PROFILING_INTERVAL_MS", 1)
+    monkeypatch.setattr(profiler.settings, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(profiler.settings, "ALGORITHM", "HS256")
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(profiler.ProfilingMiddleware)
+    app.include_router(admin.router, prefix="/admin")
+
+    @app.get("/slow/{item_id}")
+    def slow(item_id: int):
+        _busy(0.05)
+        return {"id": item_id}
+
+    return app
+
+
+def _scope(token=None):
+    headers = [(b"x-profile-token", token.encode())] if token else []
+    return {"type": "http", "headers": headers}
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+def test_fold_stack_is_root_first():
+    def inner():
+        return profiler.fold_stack(sys._getframe())
+
+    stack = inner()
+
+    assert stack.endswith("test_fold_stack_is_root_first;" + __name__ + ".test_fold_stack_is_root_first.<locals>.inner")
+
+
+def test_sampler_captures_target_thread():
+    worker = threading.Thread(target=_busy, args=(0.1,))
+    worker.start()
+    sampler = profiler.StackSampler(worker.ident, 0.001)
+    sampler.start()
+    worker.join()
+    samples = sampler.stop()
+
+    assert any(stack.endswith(f"{__name__}._busy") for stack in samples)
+
+
+def test_sampler_skips_idle_threads():
+    stop = threading.Event()
+    idle = threading.Thread(target=stop.wait)
+    idle.start()
+    sampler = profiler.StackSampler(threading.get_ident(), 0.001)
+    sampler.start()
+    time.sleep(0.05)
+    samples = sampler.stop()
+    stop.set()
+    idle.join()
+
+    assert samples
+    assert not any("Event.wait" in stack for stack in samples)
+
+
+# ---------------------------------------------------------------------------
+# Decision + storage
+# ---------------------------------------------------------------------------
+def test_should_profile_needs_signed_token_or_sampling(monkeypatch):
+    assert not profiler.should_profile(_scope())
+    assert not profiler.should_profile(_scope("forged"))
+    assert profiler.should_profile(_scope(profiler.create_profiling_token()))
+
+    monkeypatch.setattr(profiler.settings, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiler.settings, "PROFILING_SAMPLE_RATE", 1.0)
+    assert profiler.should_profile(_scope())
+
+
+def test_token_script_mints_a_profiling_token(capsys):
+    from app.scripts import profiling_token
+
+    profiling_token.main(["--expires-minutes", "5"])
+
+    assert profiler.should_profile(_scope(capsys.readouterr().out.strip()))
+
+
+def test_write_profile_prunes_oldest(monkeypatch):
+    monkeypatch.setattr(profiler.settings, "PROFILING_MAX_FILES", 2)
+
+    for i in range(3):
+        profiler.write_profile(Counter({"a;b": 3}), "GET", "/movies/{id}", 10)
+        time.sleep(0.002)
+
+    profiles = profiler.list_profiles()
+    assert len(profiles) == 2
+    assert "_GET_movies_id_10ms.folded" in profiles[0].name
+    assert profiler.find_profile(profiles[0].name).read_text() == "a;b 3\n"
+
+
+def test_find_profile_rejects_paths():
+    assert profiler.find_profile("../secrets.folded") is None
+    assert profiler.find_profile("profile.txt") is None
+
+
+# ---------------------------------------------------------------------------
+# Middleware + admin endpoints
+# ---------------------------------------------------------------------------
+def test_signed_request_is_profiled_and_downloadable(monkeypatch):
+    # The sync endpoint runs in the thread pool, as application code
+    monkeypatch.setattr(profiler, "APP_MODULE_PREFIX", f"{__name__}.")
+    client = TestClient(_app())
+    headers = {"X-Profile-Token": profiler.create_profiling_token()}
+
+    assert client.get("/slow/1").status_code == 200
+    assert profiler.list_profiles() == []
+
+    client.get("/slow/1", headers=headers)
+    listing = client.get("/admin/profiles", headers=headers).json()["profiles"]
+
+    assert len(listing) == 1
+    assert "_GET_slow_item_id_" in listing[0]["name"]
+
+    download = client.get(f"/admin/profiles/{listing[0]['name']}", headers=headers)
+    assert download.status_code == 200
+    assert f"{__name__}._busy" in download.text
+
+
+def test_admin_endpoints_require_token():
+    client = TestClient(_app())
+
+    assert client.get("/admin/profiles").status_code == 403
+    assert client.get("/admin/profiles", headers={"X-Profile-Token": "nope"}).status_code == 403
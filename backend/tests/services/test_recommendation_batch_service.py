@@ -0,0 +1,141 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import mongomock
+import pytest
+
+import app.services.recommendation_batch as batch_mod
+from app.schemas.recommendation import RecommendedMovie
+from app.schemas.user import User
+
+RECS = [RecommendedMovie(title="Heat", year=1995)]
+
+
+@pytest.fixture(autouse=True)
+def _mongo(monkeypatch):
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr(batch_mod, "users_collection", db.users)
+    monkeypatch.setattr(batch_mod, "recommendations_collection", db.recommendations)
+    return db
+
+
+def _user(user_id: str, **overrides) -> User:
+    base = dict(
+        id=user_id,
+        username=f"user_{user_id}",
+        email=f"{user_id}@example.com",
+        is_verified=True,
+        favorite_movies=[1],
+    )
+    base.update(overrides)
+    return User(**base)
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+def test_store_and_find_roundtrip():
+    user = _user("a")
+    batch_mod.store_recommendations(user, RECS)
+
+    assert batch_mod.find_precomputed_recommendations(user) == RECS
+
+
+def test_find_ignores_changed_profile():
+    batch_mod.store_recommendations(_user("a"), RECS)
+
+    assert batch_mod.find_precomputed_recommendations(_user("a", watchlist=[9])) == []
+
+
+def test_find_ignores_stale_entries(_mongo):
+    user = _user("a")
+    batch_mod.store_recommendations(user, RECS)
+    _mongo.recommendations.update_one(
+        {"user_id": "a"},
+        {"$set": {"updated_at": datetime.now(timezone.utc) - timedelta(days=30)}},
+    )
+
+    assert batch_mod.find_precomputed_recommendations(user) == []
+
+
+def test_batch_concurrency_keeps_interactive_slots(monkeypatch):
+    monkeypatch.setattr(batch_mod.settings, "OLLAMA_NUM_PARALLEL", 4)
+    monkeypatch.setattr(batch_mod.settings, "RECOMMENDATION_BATCH_RESERVED_SLOTS", 1)
+    assert batch_mod.batch_concurrency() == 3
+
+    monkeypatch.setattr(batch_mod.settings, "OLLAMA_NUM_PARALLEL", 1)
+    assert batch_mod.batch_concurrency() == 1
+
+
+# ---------------------------------------------------------------------------
+# Batch refresh
+# ---------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_refresh_recommendations_bounded_concurrency(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def fake_generate(user, use_cache=True):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [] if user.id == "u3" else RECS
+
+    monkeypatch.setattr(
+        batch_mod,
+        "generate_enhanced_movie_recommendations",
+        AsyncMock(side_effect=fake_generate),
+    )
+
+    stats = await batch_mod.refresh_recommendations(
+        [_user(f"u{i}") for i in range(10)], concurrency=3
+    )
+
+    assert peak == 3
+    assert stats["users"] == 10 and stats["refreshed"] == 9
+    assert stats["users_per_minute"] > 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_recommendations_survives_a_failing_user(monkeypatch, _mongo):
+    async def fake_generate(user, use_cache=True):
+        if user.id == "u1":
+            raise RuntimeError("model unavailable")
+        return RECS
+
+    monkeypatch.setattr(
+        batch_mod,
+        "generate_enhanced_movie_recommendations",
+        AsyncMock(side_effect=fake_generate),
+    )
+
+    stats = await batch_mod.refresh_recommendations(
+        [_user(f"u{i}") for i in range(4)], concurrency=2
+    )
+
+    assert stats["users"] == 4
+    assert stats["refreshed"] == 3 and stats["failed"] == 1
+    assert _mongo.recommendations.count_documents({}) == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_all_recommendations_only_active_users(monkeypatch, _mongo):
+    _mongo.users.insert_many(
+        [
+            _user("active").model_dump(),
+            _user("new", favorite_movies=[]).model_dump(),
+            _user("unverified", is_verified=False).model_dump(),
+        ]
+    )
+    generate = AsyncMock(return_value=RECS)
+    monkeypatch.setattr(batch_mod, "generate_enhanced_movie_recommendations", generate)
+
+    stats = await batch_mod.refresh_all_recommendations()
+
+    assert stats["users"] == 1
+    assert generate.await_args.args[0].id == "active"
+    assert generate.await_args.kwargs == {"use_cache": False}
+    assert _mongo.recommendations.count_documents({}) == 1
@@ -0,0 +1,89 @@
+import pytest
+
+import app.services.recommendation_cache as cache_mod
+from app.schemas.rating import RatingEntry
+from app.schemas.recommendation import RecommendedMovie
+from app.schemas.user import User
+
+RECS_A = [RecommendedMovie(title="Heat", year=1995)]
+RECS_B = [RecommendedMovie(title="Alien", year=1979)]
+
+
+@pytest.fixture
+def cache():
+    return cache_mod.RecommendationCache(
+        max_entries=3, ttl_seconds=60, min_similarity=0.6
+    )
+
+
+# ---------------------------------------------------------------------------
+# preference_signature
+# ---------------------------------------------------------------------------
+def test_preference_signature_newest_favorites_then_high_ratings(monkeypatch):
+    monkeypatch.setattr(cache_mod, "SIGNATURE_SIZE", 4)
+    user = User(
+        username="john",
+        email="john@example.com",
+        favorite_movies=[1, 2, 3],
+        ratings=[
+            RatingEntry(movie_id=10, rating=8),
+            RatingEntry(movie_id=11, rating=10),
+            RatingEntry(movie_id=12, rating=4),
+        ],
+    )
+
+    assert cache_mod.preference_signature(user) == frozenset({1, 2, 3, 11})
+
+
+def test_preference_signature_empty_for_new_user():
+    user = User(username="new", email="new@example.com")
+
+    assert cache_mod.preference_signature(user) == frozenset()
+
+
+# ---------------------------------------------------------------------------
+# RecommendationCache
+# ---------------------------------------------------------------------------
+def test_exact_signature_hit(cache):
+    cache.put(frozenset({1, 2, 3}), RECS_A)
+
+    assert cache.get(frozenset({3, 2, 1})) == RECS_A
+
+
+def test_similar_signature_served_from_neighbor(cache):
+    cache.put(frozenset({1, 2, 3, 4, 5}), RECS_A)
+    cache.put(frozenset({7, 8, 9}), RECS_B)
+
+    # Jaccard({1..4, 6}, {1..5}) = 4/6
+    assert cache.get(frozenset({1, 2, 3, 4, 6})) == RECS_A
+
+
+def test_dissimilar_signature_misses(cache):
+    cache.put(frozenset({1, 2, 3, 4}), RECS_A)
+
+    assert cache.get(frozenset({1, 9})) is None
+    assert cache.get(frozenset()) is None
+
+
+def test_expired_entries_are_dropped(cache, monkeypatch):
+    cache.put(frozenset({1, 2}), RECS_A)
+    now = cache_mod.time.monotonic()
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now + 61)
+
+    assert cache.get(frozenset({1, 2})) is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction_cleans_index(cache):
+    for movie_id in range(4):
+        cache.put(frozenset({movie_id, 100 + movie_id}), RECS_A)
+
+    assert len(cache) == 3
+    assert cache.get(frozenset({0, 100})) is None
+    assert 0 not in cache._index
+
+
+def test_empty_recommendations_not_cached(cache):
+    cache.put(frozenset({1}), [])
+
+    assert len(cache) == 0
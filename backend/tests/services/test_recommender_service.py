@@ -2,9 +2,25 @@ import json
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 
+from pydantic_ai import Agent
+from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+import app.services.ollama_recommender as recommender_mod
+from app.schemas.movie import Movie
+from app.schemas.rating import RatingEntry
+from app.schemas.recommendation import RecommendedMovie
+from app.schemas.user import User
+from app.services.tracing import start_trace
 from app.services.ollama_recommender import (
     parse_json_array,
     generate_movie_recommendations,
+    collect_new_recommendations,
+    run_structured_recommendations,
+    categorize_ratings,
+    diversify_by_genre,
+    select_prompt_titles,
+    build_enhanced_prompt,
+    estimate_tokens,
 )
 
 # -----------------------------------------------------------------------------
@@ -89,3 +105,194 @@ async def test_generate_movie_recommendations_invalid_json_returns_empty(
 
     movies = await generate_movie_recommendations(FAVOURITES)
     assert movies == []  # graceful fallback
+
+
+# -----------------------------------------------------------------------------
+# Structured output – dedup/filter and early stop
+# -----------------------------------------------------------------------------
+
+
+def test_collect_new_recommendations_filters_known_and_duplicates():
+    candidates = [
+        RecommendedMovie(title="Heat", year=1995),
+        RecommendedMovie(title="heat", year=1995),
+        RecommendedMovie(title="Inception", year=2010),
+        RecommendedMovie(title="  ", year=None),
+        RecommendedMovie(title="Alien", year=1979),
+    ]
+
+    result = collect_new_recommendations(candidates, ["INCEPTION"], limit=5)
+
+    assert [movie.title for movie in result] == ["Heat", "Alien"]
+
+
+def _streaming_agent(items, produced, ending="]}"):
+    """Agent whose model streams the output tool call one item at a time"""
+
+    async def stream_function(_messages, info):
+        tool_name = info.output_tools[0].name
+        yield {0: DeltaToolCall(name=tool_name, json_args='{"response": [')}
+
+        for index, item in enumerate(items):
+            produced.append(item["title"])
+            prefix = "," if index else ""
+            yield {0: DeltaToolCall(json_args=prefix + json.dumps(item))}
+
+        yield {0: DeltaToolCall(json_args=ending)}
+
+    return Agent(
+        FunctionModel(stream_function=stream_function),
+        output_type=list[RecommendedMovie],
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_structured_recommendations_stops_after_enough_items():
+    items = [{"title": f"Movie {i}", "year": 2000 + i} for i in range(40)]
+    produced = []
+
+    result = await run_structured_recommendations(
+        _streaming_agent(items, produced), "prompt", known_titles=[]
+    )
+
+    assert [movie.title for movie in result] == [f"Movie {i}" for i in range(20)]
+    assert result[0].year == 2000
+    # generation was abandoned long before the model finished all 40 items
+    assert len(produced) < 40
+
+
+@pytest.mark.asyncio
+async def test_run_structured_recommendations_short_stream_keeps_last_item():
+    items = [{"title": "Known", "year": 2001}, {"title": "Fresh", "year": 2002}]
+
+    result = await run_structured_recommendations(
+        _streaming_agent(items, []), "prompt", known_titles=["Known"]
+    )
+
+    assert [movie.title for movie in result] == ["Fresh"]
+
+
+@pytest.mark.asyncio
+async def test_run_structured_recommendations_keeps_items_of_cut_off_output():
+    items = [{"title": f"Movie {i}", "year": 2000 + i} for i in range(5)]
+
+    # max_tokens reached mid-item: the final validation of the output fails
+    result = await run_structured_recommendations(
+        _streaming_agent(items, [], ending=', {"title": "Cut o'),
+        "prompt",
+        known_titles=["Movie 1"],
+    )
+
+    assert [movie.title for movie in result] == ["Movie 0", "Movie 2", "Movie 3", "Movie 4"]
+
+
+@pytest.mark.asyncio
+async def test_run_structured_recommendations_records_llm_stages():
+    items = [{"title": f"Movie {i}", "year": 2000 + i} for i in range(3)]
+
+    with start_trace("test") as trace:
+        await run_structured_recommendations(
+            _streaming_agent(items, []), "prompt", known_titles=[]
+        )
+
+    stages = {stage.name: stage for stage in trace.stages}
+    assert list(stages) == ["llm_prefill", "llm_generation", "parse"]
+    assert stages["llm_generation"].attributes["response_tokens"] > 0
+    assert stages["parse"].attributes["recommendations"] == 3
+
+
+@pytest.mark.asyncio
+async def test_generate_enhanced_without_cache_runs_the_model(monkeypatch):
+    from app.services.recommendation_cache import RecommendationCache, preference_signature
+
+    user = User(username="john", email="john@example.com", favorite_movies=[1, 2])
+    cache = RecommendationCache(16, 3600, 0.5)
+    cache.put(preference_signature(user), [RecommendedMovie(title="Stale", year=1990)])
+    fresh = [RecommendedMovie(title="Fresh", year=2020)]
+    monkeypatch.setattr(recommender_mod, "recommendation_cache", cache)
+    monkeypatch.setattr(
+        recommender_mod,
+        "select_prompt_titles",
+        AsyncMock(return_value={key: ["Heat"] for key, _, _ in recommender_mod.PROMPT_SECTIONS}),
+    )
+    monkeypatch.setattr(
+        recommender_mod, "run_structured_recommendations", AsyncMock(return_value=fresh)
+    )
+
+    assert (await recommender_mod.generate_enhanced_movie_recommendations(user))[0].title == "Stale"
+    assert await recommender_mod.generate_enhanced_movie_recommendations(user, use_cache=False) == fresh
+    # The fresh output replaces the cached one
+    assert cache.get(preference_signature(user)) == fresh
+
+
+# -----------------------------------------------------------------------------
+# Prompt compaction
+# -----------------------------------------------------------------------------
+
+
+def test_categorize_ratings_orders_strongest_then_newest():
+    ratings = [
+        RatingEntry(movie_id=1, rating=8),
+        RatingEntry(movie_id=2, rating=10),
+        RatingEntry(movie_id=3, rating=8),
+        RatingEntry(movie_id=4, rating=3),
+        RatingEntry(movie_id=5, rating=1),
+        RatingEntry(movie_id=6, rating=7),
+    ]
+
+    categories = categorize_ratings(ratings)
+
+    assert categories["high_rated"] == [2, 3, 1]
+    assert categories["medium_rated"] == [6]
+    assert categories["low_rated"] == [5, 4]
+
+
+def test_diversify_by_genre_round_robins():
+    movies = [
+        Movie(id=1, title="A1", genre_ids=[28]),
+        Movie(id=2, title="A2", genre_ids=[28]),
+        Movie(id=3, title="A3", genre_ids=[28]),
+        Movie(id=4, title="D1", genres=[{"id": 18, "name": "Drama"}]),
+        Movie(id=5, title="C1", genre_ids=[35]),
+    ]
+
+    assert [m.title for m in diversify_by_genre(movies)] == [
+        "A1", "D1", "C1", "A2", "A3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_select_prompt_titles_respects_budget(monkeypatch):
+    async def fake_details(movie_ids):
+        return [
+            Movie(id=mid, title=f"Some Fairly Long Movie Title {mid}", genre_ids=[mid % 5])
+            for mid in movie_ids
+        ]
+
+    fetch = AsyncMock(side_effect=fake_details)
+    monkeypatch.setattr(recommender_mod, "fetch_multiple_movies_details", fetch)
+    user = User(
+        username="heavy",
+        email="heavy@example.com",
+        favorite_movies=list(range(1, 301)),
+        ratings=[RatingEntry(movie_id=1000 + i, rating=1 + i % 10) for i in range(500)],
+    )
+
+    sections = await select_prompt_titles(user, token_budget=300)
+    prompt = build_enhanced_prompt(sections)
+
+    assert estimate_tokens(prompt) <= 300
+    assert sections["favorites"][0] == "Some Fairly Long Movie Title 300"  # newest first
+    # only a budget-sized sample was looked up, not all 800 movies
+    assert sum(len(call.args[0]) for call in fetch.await_args_list) < 200
+
+
+def test_build_enhanced_prompt_has_no_do_not_recommend_list():
+    prompt = build_enhanced_prompt(
+        {"favorites": ["Heat"], "high_rated": ["Alien"], "watchlist": []}
+    )
+
+    assert "FAVORITE MOVIES: Heat" in prompt
+    assert "HIGHLY RATED MOVIES (8-10/10): Alien" in prompt
+    assert "DO NOT RECOMMEND" not in prompt
+    assert "WATCHLIST" not in prompt
@@ -0,0 +1,211 @@
+# tests/services/test_search_index_service.py
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import app.services.search_index as search_index_mod
+import app.services.tmdb as tmdb_mod
+from app.services.search_index import MovieSearchIndex, normalize, tokenize
+
+
+def _movie(movie_id, title, release_date="2000-01-01", popularity=10.0, **extra):
+    return {
+        "id": movie_id,
+        "title": title,
+        "release_date": release_date,
+        "popularity": popularity,
+        **extra,
+    }
+
+
+@pytest.fixture
+def index():
+    index = MovieSearchIndex(max_movies=100)
+    for movie in [
+        _movie(1, "The Matrix", "1999-03-31", 80),
+        _movie(2, "The Matrix Reloaded", "2003-05-15", 50),
+        _movie(3, "Amélie", "2001-04-25", 30, original_title="Le Fabuleux Destin d'Amélie Poulain"),
+        _movie(4, "Matilda", "1996-08-02", 20),
+        _movie(5, "Dune", "1984-12-14", 15),
+        _movie(6, "Dune", "2021-09-15", 90),
+    ]:
+        index.add(movie)
+    return index
+
+
+def test_tokenize_strips_accents_and_punctuation():
+    assert normalize("Amélie") == "amelie"
+    assert tokenize("Spider-Man: No Way Home") == ["spider", "man", "no", "way", "home"]
+    assert tokenize(None) == []
+
+
+def test_exact_words_rank_by_popularity(index):
+    hits = index.search("matrix")
+
+    assert [hit.movie["id"] for hit in hits] == [1, 2]
+    assert all(hit.score == 1.0 for hit in hits)
+
+
+def test_last_word_matches_as_prefix(index):
+    hits = index.search("the matr")
+
+    assert {hit.movie["id"] for hit in hits} == {1, 2}
+    assert hits[0].score == pytest.approx(0.9)
+
+    # Earlier words have to be complete
+    assert index.search("mat reloaded") == []
+
+
+def test_typos_match_with_lower_score(index):
+    hits = index.search("matirx")
+
+    assert [hit.movie["id"] for hit in hits] == [1, 2]
+    assert hits[0].score == search_index_mod.TYPO_SCORE
+
+
+def test_original_titles_and_years_are_searchable(index):
+    assert [hit.movie["id"] for hit in index.search("fabuleux destin")] == [3]
+    assert [hit.movie["id"] for hit in index.search("amelie")] == [3]
+    assert [hit.movie["id"] for hit in index.search("dune 1984")] == [5]
+
+
+def test_find_title_prefers_year_then_popularity(index):
+    assert index.find_title("dune")["id"] == 6
+    assert index.find_title("Dune", 1984)["id"] == 5
+    assert index.find_title("Dune", 1990) is None
+    assert index.find_title("Amelie")["id"] == 3
+
+
+def test_add_refreshes_known_movies_and_respects_capacity():
+    index = MovieSearchIndex(max_movies=1)
+
+    assert index.add(_movie(1, "Heat", popularity=5))
+    assert not index.add(_movie(1, "Heat", popularity=25))
+    assert index.movies[1]["popularity"] == 25
+    assert not index.add(_movie(2, "Ronin"))
+    assert not index.add({"id": 3})
+    assert len(index) == 1
+
+
+def test_confidence_needs_every_upstream_result_matched_exactly(index):
+    assert search_index_mod.is_confident(index.search("matrix"), 2)
+    # TMDB knows more movies than the index holds
+    assert not search_index_mod.is_confident(index.search("matrix"), 3)
+    # TMDB hasn't reported a total for the query
+    assert not search_index_mod.is_confident(index.search("matrix"), None)
+    assert not search_index_mod.is_confident(index.search("matirx"), 2)
+    # Prefix matches of a common word are not enough
+    assert not search_index_mod.is_confident(index.search("mat"), 2)
+
+
+def test_search_keeps_a_query_on_one_source_for_all_pages(monkeypatch, index):
+    for movie_id in range(10, 35):
+        index.add(_movie(movie_id, f"Dune Part {movie_id}", popularity=movie_id))
+    monkeypatch.setattr(tmdb_mod, "movie_index", index)
+    monkeypatch.setattr(tmdb_mod, "_search_sources", tmdb_mod.OrderedDict())
+    monkeypatch.setattr(tmdb_mod, "_search_totals", tmdb_mod.OrderedDict())
+    monkeypatch.setattr(tmdb_mod.settings, "SEARCH_INDEX_ENABLED", True)
+    tmdb_mod.record_search_total("dune", 27)
+
+    first, total_pages = tmdb_mod.search_local_index("dune", 1)
+    second, _ = tmdb_mod.search_local_index("Dune", 2)
+
+    assert total_pages == 2
+    assert len(first) == 20 and len(second) == 7
+    assert not {movie["id"] for movie in first} & {movie["id"] for movie in second}
+    assert tmdb_mod.search_local_index("dune", 3) == ([], 2)
+
+    # A query TMDB answered stays with TMDB, even once the index could answer it
+    assert tmdb_mod.search_local_index("heat", 1) is None
+    for movie_id in range(40, 46):
+        index.add(_movie(movie_id, "Heat"))
+    tmdb_mod.record_search_total("heat", 6)
+    assert tmdb_mod.search_local_index("heat", 2) is None
+
+
+def test_search_stays_with_tmdb_while_the_index_is_missing_results(monkeypatch, index):
+    for movie_id in range(10, 15):
+        index.add(_movie(movie_id, f"Love Story {movie_id}"))
+    monkeypatch.setattr(tmdb_mod, "movie_index", index)
+    monkeypatch.setattr(tmdb_mod, "_search_sources", tmdb_mod.OrderedDict())
+    monkeypatch.setattr(tmdb_mod, "_search_totals", tmdb_mod.OrderedDict())
+    monkeypatch.setattr(tmdb_mod.settings, "SEARCH_INDEX_ENABLED", True)
+
+    # Unknown total, then far more results upstream than indexed
+    assert tmdb_mod.search_local_index("love", 1) is None
+    tmdb_mod.record_search_total("love story", 3400)
+    assert tmdb_mod.search_local_index("Love Story", 1) is None
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "search_movies", new_callable=AsyncMock)
+async def test_find_movie_by_title_uses_index_before_tmdb(mock_search, monkeypatch, index):
+    monkeypatch.setattr(tmdb_mod, "movie_index", index)
+    monkeypatch.setattr(tmdb_mod.settings, "SEARCH_INDEX_ENABLED", True)
+
+    movie = await tmdb_mod.find_movie_by_title("The Matrix", 1999)
+    assert movie.id == 1
+    mock_search.assert_not_awaited()
+
+    mock_search.side_effect = [[], [tmdb_mod.Movie(id=7, title="Heat")]]
+    movie = await tmdb_mod.find_movie_by_title("Heat", 1995)
+    assert movie.id == 7
+    assert mock_search.await_count == 2
+
+
+def test_suggest_prefers_title_starts_then_popularity(index):
+    index.add(_movie(7, "Enter the Matrix", "2003-01-01", 99))
+
+    assert [movie["id"] for movie in index.suggest("matr")] == [7, 1, 2]
+    assert [movie["id"] for movie in index.suggest("the mat")] == [1, 2, 7]
+    assert [movie["id"] for movie in index.suggest("du", limit=1)] == [6]
+    assert [movie["id"] for movie in index.suggest("AMÉ")] == [3]
+    assert index.suggest("  ") == []
+    assert index.suggest("zzz") == []
+
+
+@pytest.fixture
+def _fresh_refills(monkeypatch):
+    monkeypatch.setattr(tmdb_mod, "_pending_suggestion_refills", {})
+    monkeypatch.setattr(tmdb_mod, "_recent_suggestion_refills", tmdb_mod.OrderedDict())
+    monkeypatch.setattr(tmdb_mod.settings, "SUGGEST_DEBOUNCE_MS", 10)
+    monkeypatch.setattr(tmdb_mod.settings, "SUGGEST_MIN_UPSTREAM_CHARS", 3)
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "search_movies", new_callable=AsyncMock)
+async def test_suggest_returns_small_payload_without_waiting_on_tmdb(
+    mock_search, monkeypatch, index, _fresh_refills
+):
+    monkeypatch.setattr(tmdb_mod, "movie_index", index)
+
+    suggestions = tmdb_mod.suggest_movies("matrix", 2)
+
+    assert [s.model_dump() for s in suggestions] == [
+        {"id": 1, "title": "The Matrix", "year": 1999},
+        {"id": 2, "title": "The Matrix Reloaded", "year": 2003},
+    ]
+    assert tmdb_mod._pending_suggestion_refills == {}
+    mock_search.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "search_movies", new_callable=AsyncMock)
+async def test_suggest_refills_are_debounced_while_typing(
+    mock_search, monkeypatch, index, _fresh_refills
+):
+    monkeypatch.setattr(tmdb_mod, "movie_index", index)
+
+    for typed in ["he", "hea", "heat", "heat"]:
+        assert tmdb_mod.suggest_movies(typed, 5) == []
+
+    # Too short to search, superseded by a longer prefix, or already pending
+    assert list(tmdb_mod._pending_suggestion_refills) == ["heat"]
+
+    await asyncio.sleep(0.05)
+    mock_search.assert_awaited_once_with("heat")
+
+    # Recently searched prefixes are not searched again
+    tmdb_mod.suggest_movies("heat", 5)
+    assert tmdb_mod._pending_suggestion_refills == {}
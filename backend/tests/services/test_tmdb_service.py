@@ -1,12 +1,14 @@
 # tests/services/test_tmdb_service.py
 import asyncio
 from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import HTTPException
 
 import app.services.tmdb as tmdb_mod
+from app.services.prefetch import PageCache, Prefetcher, UpstreamPressure
 
 
 # ---------------------------------------------------------------------------
@@ -34,6 +36,13 @@ class DummyCast(dict):
 @pytest.fixture(autouse=True)
 def _patch_schema_classes(monkeypatch):
     monkeypatch.setattr(tmdb_mod, "Movie", DummyMovie, raising=False)
+    monkeypatch.setattr(
+        tmdb_mod,
+        "movie_list_adapter",
+        SimpleNamespace(
+            validate_python=lambda rows: [DummyMovie(**row) for row in rows]
+        ),
+    )
     monkeypatch.setattr(tmdb_mod, "Genre", DummyGenre, raising=False)
     monkeypatch.setattr(tmdb_mod, "MovieCast", DummyCast, raising=False)
     monkeypatch.setattr(tmdb_mod, "MovieCastResponse", lambda **kw: kw, raising=False)
@@ -44,6 +53,19 @@ def _patch_schema_classes(monkeypatch):
     monkeypatch.setattr(
         tmdb_mod, "MovieTrailerResponse", lambda **kw: kw, raising=False
     )
+    # Each test sees TMDB afresh, with no read-ahead calls in between
+    monkeypatch.setattr(
+        tmdb_mod,
+        "page_prefetcher",
+        Prefetcher(tmdb_mod._fetch_results, PageCache(16, 60), UpstreamPressure()),
+    )
+    monkeypatch.setattr(
+        tmdb_mod,
+        "review_fetcher",
+        Prefetcher(tmdb_mod._fetch_json, PageCache(16, 60), UpstreamPressure()),
+    )
+    monkeypatch.setattr(tmdb_mod.settings, "PREFETCH_ENABLED", False)
+    monkeypatch.setattr(tmdb_mod, "genre_map", {})
 
 
 # ---------------------------------------------------------------------------
@@ -54,7 +76,7 @@ class _FakeResp:
         self.status = status
         self._payload = payload
 
-    async def json(self):
+    async def json(self, **_kwargs):
         return self._payload
 
 
@@ -160,6 +182,26 @@ async def test_search_movies(mock_req):
     assert "page=3" in mock_req.call_args.args[0]
 
 
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_search_movies_page_records_totals(mock_req, monkeypatch):
+    monkeypatch.setattr(tmdb_mod, "_search_totals", tmdb_mod.OrderedDict())
+    mock_req.return_value = {
+        "results": [{"id": 7, "title": "Found"}],
+        "total_pages": 4,
+        "total_results": 61,
+    }
+
+    results, total_pages = await tmdb_mod.search_movies_page("The  Matrix", page=2)
+
+    assert results == [{"id": 7, "title": "Found"}] and total_pages == 4
+    assert tmdb_mod._search_totals == {"the matrix": 61}
+
+    # A year narrows the results, so its total isn't the query's
+    await tmdb_mod.search_movies_page("heat", year=1995)
+    assert "heat" not in tmdb_mod._search_totals
+
+
 @pytest.mark.asyncio
 @patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
 async def test_fetch_movies_genres(mock_req):
@@ -224,3 +266,320 @@ async def test_fetch_movie_trailer_selects_highest_quality(mock_req):
     assert trailer["title"] == "Good"
     assert trailer["embed_url"].endswith("/xxx")
     assert trailer["movie_id"] == 99
+
+
+# ---------------------------------------------------------------------------
+# Raw JSON passthrough
+# ---------------------------------------------------------------------------
+def test_movie_list_json_matches_model_serialization():
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app.schemas.movie import Movie, MovieResponse
+
+    results = [
+        {
+            "id": 1,
+            "title": "Amélie",
+            "overview": 'Quotes " and \\ backslashes\nnew line',
+            "popularity": 100,
+            "vote_average": 8,
+            "vote_count": 12000,
+            "genre_ids": [35, 10749],
+            "release_date": "2001-04-25",
+            "adult": False,
+            "backdrop_path": "/extra-field.jpg",
+        },
+        {"id": 2, "title": "千と千尋の神隠し", "popularity": 61.416, "vote_average": 8.5},
+        {"id": 3, "title": "Sparse", "poster_path": None, "genre_ids": []},
+    ]
+    body = tmdb_mod.movie_list_json(results)
+
+    expected = JSONResponse(
+        jsonable_encoder(MovieResponse(movies=[Movie(**movie) for movie in results]))
+    ).body
+    assert body == expected
+
+
+def test_movie_field_types_cover_movie_schema():
+    from app.schemas.movie import Movie
+
+    assert list(tmdb_mod.MOVIE_FIELD_TYPES) == list(Movie.model_fields)
+
+
+def test_project_movie_rejects_missing_required_fields():
+    with pytest.raises(ValueError):
+        tmdb_mod.project_movie({"id": 1, "poster_path": "/x.jpg"})
+
+
+# ---------------------------------------------------------------------------
+# Filtered search
+# ---------------------------------------------------------------------------
+def _search_page(page, total_pages, movies):
+    return {"page": page, "total_pages": total_pages, "results": movies}
+
+
+def _movie(movie_id, rating, release_date, genre_ids=(28,)):
+    return {
+        "id": movie_id,
+        "title": f"Movie {movie_id}",
+        "vote_average": rating,
+        "release_date": release_date,
+        "genre_ids": list(genre_ids),
+    }
+
+
+@pytest.fixture
+def _fresh_search_scans(monkeypatch):
+    monkeypatch.setattr(tmdb_mod, "_search_scans", tmdb_mod.OrderedDict())
+
+
+def test_search_filters_match_locally():
+    filters = tmdb_mod.SearchFilters(
+        genre=28, min_rating=7, max_rating=9, min_year=2000, max_year=2010
+    )
+
+    assert filters.matches(_movie(1, 8.0, "2005-06-01"))
+    assert not filters.matches(_movie(2, 6.9, "2005-06-01"))
+    assert not filters.matches(_movie(3, 9.1, "2005-06-01"))
+    assert not filters.matches(_movie(4, 8.0, "1999-12-31"))
+    assert not filters.matches(_movie(5, 8.0, ""))
+    assert not filters.matches(_movie(6, 8.0, "2005-06-01", genre_ids=[35]))
+    assert tmdb_mod.SearchFilters().is_empty()
+
+
+def test_discover_url_pushes_down_every_filter():
+    url = tmdb_mod.discover_movies_url(
+        2, tmdb_mod.SearchFilters(genre=28, min_rating=7.5, min_year=1990, max_year=1999)
+    )
+
+    assert "/discover/movie?" in url
+    assert "page=2" in url
+    assert "with_genres=28" in url
+    assert "vote_average.gte=7.5" in url
+    assert "vote_average.lte" not in url
+    assert "primary_release_date.gte=1990-01-01" in url
+    assert "primary_release_date.lte=1999-12-31" in url
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_filtered_search_without_query_uses_discover(mock_req, _fresh_search_scans):
+    mock_req.return_value = _search_page(1, 10, [_movie(1, 8.0, "2005-01-01")])
+
+    results = await tmdb_mod.search_filtered_results(
+        " ", 1, tmdb_mod.SearchFilters(min_rating=7)
+    )
+
+    assert [movie["id"] for movie in results] == [1]
+    mock_req.assert_awaited_once()
+    assert "/discover/movie?" in mock_req.await_args.args[0]
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_filtered_search_fills_pages_and_resumes_scan(
+    mock_req, _fresh_search_scans, monkeypatch
+):
+    monkeypatch.setattr(tmdb_mod.settings, "SEARCH_MAX_UPSTREAM_PAGES", 10)
+
+    # Every TMDB page has 20 results, half of them above the rating bound
+    def page(url):
+        number = int(url.split("page=")[1].split("&")[0])
+        return _search_page(
+            number,
+            6,
+            [
+                _movie(number * 100 + i, 8.0 if i % 2 else 5.0, "2001-01-01")
+                for i in range(20)
+            ],
+        )
+
+    mock_req.side_effect = page
+    filters = tmdb_mod.SearchFilters(min_rating=7)
+
+    first = await tmdb_mod.search_filtered_results("matrix", 1, filters)
+    assert len(first) == tmdb_mod.TMDB_PAGE_SIZE
+    assert mock_req.await_count == 2
+
+    second = await tmdb_mod.search_filtered_results("matrix", 2, filters)
+    assert len(second) == tmdb_mod.TMDB_PAGE_SIZE
+    assert not {movie["id"] for movie in first} & {movie["id"] for movie in second}
+    assert mock_req.await_count == 4
+
+    # TMDB only has 6 pages: the last one holds what is left
+    fourth = await tmdb_mod.search_filtered_results("matrix", 4, filters)
+    assert fourth == []
+    assert mock_req.await_count == 6
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_filtered_search_caps_upstream_pages(mock_req, _fresh_search_scans, monkeypatch):
+    monkeypatch.setattr(tmdb_mod.settings, "SEARCH_MAX_UPSTREAM_PAGES", 3)
+    mock_req.return_value = _search_page(1, 500, [_movie(1, 2.0, "2001-01-01")] * 20)
+
+    results = await tmdb_mod.search_filtered_results(
+        "rare", 1, tmdb_mod.SearchFilters(min_rating=9, min_year=2001, max_year=2001)
+    )
+
+    assert results == []
+    assert mock_req.await_count == 3
+    # An exact year is pushed down to TMDB search
+    assert "primary_release_year=2001" in mock_req.await_args.args[0]
+
+
+# ---------------------------------------------------------------------------
+# Review excerpts
+# ---------------------------------------------------------------------------
+def test_review_excerpt_cuts_at_word_boundary():
+    assert tmdb_mod.review_excerpt("Short review.", 100) == ("Short review.", False)
+
+    excerpt, truncated = tmdb_mod.review_excerpt("A gripping, tense thriller. " * 20, 60)
+    assert truncated
+    assert len(excerpt) <= 61
+    assert excerpt.endswith("…")
+    assert not excerpt[:-1].endswith((" ", ",", "."))
+
+    excerpt, _ = tmdb_mod.review_excerpt("x" * 200, 50)
+    assert excerpt == "x" * 50 + "…"
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_review_pages_are_excerpted_and_cached(mock_req):
+    mock_req.return_value = {
+        "results": [
+            {"id": "a1", "author": "Critic", "content": "word " * 400, "created_at": "2024"},
+            {"id": "b2", "author": "Fan", "content": "Loved it.", "created_at": "2024"},
+        ],
+        "total_results": 2,
+    }
+
+    summary = await tmdb_mod.fetch_movie_reviews(550, excerpt_length=100)
+    full = await tmdb_mod.fetch_movie_reviews(550)
+
+    assert [review["truncated"] for review in summary["reviews"]] == [True, False]
+    assert len(summary["reviews"][0]["content"]) <= 101
+    assert full["reviews"][0]["content"] == "word " * 400
+    assert full["reviews"][0]["truncated"] is False
+    mock_req.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_fetch_review_returns_full_content(mock_req):
+    mock_req.return_value = {
+        "id": "5b1c",
+        "author": "Critic",
+        "content": "word " * 400,
+        "created_at": "2024",
+        "media_id": 550,
+    }
+
+    review = await tmdb_mod.fetch_review("5b1c")
+
+    assert review["content"] == "word " * 400
+    assert "/review/5b1c?" in mock_req.await_args.args[0]
+
+
+# ---------------------------------------------------------------------------
+# Aggregated movie page
+# ---------------------------------------------------------------------------
+_FULL_MOVIE = {
+    "id": 550,
+    "title": "Fight Club",
+    "popularity": 61.4,
+    "release_date": "1999-10-15",
+    "credits": {"cast": [{"id": 819, "name": "Edward Norton", "character": "Narrator"}]},
+    "videos": {
+        "results": [
+            {"site": "YouTube", "type": "Trailer", "key": "abc", "name": "Trailer", "official": True}
+        ]
+    },
+    "reviews": {
+        "results": [{"id": "r1", "author": "A", "content": "word " * 200, "created_at": "2024"}],
+        "total_results": 1,
+    },
+}
+
+
+def test_full_movie_url_appends_only_requested_parts():
+    url = tmdb_mod.full_movie_url(550, {"details", "trailer", "cast"})
+
+    assert "/movie/550?" in url
+    assert url.endswith("&append_to_response=credits,videos")
+    assert "append_to_response" not in tmdb_mod.full_movie_url(550, {"details"})
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_fetch_movie_full_uses_one_request(mock_req, monkeypatch):
+    from app.schemas.movie import MovieCast, MovieFullResponse
+
+    monkeypatch.setattr(tmdb_mod, "MovieCast", MovieCast)
+    monkeypatch.setattr(tmdb_mod, "MovieFullResponse", MovieFullResponse)
+    mock_req.return_value = _FULL_MOVIE
+
+    full = await tmdb_mod.fetch_movie_full(550, excerpt_length=100)
+
+    mock_req.assert_awaited_once()
+    assert "append_to_response=credits,reviews,videos" in mock_req.await_args.args[0]
+    assert full.details.title == "Fight Club"
+    assert [actor.name for actor in full.cast] == ["Edward Norton"]
+    assert full.trailer.embed_url == "https://www.youtube.com/embed/abc"
+    assert full.reviews.reviews[0].truncated is True
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_fetch_movie_full_field_selection(mock_req, monkeypatch):
+    from app.schemas.movie import MovieCast, MovieFullResponse
+
+    monkeypatch.setattr(tmdb_mod, "MovieCast", MovieCast)
+    monkeypatch.setattr(tmdb_mod, "MovieFullResponse", MovieFullResponse)
+    mock_req.return_value = {"id": 550, "title": "Fight Club", "credits": _FULL_MOVIE["credits"]}
+
+    full = await tmdb_mod.fetch_movie_full(550, {"cast"})
+
+    assert full.model_dump(exclude_unset=True) == {
+        "movie_id": 550,
+        "cast": [
+            {"id": 819, "name": "Edward Norton", "character": "Narrator", "profile_path": None}
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Genre names
+# ---------------------------------------------------------------------------
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_genre_map_names_list_results(mock_req):
+    mock_req.return_value = {
+        "genres": [{"id": 28, "name": "Action"}, {"id": 35, "name": "Comedy"}]
+    }
+    await tmdb_mod.load_genre_map()
+    await tmdb_mod.load_genre_map()
+
+    mock_req.assert_awaited_once()  # loaded once, then served from memory
+    assert tmdb_mod.genre_names_of([35, 28, 99]) == ["Comedy", "Action"]
+    # Detail results name their genres themselves
+    assert tmdb_mod.genre_names_of([28], [{"id": 18, "name": "Drama"}]) == ["Drama"]
+
+    body = tmdb_mod.movie_list_json(
+        [{"id": 1, "title": "Hot Fuzz", "genre_ids": [28, 35]}], include_genre_names=True
+    )
+    assert b'"genre_names":["Action","Comedy"]' in body
+    assert b'"genre_names":null' in tmdb_mod.movie_list_json(
+        [{"id": 1, "title": "Hot Fuzz", "genre_ids": [28, 35]}]
+    )
+
+
+@pytest.mark.asyncio
+@patch.object(tmdb_mod, "make_request", new_callable=AsyncMock)
+async def test_load_genre_map_failure_leaves_names_out(mock_req):
+    mock_req.side_effect = HTTPException(status_code=503, detail="down")
+
+    assert await tmdb_mod.load_genre_map() == {}
+    assert tmdb_mod.genre_names_of([28]) == []
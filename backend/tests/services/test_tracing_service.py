@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.services import tracing
+
+
+def test_span_outside_trace_is_noop():
+    with tracing.span("orphan") as attributes:
+        attributes["hit"] = True
+
+    tracing.record_stage("orphan", 1.0)
+
+
+def test_span_records_stage_with_late_attributes():
+    with tracing.start_trace("recommendations") as trace:
+        with tracing.span("prefetch", source="tmdb") as attributes:
+            attributes["titles"] = 12
+
+    (stage,) = trace.stages
+    assert stage.name == "prefetch"
+    assert stage.attributes == {"source": "tmdb", "titles": 12}
+    assert stage.duration_ms >= 0
+
+
+def test_span_records_stage_when_block_raises():
+    with tracing.start_trace("recommendations") as trace:
+        with pytest.raises(ValueError):
+            with tracing.span("parse"):
+                raise ValueError("bad json")
+
+    assert [stage.name for stage in trace.stages] == ["parse"]
+
+
+def test_server_timing_header_format():
+    with tracing.start_trace("recommendations") as trace:
+        tracing.record_stage("llm_prefill", 120.456)
+        tracing.record_stage("resolution", 30)
+
+    header = trace.server_timing()
+
+    assert header.startswith("llm_prefill;dur=120.46, resolution;dur=30, total;dur=")
+
+
+@pytest.mark.asyncio
+async def test_stages_from_gathered_tasks_land_in_trace():
+    async def stage(name):
+        with tracing.span(name):
+            await asyncio.sleep(0)
+
+    with tracing.start_trace("recommendations") as trace:
+        await asyncio.gather(stage("a"), stage("b"))
+
+    assert sorted(stage.name for stage in trace.stages) == ["a", "b"]
+
+
+def test_start_trace_logs_summary(caplog):
+    with caplog.at_level("INFO", logger=tracing.__name__):
+        with tracing.start_trace("recommendations"):
+            tracing.record_stage("parse", 2.5, recommendations=20)
+
+    assert "recommendations trace: total=" in caplog.text
+    assert "parse=2.5ms recommendations=20" in caplog.text
@@ -186,3 +186,60 @@ async def test_add_movie_to_favorites_movie_not_found(monkeypatch):
 
     with pytest.raises(HTTPException):
         await user_mod.add_movie_to_favorites(u, 999)
+
+
+# ---------------------------------------------------------------------------
+# Fast paths for stored documents and shared validators
+# ---------------------------------------------------------------------------
+def test_user_from_document_matches_validated_user():
+    from app.schemas.rating import RatingEntry
+    from app.schemas.user import User
+
+    user = User(
+        username="john",
+        email="john@example.com",
+        ratings=[RatingEntry(movie_id=1, rating=7)],
+        favorite_movies=[2],
+    )
+    document = {**user.model_dump(), "_id": "mongo-object-id"}
+
+    loaded = User.from_document(document)
+
+    assert loaded == user
+    assert isinstance(loaded.ratings[0], RatingEntry)
+    assert loaded.model_dump() == user.model_dump()
+
+
+def test_user_from_document_fills_defaults_for_old_documents():
+    from app.schemas.user import User
+
+    loaded = User.from_document(
+        {"id": "u1", "username": "john", "email": "john@example.com"}
+    )
+
+    assert loaded.ratings == [] and loaded.watchlist == []
+    assert loaded.is_verified is False
+
+
+@pytest.mark.parametrize(
+    "field, value, valid",
+    [
+        ("username", "john_doe", True),
+        ("username", "john doe", False),
+        ("username", "john\n", False),
+        ("phone_number", "+1234567890", True),
+        ("phone_number", "12345", False),
+        ("new_password", "Password123", True),
+        ("new_password", "password123", False),
+    ],
+)
+def test_shared_validators(field, value, valid):
+    from pydantic import ValidationError
+
+    from app.schemas.user import UpdateUserProfile
+
+    if valid:
+        assert getattr(UpdateUserProfile(**{field: value}), field) == value
+    else:
+        with pytest.raises(ValidationError):
+            UpdateUserProfile(**{field: value})